@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Main content extraction benchmark.
+
+Extracts synthetic pages laid out like typical news and blog pages (a
+navigation bar, a sidebar of links and teasers, an article split across
+a few containers, and a footer, with no <main> or <article> element),
+once taking the whole body and once with density-based main content
+detection. Reports the text handed to analysis per page, the share of
+the article's own sentences that was kept, and extraction and analysis
+milliseconds per page.
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web_scraper_agents.analyzer_agent import AnalyzerAgent
+from web_scraper_agents.models import WebPage
+from web_scraper_agents.scraper_agent import WebScraperAgent
+
+
+WORDS = ("market city council river report season team policy school energy water plan "
+         "study data growth health local public service road park family price research").split()
+
+
+def sentence(rng: random.Random, marker: str = "") -> str:
+    words = rng.choices(WORDS, k=rng.randint(10, 20))
+    if marker:
+        words.insert(rng.randrange(len(words)), marker)
+    return " ".join(words).capitalize() + "."
+
+
+def make_page(rng: random.Random, paragraphs: int, boilerplate: int) -> tuple:
+    """Return (html, article sentences) for one page."""
+    article = []
+    parts = ["<html><head><title>Story</title></head><body>",
+             "<div class='topbar'><ul>"]
+    parts.extend(f"<li><a href='/section/{i}'>Section {i}</a></li>" for i in range(boilerplate))
+    parts.append("</ul></div><div class='layout'><div class='sidebar'>")
+    for i in range(boilerplate // 2):
+        parts.append(f"<div class='teaser'><a href='/story/{i}'>{sentence(rng)}</a></div>")
+    parts.append(f"<p>{sentence(rng)} Sign up for our newsletter.</p></div>")
+    for block in range(3):
+        parts.append(f"<div class='story-body-{block}'>")
+        for _ in range(paragraphs // 3):
+            text = " ".join(sentence(rng, "articleword") for _ in range(3))
+            article.append(text)
+            parts.append(f"<p>{text}</p>")
+        parts.append("</div>")
+    parts.append("</div><div class='related'>")
+    parts.extend(f"<p><a href='/more/{i}'>{sentence(rng)}</a></p>" for i in range(boilerplate // 2))
+    parts.append(f"</div><div class='legal'><p>{sentence(rng)} All rights reserved.</p></div></body></html>")
+    return "".join(parts), article
+
+
+def run(pages: list, mode: str) -> dict:
+    scraper = WebScraperAgent({'content_extraction': mode, 'respect_robots': False})
+    analyzer = AnalyzerAgent()
+    chars = kept = total = 0
+    extract_seconds = analyze_seconds = 0.0
+    for i, (html, article) in enumerate(pages):
+        page = WebPage(url=f"http://bench.test/{i}", content=html, status_code=200)
+        start = time.perf_counter()
+        data = scraper._extract_data(page)
+        extract_seconds += time.perf_counter() - start
+        start = time.perf_counter()
+        analyzer.execute(data)
+        analyze_seconds += time.perf_counter() - start
+        chars += len(data.main_content) + sum(len(p) for p in data.paragraphs)
+        kept += sum(1 for p in data.paragraphs if 'articleword' in p)
+        total += len(article)
+    count = len(pages)
+    return {'chars': chars / count, 'recall': kept / total if total else 1.0,
+            'extract_ms': extract_seconds * 1000 / count, 'analyze_ms': analyze_seconds * 1000 / count}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark main content extraction against whole-body text')
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--paragraphs', type=int, default=12, help='Article paragraphs per page')
+    parser.add_argument('--boilerplate', type=int, default=60, help='Navigation links per page')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    rng = random.Random(args.seed)
+    pages = [make_page(rng, args.paragraphs, args.boilerplate) for _ in range(args.pages)]
+
+    print("=" * 80)
+    print(f"MAIN CONTENT: {args.pages} pages, {args.paragraphs} article paragraphs, "
+          f"{args.boilerplate} navigation links each")
+    print("=" * 80)
+    print(f"{'mode':>8} {'chars/page':>12} {'article kept':>14} {'extract ms':>12} {'analyze ms':>12}")
+    for mode in ('body', 'density'):
+        stats = run(pages, mode)
+        print(f"{mode:>8} {stats['chars']:>12.0f} {stats['recall']:>13.0%} "
+              f"{stats['extract_ms']:>12.2f} {stats['analyze_ms']:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
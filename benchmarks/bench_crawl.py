@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Crawl benchmark against the local fixture site.
+
+Measures pages/second for WebScraperAgent.execute_crawl without touching
+any live website. With --hosts N the crawl spans N fixture sites, each on
+its own port, to show throughput scaling with the number of hosts.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web_scraper_agents.fixture_server import FixtureSiteConfig, FixtureSiteServer
+from web_scraper_agents.scraper_agent import WebScraperAgent
+
+
+def run_crawl(servers: list, scraper_config: dict, requirement: str = None) -> dict:
+    """Run one crawl across the fixture servers and collect timings."""
+    for server in servers:
+        server.reset_hits()
+    scraper_config = dict(scraper_config, seed_urls=[server.base_url for server in servers[1:]])
+    scraper = WebScraperAgent(scraper_config)
+    start = time.perf_counter()
+    results = scraper.execute_crawl(servers[0].base_url, requirement)
+    elapsed = time.perf_counter() - start
+    return {
+        'pages': len(scraper.visited_urls),
+        'matches': len(results),
+        'requests': sum(server.total_hits for server in servers),
+        'seconds': elapsed,
+        'pages_per_second': len(scraper.visited_urls) / elapsed if elapsed else 0.0,
+        'overloaded': sum(server.overloaded for server in servers),
+        'concurrency': scraper.crawl_stats.get('concurrency', {}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark crawling against a local fixture site')
+    parser.add_argument('--fan-out', type=int, default=5)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--page-size', type=int, default=4000)
+    parser.add_argument('--max-pages', type=int, default=150)
+    parser.add_argument('--slow-ratio', type=float, default=0.0)
+    parser.add_argument('--slow-delay', type=float, default=0.5)
+    parser.add_argument('--error-ratio', type=float, default=0.0)
+    parser.add_argument('--redirect-ratio', type=float, default=0.1)
+    parser.add_argument('--duplicate-ratio', type=float, default=0.1)
+    parser.add_argument('--requirement', default=None)
+    parser.add_argument('--hosts', type=int, default=1, help='Number of fixture sites to crawl')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--per-host', type=int, default=1, help='Concurrent fetches per host')
+    parser.add_argument('--adaptive', action='store_true', help='Adapt per-host concurrency (AIMD)')
+    parser.add_argument('--capacity', type=int, default=0, help='Fixture concurrency before 503s')
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+
+    site_config = FixtureSiteConfig(
+        fan_out=args.fan_out,
+        depth=args.depth,
+        page_size=args.page_size,
+        slow_ratio=args.slow_ratio,
+        slow_delay=args.slow_delay,
+        error_ratio=args.error_ratio,
+        redirect_ratio=args.redirect_ratio,
+        duplicate_ratio=args.duplicate_ratio,
+        capacity=args.capacity
+    )
+    scraper_config = {
+        'crawl_delay': 0,
+        'max_depth': args.depth,
+        'max_pages': args.max_pages * args.hosts,
+        'max_workers': args.workers,
+        'max_connections_per_host': args.per_host,
+        'adaptive_concurrency': args.adaptive,
+        'timeout': 10
+    }
+
+    print("=" * 80)
+    print("CRAWL BENCHMARK (local fixture site)")
+    print("=" * 80)
+    print(f"Site pages:  {site_config.total_pages} (fan-out {args.fan_out}, depth {args.depth})")
+    print(f"Hosts:       {args.hosts} ({args.workers} workers, {args.per_host} per host)")
+
+    servers = [FixtureSiteServer(site_config).start() for _ in range(args.hosts)]
+    try:
+        stats = run_crawl(servers, scraper_config, args.requirement)
+    finally:
+        for server in servers:
+            server.stop()
+
+    print(f"Crawled:     {stats['pages']} pages ({stats['matches']} matching)")
+    print(f"Requests:    {stats['requests']}")
+    print(f"Elapsed:     {stats['seconds']:.2f}s")
+    print(f"Throughput:  {stats['pages_per_second']:.1f} pages/second")
+    if args.capacity:
+        print(f"Overloaded:  {stats['overloaded']} requests refused with 503")
+    for host, host_stats in stats['concurrency'].get('hosts', {}).items():
+        print(f"  {host}: limit {host_stats['limit']}, "
+              f"{host_stats['increases']} increases, {host_stats['decreases']} decreases")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Field selection benchmark.
+
+Extracts the pages of a synthetic site with every ExtractedData field
+and with narrower field selections, and reports milliseconds per page
+for parsing plus extraction, and for extraction alone (parse excluded).
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web_scraper_agents.fixture_server import FixtureSite, FixtureSiteConfig
+from web_scraper_agents.models import WebPage
+from web_scraper_agents.scraper_agent import WebScraperAgent, select_fields
+
+
+SELECTIONS = [
+    ('all fields', None),
+    ('title', ['title']),
+    ('title + links', ['title', 'links']),
+    ('requirement match', ['title', 'headings', 'paragraphs', 'main_content']),
+]
+
+
+def time_selection(scraper: WebScraperAgent, pages: list, fields, repeat: int) -> tuple:
+    """Best-of-repeat (total ms, extraction-only ms) per page."""
+    fields = select_fields(fields)
+    best_total = best_extract = float('inf')
+    for _ in range(repeat):
+        total = extract = 0.0
+        for page in pages:
+            start = time.perf_counter()
+            soup = scraper._parse(page)
+            parsed = time.perf_counter()
+            scraper._extract_from_soup(soup, page.url, fields)
+            done = time.perf_counter()
+            soup.decompose()
+            total += done - start
+            extract += done - parsed
+        best_total = min(best_total, total)
+        best_extract = min(best_extract, extract)
+    return best_total * 1000 / len(pages), best_extract * 1000 / len(pages)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark extraction cost by ExtractedData field selection')
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--page-size', type=int, default=8000, help='Characters of text per page')
+    parser.add_argument('--parser', default='html.parser', help="BeautifulSoup parser ('html.parser' or 'lxml')")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    site = FixtureSite(FixtureSiteConfig(fan_out=10, depth=3, page_size=args.page_size))
+    pages = [WebPage(url=f"http://bench.test{site.page_path(i)}", content=site.render(i).decode('utf-8'),
+                     status_code=200)
+             for i in range(args.pages)]
+    scraper = WebScraperAgent({'html_parser': args.parser, 'respect_robots': False})
+
+    print("=" * 80)
+    print(f"FIELD SELECTION: {args.pages} pages of ~{args.page_size} characters, {args.parser}")
+    print("=" * 80)
+    print(f"{'fields':<20} {'parse+extract ms':>18} {'extract ms':>12} {'extract saved':>15}")
+    baseline = None
+    for name, fields in SELECTIONS:
+        total, extract = time_selection(scraper, pages, fields, args.repeat)
+        baseline = extract if baseline is None else baseline
+        print(f"{name:<20} {total:>18.2f} {extract:>12.2f} {1 - extract / baseline:>14.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for CLI startup.
+
+Runs each target in a fresh interpreter under `python -X importtime`,
+reports the cumulative import time of the package and its heaviest
+imports, and checks that light entry points do not load requests or
+BeautifulSoup. Exits with status 1 when a budget is exceeded or a heavy
+module is imported eagerly, so it can guard against startup regressions.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Code run for each target, and modules it must not import
+TARGETS = [
+    ('import package', 'import web_scraper_agents', ('requests', 'bs4')),
+    ('import models', 'import web_scraper_agents.models', ('requests', 'bs4')),
+    ('import crawl_state', 'import web_scraper_agents.crawl_state', ('requests', 'bs4')),
+    ('import exporters', 'import web_scraper_agents.exporters', ('requests', 'bs4', 'pyarrow')),
+    ('import scraper', 'import web_scraper_agents.scraper_agent', ('bs4',)),
+    ('import orchestrator', 'from web_scraper_agents import AgentOrchestrator', ('bs4',)),
+]
+
+CHECK = "import sys; {code}; print(','.join(m for m in {forbidden!r} if m in sys.modules))"
+
+
+def import_times(code: str, forbidden: tuple) -> tuple:
+    """
+    Run code under -X importtime in a fresh interpreter.
+
+    Returns:
+        Tuple of (microseconds spent importing the package's modules, cumulative
+        microseconds of each module they imported, eagerly imported forbidden modules)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHECK.format(code=code, forbidden=forbidden)],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    total = 0
+    nested = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name[1:2] == ' ':
+            nested[name.strip()] = int(cumulative)
+            continue
+        # Unindented entries come after the modules they imported; keep only the
+        # package's, which leaves out interpreter startup (site, .pth files)
+        if name.strip().startswith('web_scraper_agents'):
+            total += int(cumulative)
+            times.update(nested)
+        nested = {}
+    loaded = [name for name in result.stdout.strip().split(',') if name]
+    return total, times, loaded
+
+
+def cli_help_time() -> float:
+    """Wall-clock seconds of `python main.py --help`."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, 'main.py', '--help'], cwd=REPO_ROOT,
+                   capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark package import time')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per target (median is reported)')
+    parser.add_argument('--top', type=int, default=5, help='Heaviest imports to list per target')
+    parser.add_argument('--max-package-ms', type=float, default=None,
+                        help='Fail if importing the package takes longer than this')
+    parser.add_argument('--max-help-ms', type=float, default=None,
+                        help='Fail if `main.py --help` takes longer than this')
+    args = parser.parse_args()
+
+    failures = []
+    print("=" * 80)
+    print(f"IMPORT TIME (median of {args.repeat} fresh interpreters)")
+    print("=" * 80)
+    for label, code, forbidden in TARGETS:
+        runs = [import_times(code, forbidden) for _ in range(args.repeat)]
+        total = statistics.median(total for total, _, _ in runs) / 1000
+        _, times, loaded = runs[0]
+        print(f"{label:<22} {total:8.1f} ms" + (f"   EAGER: {', '.join(loaded)}" if loaded else ""))
+        heaviest = sorted(((us, name) for name, us in times.items()
+                           if '.' not in name), reverse=True)
+        for us, name in heaviest[:args.top]:
+            print(f"    {name:<30} {us / 1000:8.1f} ms")
+        if loaded:
+            failures.append(f"{label} imported {', '.join(loaded)}")
+        if label == 'import package' and args.max_package_ms is not None and total > args.max_package_ms:
+            failures.append(f"package import took {total:.1f} ms (budget {args.max_package_ms} ms)")
+
+    help_ms = statistics.median(cli_help_time() for _ in range(args.repeat)) * 1000
+    print(f"{'main.py --help':<22} {help_ms:8.1f} ms (wall clock, including interpreter start)")
+    if args.max_help_ms is not None and help_ms > args.max_help_ms:
+        failures.append(f"main.py --help took {help_ms:.1f} ms (budget {args.max_help_ms} ms)")
+
+    if failures:
+        print("=" * 80)
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Job queue benchmark: crawl farm throughput by worker process count.
+
+Queues a batch of independent crawls of the local fixture site and runs
+them with WorkerPool at each requested process count, reporting jobs and
+pages per second. Parsing and analysis are CPU-bound, so throughput should
+grow with processes up to the number of cores.
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web_scraper_agents.fixture_server import FixtureSiteConfig, FixtureSiteServer
+from web_scraper_agents.job_queue import JobQueue, WorkerPool
+
+
+def run_farm(server: FixtureSiteServer, jobs: int, processes: int, max_pages: int) -> dict:
+    """Queue the crawls in a fresh database and work them with a pool."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'jobs.db')
+        job_queue = JobQueue(path)
+        ids = [job_queue.submit(server.base_url, config={'scraper': {'max_pages': max_pages}})
+               for _ in range(jobs)]
+        pool = WorkerPool(path, {'processes': processes, 'quiet': True, 'poll_interval': 0.05,
+                                 'scraper': {'crawl_delay': 0}})
+        start = time.perf_counter()
+        counts = pool.execute()
+        elapsed = time.perf_counter() - start
+        pages = sum(job_queue.get(job_id)['result']['total_pages_crawled']
+                    for job_id in ids if job_queue.get(job_id)['status'] == 'done')
+    return {'seconds': elapsed, 'done': counts['done'], 'failed': counts['failed'], 'pages': pages}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the crawl job queue by worker process count')
+    parser.add_argument('--jobs', type=int, default=16, help='Crawls to queue')
+    parser.add_argument('--max-pages', type=int, default=40, help='Pages per crawl')
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4],
+                        help='Worker process counts to compare')
+    parser.add_argument('--fan-out', type=int, default=5)
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--page-size', type=int, default=8000)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    server = FixtureSiteServer(FixtureSiteConfig(fan_out=args.fan_out, depth=args.depth,
+                                                 page_size=args.page_size)).start()
+    try:
+        print("=" * 80)
+        print(f"JOB QUEUE: {args.jobs} crawls x {args.max_pages} pages, {os.cpu_count()} CPUs")
+        print("=" * 80)
+        baseline = None
+        for processes in args.processes:
+            result = run_farm(server, args.jobs, processes, args.max_pages)
+            jobs_per_second = result['done'] / result['seconds']
+            baseline = baseline or jobs_per_second
+            print(f"{processes:>3} processes: {result['seconds']:7.2f} s  "
+                  f"{jobs_per_second:6.2f} jobs/s  {result['pages'] / result['seconds']:7.1f} pages/s  "
+                  f"x{jobs_per_second / baseline:.2f}  (failed: {result['failed']})")
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for per-page data models.
+
+Compares the retained footprint of the previous dict/string based
+ExtractedData representation with the slotted, tuple-backed models, with
+and without dropping main_content after analysis.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List
+import argparse
+import gc
+import logging
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web_scraper_agents.analyzer_agent import AnalyzerAgent
+from web_scraper_agents.fixture_server import FixtureSite, FixtureSiteConfig
+from web_scraper_agents.models import WebPage
+from web_scraper_agents.scraper_agent import WebScraperAgent
+
+
+@dataclass
+class LegacyExtractedData:
+    """ExtractedData as it was stored before the memory-lean models."""
+    url: str
+    title: str
+    headings: List[str] = field(default_factory=list)
+    paragraphs: List[str] = field(default_factory=list)
+    links: List[Dict[str, str]] = field(default_factory=list)
+    images: List[Dict[str, str]] = field(default_factory=list)
+    metadata: Dict[str, str] = field(default_factory=dict)
+    main_content: str = ""
+
+
+def to_legacy(data) -> LegacyExtractedData:
+    """Convert extracted data to the legacy representation."""
+    return LegacyExtractedData(
+        url=data.url,
+        title=data.title,
+        headings=[str(h) for h in data.headings],
+        paragraphs=data.paragraphs,
+        links=[{'url': link.url, 'text': link.text} for link in data.links],
+        images=[{'url': image.url, 'alt': image.alt} for image in data.images],
+        metadata=data.metadata,
+        main_content=data.main_content
+    )
+
+
+def measure(pages: List[WebPage], build) -> int:
+    """Return the bytes retained by the objects that build() produces for all pages."""
+    gc.collect()
+    tracemalloc.start()
+    retained = [build(page) for page in pages]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del retained
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-page memory footprint')
+    parser.add_argument('--pages', type=int, default=300)
+    parser.add_argument('--page-size', type=int, default=6000)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+
+    site = FixtureSite(FixtureSiteConfig(fan_out=8, depth=4, page_size=args.page_size))
+    pages = [WebPage(url=f"http://fixture.local{site.page_path(i)}",
+                     content=site.render(i).decode('utf-8'), status_code=200)
+             for i in range(args.pages)]
+    scraper = WebScraperAgent()
+    analyzer = AnalyzerAgent()
+
+    def build_legacy(page):
+        return to_legacy(scraper._extract_data(page))
+
+    def build_lean(page):
+        return scraper._extract_data(page)
+
+    def build_lean_dropped(page):
+        data = scraper._extract_data(page)
+        analyzer.execute(data)
+        data.main_content = ""
+        return data
+
+    results = [
+        ('Legacy dict/string models', measure(pages, build_legacy)),
+        ('Slotted tuple-backed models', measure(pages, build_lean)),
+        ('Slotted + drop main_content', measure(pages, build_lean_dropped)),
+    ]
+
+    print("=" * 80)
+    print(f"PER-PAGE MEMORY FOOTPRINT ({args.pages} pages)")
+    print("=" * 80)
+    baseline = results[0][1]
+    for label, total in results:
+        per_page = total / args.pages
+        saving = 100.0 * (baseline - total) / baseline if baseline else 0.0
+        print(f"{label:<32} {per_page / 1024:8.1f} KiB/page  ({saving:5.1f}% saved)")
+
+
+if __name__ == '__main__':
+    main()
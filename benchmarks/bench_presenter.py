@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Presenter formatting throughput benchmark.
+
+Formats single-page and multi-page reports for synthetic pages in every
+output format and reports pages/second.
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web_scraper_agents.analyzer_agent import AnalyzerAgent
+from web_scraper_agents.exporters import page_result_to_record
+from web_scraper_agents.fixture_server import FixtureSite, FixtureSiteConfig
+from web_scraper_agents.models import MultiPageResult, PageResult, WebPage
+from web_scraper_agents.presenter_agent import PresenterAgent
+from web_scraper_agents.scraper_agent import WebScraperAgent
+
+
+def build_pages(count: int) -> list:
+    """Extract and analyze synthetic pages to format."""
+    site = FixtureSite(FixtureSiteConfig(fan_out=8, depth=4, page_size=3000))
+    scraper = WebScraperAgent()
+    analyzer = AnalyzerAgent()
+    pages = []
+    for i in range(count):
+        web_page = WebPage(url=f"http://fixture.local{site.page_path(i)}",
+                           content=site.render(i).decode('utf-8'), status_code=200)
+        data = scraper._extract_data(web_page)
+        pages.append(PageResult(extracted_data=data, analysis=analyzer.execute(data, 'fixture')))
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark presenter formatting throughput')
+    parser.add_argument('--pages', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    pages = build_pages(args.pages)
+    multi_result = MultiPageResult(
+        base_url='http://fixture.local/',
+        requirement='fixture',
+        total_pages_crawled=len(pages),
+        matching_pages=pages
+    )
+
+    print("=" * 80)
+    print(f"PRESENTER THROUGHPUT ({args.pages} pages x {args.repeat} runs)")
+    print("=" * 80)
+    for output_format in ('text', 'markdown', 'html', 'jsonl'):
+        presenter = PresenterAgent({'output_format': output_format})
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for page in pages:
+                if output_format == 'jsonl':
+                    json.dumps(page_result_to_record(page), ensure_ascii=False)
+                else:
+                    presenter._render_single(page.extracted_data, page.analysis, output_format)
+        single_rate = args.repeat * len(pages) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            presenter.write_multi(multi_result, io.StringIO())
+        multi_rate = args.repeat * len(pages) / (time.perf_counter() - start)
+
+        print(f"{output_format:<10} single: {single_rate:10.0f} pages/s   multi: {multi_rate:10.0f} pages/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Summarizer cost benchmark.
+
+Summarizes synthetic pages of growing length and reports milliseconds per
+page, with the default sentence cap and without it, to show that cost
+grows linearly with the sentences considered and stays flat once the cap
+is reached.
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web_scraper_agents.summarizer import MAX_CANDIDATES, summarize
+
+
+def make_paragraphs(sentences: int, vocabulary: int, seed: int) -> list:
+    """Paragraphs of random sentences drawn from a Zipf-like vocabulary."""
+    rng = random.Random(seed)
+    words = [f"term{i}" for i in range(vocabulary)]
+    weights = [1.0 / (i + 1) for i in range(vocabulary)]
+    paragraphs, paragraph = [], []
+    for _ in range(sentences):
+        sentence = " ".join(rng.choices(words, weights, k=rng.randint(8, 25)))
+        paragraph.append(sentence.capitalize() + ".")
+        if len(paragraph) == 5:
+            paragraphs.append(" ".join(paragraph))
+            paragraph = []
+    if paragraph:
+        paragraphs.append(" ".join(paragraph))
+    return paragraphs
+
+
+def time_summary(paragraphs: list, max_sentences: int, max_candidates: int, repeat: int) -> float:
+    """Best-of-repeat milliseconds for one summary."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        summarize(paragraphs, max_sentences, max_candidates=max_candidates)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark extractive summarization cost by page length')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 300, 1000, 3000, 10000],
+                        help='Sentences per page')
+    parser.add_argument('--sentences', type=int, default=5, help='Sentences per summary')
+    parser.add_argument('--cap', type=int, default=MAX_CANDIDATES, help='Sentences considered (capped run)')
+    parser.add_argument('--vocabulary', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    print("=" * 80)
+    print(f"SUMMARIZER: {args.sentences}-sentence summaries, cap {args.cap} sentences")
+    print("=" * 80)
+    print(f"{'sentences':>10} {'capped ms':>12} {'uncapped ms':>12} {'uncapped us/sentence':>22}")
+    for size in args.sizes:
+        paragraphs = make_paragraphs(size, args.vocabulary, seed=size)
+        capped = time_summary(paragraphs, args.sentences, args.cap, args.repeat)
+        uncapped = time_summary(paragraphs, args.sentences, size, args.repeat)
+        print(f"{size:>10} {capped:>12.1f} {uncapped:>12.1f} {uncapped * 1000 / size:>22.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,7 +7,6 @@ This script provides a command-line interface for the agent-based web scraping s
 
 import argparse
 import sys
-from web_scraper_agents import AgentOrchestrator
 
 
 def main():
@@ -30,6 +29,27 @@ Examples:
 
   # Use HTML format
   python main.py https://www.example.com --format html -o report.html
+
+  # Crawl and write one JSON record per page, plus a Parquet/CSV table
+  python main.py https://www.example.com --crawl --format jsonl -o pages.jsonl --columnar pages.parquet
+
+  # Crawl a site together with its subdomains and a sister site
+  python main.py https://www.example.com --crawl --allow-host "*.example.com" --seed-url https://www.example.org
+
+  # Crawl many hosts with one process per host partition
+  python main.py https://www.example.com --crawl --allow-host "*" --nodes 4
+
+  # Find out why some pages are slow: dump profiles of calls over 0.2s
+  python main.py https://www.example.com --crawl --profile profiles --profile-min-seconds 0.2
+
+  # Selective crawl that only needs page titles: skip extracting everything else
+  python main.py https://www.example.com --crawl --requirement "pricing" --fields title
+
+  # Crawl for at most two minutes, giving slow pages 20 seconds each
+  python main.py https://www.example.com --crawl --time-budget 120 --page-timeout 20
+
+  # Scheduled re-crawl that only re-analyzes and reports changed pages
+  python main.py https://www.example.com --crawl --state-file crawl_state.json --changed-only
         '''
     )
 
@@ -46,16 +66,45 @@ Examples:
 
     parser.add_argument(
         '--format',
-        choices=['text', 'markdown', 'html'],
+        choices=['text', 'markdown', 'html', 'jsonl'],
         default='text',
-        help='Output format (default: text)'
+        help='Output format (default: text); jsonl writes one JSON record per page'
+    )
+
+    parser.add_argument(
+        '--columnar',
+        metavar='PATH',
+        default=None,
+        help='Also export page analyses as a table (Parquet if pyarrow is installed, else CSV)'
     )
 
     parser.add_argument(
         '--timeout',
         type=int,
         default=30,
-        help='HTTP request timeout in seconds (default: 30)'
+        help='HTTP connect and read timeout in seconds (default: 30)'
+    )
+
+    parser.add_argument(
+        '--connect-timeout',
+        type=float,
+        default=None,
+        help='Seconds to establish a connection (default: --timeout)'
+    )
+
+    parser.add_argument(
+        '--page-timeout',
+        type=float,
+        default=60,
+        help='Total seconds one page may take, retries and download included (default: 60)'
+    )
+
+    parser.add_argument(
+        '--time-budget',
+        type=float,
+        default=None,
+        metavar='SECONDS',
+        help='Stop a crawl after this many seconds and report the pages fetched so far'
     )
 
     parser.add_argument(
@@ -90,6 +139,128 @@ Examples:
         help='Maximum number of pages to crawl (default: 50)'
     )
 
+    parser.add_argument(
+        '--seed-url',
+        action='append',
+        default=[],
+        metavar='URL',
+        help='Additional start URL, e.g. on another domain (repeatable)'
+    )
+
+    parser.add_argument(
+        '--allow-host',
+        action='append',
+        default=[],
+        metavar='PATTERN',
+        help='Also crawl hosts matching PATTERN, e.g. "*.example.com" (repeatable)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=8,
+        help='Concurrent fetches across all hosts (default: 8)'
+    )
+
+    parser.add_argument(
+        '--per-host',
+        type=int,
+        default=1,
+        help='Concurrent fetches per host (default: 1)'
+    )
+
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=2,
+        help='Retries of timeouts, dropped connections and 429/502/503/504 responses (default: 2)'
+    )
+
+    parser.add_argument(
+        '--warm-connections',
+        action='store_true',
+        help='Resolve and connect to each new host in the background before its first request'
+    )
+
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='Adapt concurrency per host between 1 and --per-host from latency, 429/503 and timeouts'
+    )
+
+    parser.add_argument(
+        '--nodes',
+        type=int,
+        default=1,
+        help='Split the crawl across this many processes by host (each with its own --max-pages)'
+    )
+
+    parser.add_argument(
+        '--sitemaps',
+        action='store_true',
+        help='Seed the crawl from the site\'s sitemaps (robots.txt Sitemap lines or /sitemap.xml)'
+    )
+
+    parser.add_argument(
+        '--ignore-robots',
+        action='store_true',
+        help='Do not fetch or obey robots.txt when crawling'
+    )
+
+    parser.add_argument(
+        '--state-file',
+        metavar='PATH',
+        default=None,
+        help='Incremental mode: keep page fingerprints and analyses in PATH and reuse them for unchanged pages'
+    )
+
+    parser.add_argument(
+        '--changed-only',
+        action='store_true',
+        help='With --state-file, only report pages that are new or changed since the last crawl'
+    )
+
+    parser.add_argument(
+        '--profile',
+        metavar='DIR',
+        default=None,
+        help='Profile extraction, analysis and formatting; dump slow pages to DIR with a summary'
+    )
+
+    parser.add_argument(
+        '--profile-memory',
+        action='store_true',
+        help='With --profile, also trace allocations and snapshot pages with large peaks'
+    )
+
+    parser.add_argument(
+        '--profile-min-seconds',
+        type=float,
+        default=0.5,
+        help='Dump the cProfile stats of calls at least this slow (default: 0.5)'
+    )
+
+    parser.add_argument(
+        '--profile-min-mb',
+        type=float,
+        default=16,
+        help='Dump a tracemalloc snapshot of calls whose peak reaches this many MiB (default: 16)'
+    )
+
+    parser.add_argument(
+        '--fields',
+        metavar='NAMES',
+        default=None,
+        help='Comma-separated ExtractedData fields to extract (title, headings, paragraphs, links, '
+             'images, metadata, structured_data, main_content); the rest are skipped (default: all)'
+    )
+
+    parser.add_argument(
+        '--stream-output',
+        action='store_true',
+        help='Write crawl reports to the output file page by page instead of printing them'
+    )
+
     # Parse arguments
     args = parser.parse_args()
 
@@ -100,10 +271,32 @@ Examples:
 
     # Configure the orchestrator
     config = {
+        'stream_output': args.stream_output,
+        'columnar_output': args.columnar,
+        'state_file': args.state_file,
+        'changed_only': args.changed_only,
+        'time_budget': args.time_budget,
+        'crawl_nodes': args.nodes,
+        'extract_fields': [name.strip() for name in args.fields.split(',')] if args.fields else None,
+        'profile_dir': args.profile,
+        'profile_memory': args.profile_memory,
+        'profile_min_seconds': args.profile_min_seconds,
+        'profile_min_memory': int(args.profile_min_mb * 1024 * 1024),
         'scraper': {
             'timeout': args.timeout,
+            'connect_timeout': args.connect_timeout or args.timeout,
+            'page_timeout': args.page_timeout,
             'max_depth': args.max_depth,
-            'max_pages': args.max_pages
+            'max_pages': args.max_pages,
+            'seed_urls': args.seed_url,
+            'allowed_hosts': args.allow_host,
+            'max_workers': args.workers,
+            'max_connections_per_host': args.per_host,
+            'adaptive_concurrency': args.adaptive,
+            'max_retries': args.retries,
+            'warm_connections': args.warm_connections,
+            'use_sitemaps': args.sitemaps,
+            'respect_robots': not args.ignore_robots
         },
         'analyzer': {
             'max_summary_sentences': 5,
@@ -119,6 +312,9 @@ Examples:
         import logging
         logging.getLogger().setLevel(logging.ERROR)
 
+    # Imported only now so that --help and argument errors don't load the agents
+    from web_scraper_agents import AgentOrchestrator
+
     try:
         # Create orchestrator
         orchestrator = AgentOrchestrator(config)
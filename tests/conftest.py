@@ -0,0 +1,53 @@
+"""
+Shared pytest fixtures: local fixture sites and fast scraper settings.
+"""
+import logging
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from web_scraper_agents.fixture_server import FixtureSiteConfig, FixtureSiteServer
+
+
+@pytest.fixture(autouse=True)
+def quiet_agents():
+    """Keep agent INFO logs out of test output."""
+    logging.disable(logging.INFO)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture
+def fixture_site():
+    """
+    Start fixture sites on demand; every site is stopped when the test ends.
+
+    Usage: server = fixture_site(fan_out=3, depth=2, etags=True)
+    """
+    servers = []
+
+    def start(**config) -> FixtureSiteServer:
+        server = FixtureSiteServer(FixtureSiteConfig(**config)).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def fast_config(**overrides) -> dict:
+    """Scraper settings for crawling a local fixture site quickly."""
+    config = {
+        'crawl_delay': 0,
+        'max_depth': 3,
+        'max_pages': 500,
+        'timeout': 10,
+        'retry_backoff': 0.01,
+        'respect_robots': False,
+    }
+    config.update(overrides)
+    return config
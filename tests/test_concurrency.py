@@ -0,0 +1,106 @@
+"""
+Adaptive per-host concurrency: the AIMD controller and its effect on crawls.
+"""
+from urllib.parse import urlparse
+import time
+
+from conftest import fast_config
+from web_scraper_agents.concurrency import AIMDController, parse_retry_after
+from web_scraper_agents.scraper_agent import WebScraperAgent
+
+
+def test_fast_responses_raise_the_limit_additively():
+    controller = AIMDController(max_limit=4)
+    assert controller.limit('a') == 1
+    # Each step up takes about one round of responses at the current limit
+    responses_per_step = []
+    responses = 0
+    while controller.limit('a') < 4:
+        limit = controller.limit('a')
+        controller.record('a', 200, latency=0.01)
+        responses += 1
+        if controller.limit('a') > limit:
+            responses_per_step.append(responses)
+            responses = 0
+    assert responses_per_step == [1, 3, 3]
+    for _ in range(20):
+        controller.record('a', 200, latency=0.01)
+    assert controller.limit('a') == 4
+    assert controller.snapshot()['hosts']['a']['increases'] == 3
+
+
+def test_throttling_and_failures_cut_the_limit():
+    controller = AIMDController(max_limit=8)
+    for _ in range(40):
+        controller.record('a', 200, latency=0.0)
+    assert controller.limit('a') == 8
+
+    controller.record('a', 503)
+    assert controller.limit('a') == 4
+    controller.record('a', 429)
+    assert controller.limit('a') == 2
+    controller.record('a', failed=True)
+    controller.record('a', failed=True)
+    assert controller.limit('a') == 1
+
+    host = controller.snapshot()['hosts']['a']
+    assert (host['throttled'], host['timeouts'], host['decreases']) == (2, 2, 3)
+    assert [event['action'] for event in controller.snapshot()['events']][-3:] == ['decrease'] * 3
+
+
+def test_latency_spikes_count_as_congestion():
+    controller = AIMDController(max_limit=8)
+    for _ in range(40):
+        controller.record('a', 200, latency=0.02)
+    controller.record('a', 200, latency=1.0)
+    assert controller.limit('a') == 4
+    assert controller.snapshot()['hosts']['a']['slow'] == 1
+
+
+def test_retry_after_pauses_the_host():
+    controller = AIMDController(max_limit=4, max_retry_after=30)
+    controller.record('a', 503, retry_after='10')
+    controller.record('b', 503, retry_after='3600')
+    controller.record('c', 200, retry_after='10')
+
+    now = time.monotonic()
+    assert 9 < controller.retry_at('a') - now <= 10
+    assert 29 < controller.retry_at('b') - now <= 30
+    # Retry-After only pauses a host on a throttling status
+    assert controller.retry_at('c') < now
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_retry_after('soon') is None
+
+
+def test_fixed_concurrency_when_not_adaptive():
+    controller = AIMDController(max_limit=3, adaptive=False)
+    assert controller.limit('a') == 3
+    controller.record('a', 503)
+    assert controller.limit('a') == 3
+
+
+def test_adaptive_crawl_ramps_up_on_a_healthy_site(fixture_site):
+    server = fixture_site(fan_out=4, depth=2, slow_ratio=1.0, slow_delay=0.02)
+    scraper = WebScraperAgent(fast_config(adaptive_concurrency=True, max_workers=8,
+                                          max_connections_per_host=4))
+    pages = scraper.execute_crawl(server.base_url)
+
+    host = scraper.crawl_stats['concurrency']['hosts'][urlparse(server.base_url).netloc]
+    assert len(pages) == 21
+    assert host['increases'] > 0
+    assert server.peak_active > 1
+
+
+def test_adaptive_crawl_backs_off_an_overloaded_site(fixture_site):
+    server = fixture_site(fan_out=4, depth=2, capacity=2, slow_ratio=1.0, slow_delay=0.05)
+    scraper = WebScraperAgent(fast_config(adaptive_concurrency=True, max_workers=8,
+                                          max_connections_per_host=8, max_retries=10))
+    pages = scraper.execute_crawl(server.base_url)
+
+    stats = scraper.crawl_stats['concurrency']
+    host = stats['hosts'][urlparse(server.base_url).netloc]
+    assert len(pages) == 21
+    assert stats['adaptive']
+    assert host['throttled'] == server.overloaded > 0
+    assert host['decreases'] > 0
+    assert any(event['action'] == 'decrease' and event['reason'] == 'HTTP 503' for event in stats['events'])
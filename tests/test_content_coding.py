@@ -0,0 +1,101 @@
+"""
+Incremental content decoding and its output bound.
+"""
+import gzip
+import zlib
+
+import pytest
+
+from web_scraper_agents import content_coding
+from web_scraper_agents.content_coding import available_encodings, make_decoder
+
+# A small body that inflates to 32 MB
+BOMB_SIZE = 32 * 1024 * 1024
+CAP = 64 * 1024
+# Decoders may overshoot a limit, but never by more than this
+SLACK = 128 * 1024
+
+
+def encode(coding: str, data: bytes) -> bytes:
+    if coding == 'gzip':
+        return gzip.compress(data, compresslevel=9)
+    if coding == 'deflate':
+        return zlib.compress(data, 9)
+    if coding == 'br':
+        return content_coding.brotli.compress(data, quality=1)
+    if coding == 'zstd':
+        if content_coding.zstd is not None:
+            return content_coding.zstd.compress(data)
+        return content_coding.zstandard.ZstdCompressor().compress(data)
+    raise ValueError(coding)
+
+
+def read_capped(decoder, body: bytes, cap: int, wire_chunk: int = 16 * 1024) -> int:
+    """Decode body the way WebScraperAgent._read_body does; return bytes inflated."""
+    inflated = 0
+    for start in range(0, len(body), wire_chunk):
+        output = decoder.decompress(body[start:start + wire_chunk], cap - inflated + 1)
+        inflated += len(output)
+        if inflated > cap:
+            break
+    return inflated
+
+
+@pytest.fixture(scope='module')
+def bomb():
+    return b'\0' * BOMB_SIZE
+
+
+@pytest.mark.parametrize('coding', available_encodings())
+def test_round_trip(coding):
+    data = b''.join(b'line %d of the page\n' % i for i in range(20000))
+    decoder = make_decoder(coding)
+    body = encode(coding, data)
+    output = b''.join(decoder.decompress(body[i:i + 1000]) for i in range(0, len(body), 1000))
+    assert output + decoder.flush() == data
+
+
+@pytest.mark.parametrize('coding', available_encodings())
+def test_tiny_body_inflates_only_to_the_cap(coding, bomb):
+    body = encode(coding, bomb)
+    assert len(body) < BOMB_SIZE / 1000
+
+    inflated = read_capped(make_decoder(coding), body, CAP)
+    assert CAP < inflated <= CAP + SLACK
+
+
+@pytest.mark.parametrize('coding', available_encodings())
+def test_bounded_calls_resume_where_they_stopped(coding):
+    data = bytes(range(256)) * 2000
+    decoder = make_decoder(coding)
+    body = encode(coding, data)
+    parts = [decoder.decompress(body, 10000)]
+    while True:
+        part = decoder.decompress(b'', 10000)
+        if not part:
+            break
+        assert len(part) <= 10000 + SLACK
+        parts.append(part)
+    assert b''.join(parts) + decoder.flush() == data
+
+
+def test_stacked_codings_inflate_only_to_the_cap(bomb):
+    inner = 'br' if 'br' in available_encodings() else 'deflate'
+    body = encode('gzip', encode(inner, bomb))
+
+    inflated = read_capped(make_decoder(f'{inner}, gzip'), body, CAP)
+    assert CAP < inflated <= CAP + SLACK
+
+
+def test_stacked_codings_round_trip():
+    data = b''.join(b'row %d\n' % i for i in range(50000))
+    decoder = make_decoder('deflate, gzip')
+    assert decoder.decompress(encode('gzip', encode('deflate', data))) + decoder.flush() == data
+
+
+def test_corrupt_and_unknown_codings_raise_value_error():
+    with pytest.raises(ValueError):
+        make_decoder('gzip').decompress(b'not gzip at all')
+    with pytest.raises(ValueError):
+        make_decoder('compress')
+    assert make_decoder('identity') is None
@@ -0,0 +1,105 @@
+"""
+Main content detection and the paragraphs extracted from it.
+"""
+from bs4 import BeautifulSoup
+
+from conftest import fast_config
+from web_scraper_agents.content_density import content_elements, content_text, find_main_content
+from web_scraper_agents.models import WebPage
+from web_scraper_agents.scraper_agent import WebScraperAgent
+
+ARTICLE = ' '.join(["The committee met on Tuesday to review the proposal in detail."] * 3)
+
+PAGE_WITHOUT_MAIN = f"""<html><head><title>Report</title></head><body>
+<header><p>Welcome to the example news site, read all about it here.</p></header>
+<div id="menu"><a href="/a">Home</a> <a href="/b">World</a> <a href="/c">Sports</a> <a href="/d">Weather</a></div>
+<div id="story">
+  <h1>Committee report</h1>
+  <p>{ARTICLE}</p>
+  <nav><p>Related: other stories about the committee and its work.</p></nav>
+  <p>{ARTICLE}</p>
+  <aside><p>Advertisement: buy our premium subscription for more news.</p></aside>
+  <p>{ARTICLE}</p>
+</div>
+<div id="sidebar"><p>Trending: <a href="/x">one</a> <a href="/y">two</a> <a href="/z">three</a></p></div>
+<footer><p>Copyright the example news site, all rights reserved forever.</p></footer>
+</body></html>"""
+
+PAGE_WITH_MAIN = f"""<html><head><title>Report</title></head><body>
+<main>
+  <nav><p>Breadcrumbs: home, news, committee reports and more.</p></nav>
+  <p>{ARTICLE}</p>
+  <footer><p>Filed under committee news by the example news desk.</p></footer>
+</main>
+</body></html>"""
+
+
+def extract(html, **config):
+    scraper = WebScraperAgent(config)
+    return scraper._extract_data(WebPage(url='http://example.com/', content=html, status_code=200))
+
+
+def test_density_finds_the_story_container():
+    soup = BeautifulSoup(PAGE_WITHOUT_MAIN, 'html.parser')
+    roots = find_main_content(soup.body)
+
+    assert [root.get('id') for root in roots] == ['story']
+    text = content_text(roots)
+    assert text.count("The committee met") == 9
+    assert 'Related' not in text and 'Advertisement' not in text
+
+
+def test_content_elements_skip_navigation_and_asides():
+    soup = BeautifulSoup(PAGE_WITHOUT_MAIN, 'html.parser')
+    paragraphs = content_elements([soup.body], 'p')
+
+    texts = [p.get_text() for p in paragraphs]
+    assert [text.split()[0] for text in texts] == ['The', 'The', 'The', 'Trending:']
+
+
+def test_paragraphs_come_from_the_main_content_only():
+    data = extract(PAGE_WITHOUT_MAIN)
+
+    assert data.paragraphs == [ARTICLE] * 3
+    assert 'Trending' not in data.main_content
+    assert 'Copyright' not in data.main_content
+
+
+def test_paragraphs_inside_main_skip_its_nav_and_footer():
+    data = extract(PAGE_WITH_MAIN)
+
+    assert data.paragraphs == [ARTICLE]
+    assert 'Breadcrumbs' not in data.main_content
+    assert 'Filed under' not in data.main_content
+
+
+def test_body_extraction_keeps_every_paragraph():
+    data = extract(PAGE_WITHOUT_MAIN, content_extraction='body')
+
+    assert len(data.paragraphs) == 7
+    assert any(p.startswith('Advertisement') for p in data.paragraphs)
+
+
+def test_bodies_and_parse_trees_are_released_after_extraction(fixture_site, monkeypatch):
+    server = fixture_site(fan_out=2, depth=1)
+    scraper = WebScraperAgent(fast_config())
+    pages, soups = [], []
+    fetch_page, parse = scraper._fetch_page, scraper._parse
+
+    def capture_page(url, previous=None):
+        pages.append(fetch_page(url, previous))
+        return pages[-1]
+
+    def capture_soup(web_page):
+        soups.append(parse(web_page))
+        # The page is still whole while it is being parsed
+        assert web_page.body or web_page.content
+        return soups[-1]
+
+    monkeypatch.setattr(scraper, '_fetch_page', capture_page)
+    monkeypatch.setattr(scraper, '_parse', capture_soup)
+    data = scraper.execute(server.base_url)
+
+    assert data.title == "Synthetic Page 0"
+    assert pages[0].content == "" and pages[0].body == b""
+    assert soups[0].decomposed
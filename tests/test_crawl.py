@@ -0,0 +1,149 @@
+"""
+Crawl behaviour against the local fixture site.
+"""
+from urllib.parse import urlparse
+
+from conftest import fast_config
+from web_scraper_agents.crawl_state import CrawlStateStore
+from web_scraper_agents.models import WebPage
+from web_scraper_agents.orchestrator import AgentOrchestrator
+from web_scraper_agents.scraper_agent import WebScraperAgent
+
+
+def crawl(server, requirement=None, **config):
+    scraper = WebScraperAgent(fast_config(**config))
+    return scraper, scraper.execute_crawl(server.base_url, requirement)
+
+
+def paths(pages):
+    return sorted(urlparse(page.url).path for page in pages)
+
+
+def test_crawl_reaches_every_page_once(fixture_site):
+    server = fixture_site(fan_out=3, depth=2)
+    scraper, pages = crawl(server)
+
+    assert len(pages) == server.site.config.total_pages == 13
+    assert len(set(paths(pages))) == len(pages)
+    assert all(count == 1 for path, count in server.hits.items() if path != '/robots.txt')
+    assert {page.title for page in pages} == {f"Synthetic Page {i}" for i in range(13)}
+
+
+def test_crawl_respects_depth_and_page_limits(fixture_site):
+    server = fixture_site(fan_out=3, depth=3)
+    _, shallow = crawl(server, max_depth=1)
+    assert len(shallow) == 4
+
+    _, capped = crawl(server, max_pages=5)
+    assert len(capped) == 5
+
+
+def test_redirected_links_are_followed(fixture_site):
+    server = fixture_site(fan_out=3, depth=2, redirect_ratio=1.0)
+    _, pages = crawl(server)
+
+    assert len(pages) == 13
+    assert any(path.startswith('/redirect/') for path in paths(pages))
+    assert all(page.title.startswith("Synthetic Page") for page in pages)
+    assert all(count == 1 for path, count in server.hits.items() if path.startswith('/redirect/'))
+
+
+def test_duplicate_urls_are_fetched_once(fixture_site):
+    server = fixture_site(fan_out=3, depth=2, duplicate_ratio=0.5)
+    _, pages = crawl(server)
+
+    assert len(pages) == 13
+    assert len(set(paths(pages))) == 13
+    assert max(server.hits.values()) == 1
+
+
+def test_requirement_filters_pages(fixture_site):
+    server = fixture_site(fan_out=3, depth=2, keyword='zebra', keyword_ratio=0.5)
+    scraper, pages = crawl(server, requirement='zebra')
+
+    expected = {i for i in range(13) if server.site.has_keyword(i)}
+    assert 0 < len(pages) < 13
+    assert {page.title for page in pages} == {f"Synthetic Page {i}" for i in expected}
+    assert len(scraper.visited_urls) == 13
+
+
+def test_polite_crawl_stays_within_capacity(fixture_site):
+    server = fixture_site(fan_out=3, depth=2, capacity=1)
+    _, pages = crawl(server, max_workers=4, max_connections_per_host=1)
+
+    assert len(pages) == 13
+    assert server.overloaded == 0
+    assert server.peak_active == 1
+
+
+def test_overloaded_site_is_retried(fixture_site):
+    server = fixture_site(fan_out=3, depth=2, capacity=1, slow_ratio=1.0, slow_delay=0.05)
+    scraper, pages = crawl(server, max_workers=4, max_connections_per_host=4, max_retries=10)
+
+    assert server.overloaded > 0
+    assert scraper.crawl_stats['retries'] > 0
+    assert len(pages) == 13
+    assert not scraper.skipped_pages
+
+
+def test_etags_make_recrawls_conditional(fixture_site, tmp_path):
+    server = fixture_site(fan_out=3, depth=2, etags=True)
+    store = CrawlStateStore(str(tmp_path / 'state.json'))
+
+    first = WebScraperAgent(fast_config())
+    first.state_store = store
+    first.execute_crawl(server.base_url)
+    assert set(first.page_changes.values()) == {'new'}
+
+    second = WebScraperAgent(fast_config())
+    second.state_store = store
+    pages = second.execute_crawl(server.base_url)
+    assert set(second.page_changes.values()) == {'unchanged'}
+    assert second.crawl_stats['pages_unchanged'] == 13
+    # Unchanged pages come back with their stored extraction
+    assert len(pages) == 13 and all(page.title for page in pages)
+
+
+def test_failed_fetch_keeps_the_stored_analysis(fixture_site, tmp_path):
+    server = fixture_site(fan_out=3, depth=1, etags=True)
+    config = {'scraper': fast_config(), 'state_file': str(tmp_path / 'state.json')}
+    first = AgentOrchestrator(config).run_page(server.base_url)
+
+    failing = AgentOrchestrator(config)
+    failing.scraper_agent._fetch_page = lambda url, previous=None: WebPage(url=url, error='boom')
+    failed = failing.run_page(server.base_url)
+    assert failed.extracted_data.fetch_error == 'boom'
+
+    third = AgentOrchestrator(config)
+    page = third.run_page(server.base_url)
+    assert third.scraper_agent.page_changes[server.base_url] == 'unchanged'
+    assert page.extracted_data.title == "Synthetic Page 0"
+    assert page.analysis == first.analysis
+    assert page.analysis.word_count > 0
+
+
+def test_robots_disallow_is_obeyed(fixture_site):
+    server = fixture_site(fan_out=3, depth=2, robots_disallow=('/p/1',))
+    scraper, pages = crawl(server, respect_robots=True)
+
+    assert '/p/1' not in paths(pages)
+    assert scraper.skipped_pages[server.base_url + 'p/1'] == "Disallowed by robots.txt"
+    assert '/p/1' not in server.hits
+    assert server.hits['/robots.txt'] == 1
+
+
+def test_sitemaps_seed_pages_beyond_link_depth(fixture_site):
+    server = fixture_site(fan_out=3, depth=2, sitemap=True)
+    _, linked = crawl(server, max_depth=1)
+    _, seeded = crawl(server, max_depth=1, use_sitemaps=True, respect_robots=True)
+
+    assert len(linked) == 4
+    assert len(seeded) == 13
+
+
+def test_sitemap_index_with_gzipped_chunks(fixture_site):
+    server = fixture_site(fan_out=3, depth=2, sitemap=True, sitemap_chunk=5)
+    _, pages = crawl(server, max_depth=1, use_sitemaps=True, respect_robots=True)
+
+    assert len(pages) == 13
+    assert server.hits['/sitemaps/0.xml.gz'] == 1
@@ -0,0 +1,126 @@
+"""
+The DNS cache, its injectable resolver and host warm-up.
+"""
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+
+import pytest
+
+from conftest import fast_config
+from web_scraper_agents.dns_cache import DNSCache
+from web_scraper_agents.scraper_agent import WebScraperAgent
+
+
+class StubResolver:
+    """Resolver answering from a table, counting lookups per host."""
+
+    def __init__(self, table, delay=0.0):
+        self.table = table
+        self.delay = delay
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, host, port):
+        with self._lock:
+            self.calls[host] = self.calls.get(host, 0) + 1
+        time.sleep(self.delay)
+        if host not in self.table:
+            raise socket.gaierror(socket.EAI_NONAME, f"Unknown host {host}")
+        return list(self.table[host])
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic for the dns_cache module."""
+    now = [1000.0]
+    monkeypatch.setattr('web_scraper_agents.dns_cache.time.monotonic', lambda: now[0])
+    return now
+
+
+def test_lookups_are_cached_for_the_ttl(clock):
+    resolver = StubResolver({'a.test': ['10.0.0.1', '10.0.0.2']})
+    cache = DNSCache(ttl=60, resolver=resolver)
+
+    assert cache.resolve('a.test') == ['10.0.0.1', '10.0.0.2']
+    assert cache.resolve('A.TEST') == ['10.0.0.1', '10.0.0.2']
+    clock[0] += 59
+    cache.resolve('a.test')
+    assert resolver.calls == {'a.test': 1}
+    clock[0] += 2
+    cache.resolve('a.test')
+    assert resolver.calls == {'a.test': 2}
+    assert cache.snapshot() == {'hits': 2, 'misses': 2, 'failures': 0, 'entries': 1}
+
+
+def test_failed_lookups_are_cached_briefly(clock):
+    resolver = StubResolver({})
+    cache = DNSCache(ttl=60, negative_ttl=5, resolver=resolver)
+
+    for _ in range(3):
+        with pytest.raises(socket.gaierror):
+            cache.resolve('missing.test')
+    assert resolver.calls == {'missing.test': 1}
+    clock[0] += 5
+    with pytest.raises(socket.gaierror):
+        cache.resolve('missing.test')
+    assert resolver.calls == {'missing.test': 2}
+    assert cache.snapshot()['failures'] == 2
+
+
+def test_ip_literals_need_no_lookup():
+    resolver = StubResolver({})
+    cache = DNSCache(resolver=resolver)
+    assert cache.resolve('127.0.0.1') == ['127.0.0.1']
+    assert cache.resolve('[::1]') == ['::1']
+    assert resolver.calls == {}
+
+
+def test_concurrent_lookups_share_one_resolver_call():
+    resolver = StubResolver({'a.test': ['10.0.0.1']}, delay=0.05)
+    cache = DNSCache(resolver=resolver)
+    threads = [threading.Thread(target=cache.resolve, args=('a.test',)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert resolver.calls == {'a.test': 1}
+
+
+def test_crawl_resolves_made_up_hosts_through_the_stub(fixture_site):
+    server = fixture_site(fan_out=3, depth=2)
+    port = urlparse(server.base_url).port
+    resolver = StubResolver({'site.test': ['127.0.0.1']})
+    scraper = WebScraperAgent(fast_config(dns_resolver=resolver, max_connections_per_host=2,
+                                          respect_robots=True))
+    pages = scraper.execute_crawl(f'http://site.test:{port}/')
+
+    assert len(pages) == 13
+    assert all(urlparse(page.url).hostname == 'site.test' for page in pages)
+    assert resolver.calls == {'site.test': 1}
+    assert scraper.crawl_stats['dns']['misses'] == 1
+
+
+def test_unresolvable_host_fails_fast(fixture_site):
+    resolver = StubResolver({})
+    scraper = WebScraperAgent(fast_config(dns_resolver=resolver, max_retries=2, retry_backoff=0))
+    web_page = scraper._fetch_page('http://missing.test/')
+
+    assert "Failed to resolve 'missing.test'" in web_page.error
+    # Retries hit the negative cache, not the resolver
+    assert resolver.calls == {'missing.test': 1}
+
+
+def test_hosts_are_resolved_and_warmed_ahead_of_their_first_fetch(fixture_site):
+    first = fixture_site(fan_out=2, depth=1)
+    second = fixture_site(fan_out=2, depth=1)
+    resolver = StubResolver({'one.test': ['127.0.0.1'], 'two.test': ['127.0.0.1']})
+    scraper = WebScraperAgent(fast_config(
+        dns_resolver=resolver, prefetch_dns=True, warm_connections=True,
+        seed_urls=[f'http://two.test:{urlparse(second.base_url).port}/']))
+    pages = scraper.execute_crawl(f'http://one.test:{urlparse(first.base_url).port}/')
+
+    assert len(pages) == 6
+    assert scraper.crawl_stats['hosts_warmed'] == 2
+    assert resolver.calls == {'one.test': 1, 'two.test': 1}
@@ -0,0 +1,100 @@
+"""
+Character encoding detection: BOM, HTTP charset, <meta charset> and chardet.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import codecs
+import threading
+
+import pytest
+
+from conftest import fast_config
+from web_scraper_agents.encoding import (HAVE_CHARDET, charset_from_content_type, charset_from_markup,
+                                         detect_encoding, normalize_encoding)
+from web_scraper_agents.scraper_agent import WebScraperAgent
+
+TEXT = "Café crème – “the best” naïve recipe, served every morning."
+
+# Path -> (Content-Type, body)
+PAGES = {
+    '/meta-only': ('text/html', (
+        '<html><head><meta charset="windows-1252"><title>Café</title></head>'
+        f'<body><p>{TEXT}</p></body></html>').encode('cp1252')),
+    '/bom': ('text/html; charset=iso-8859-1', codecs.BOM_UTF8 + (
+        f'<html><head><title>Café</title></head><body><p>{TEXT}</p></body></html>').encode('utf-8')),
+}
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        content_type, body = PAGES[self.path]
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def page_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _PageHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize('parser', ['html.parser', 'lxml'])
+@pytest.mark.parametrize('path', sorted(PAGES))
+def test_pages_are_decoded_with_the_right_encoding(page_server, parser, path):
+    data = WebScraperAgent(fast_config(html_parser=parser)).execute(page_server + path)
+
+    assert data.title == "Café"
+    assert data.paragraphs == [TEXT]
+
+
+def test_bom_beats_the_http_charset():
+    body = codecs.BOM_UTF8 + TEXT.encode('utf-8')
+    assert detect_encoding('text/html; charset=iso-8859-1', body) == ('utf-8-sig', 'bom')
+    assert detect_encoding('text/html', codecs.BOM_UTF16_LE + TEXT.encode('utf-16-le')) == ('utf-16', 'bom')
+
+
+def test_http_charset_beats_meta():
+    body = b'<meta charset="utf-8"><p>caf\xe9</p>'
+    assert detect_encoding('text/html; charset=ISO-8859-1', body) == ('cp1252', 'http')
+    assert detect_encoding('text/html', body) == ('utf-8', 'meta')
+
+
+def test_charset_labels():
+    assert normalize_encoding('UTF8') == 'utf-8'
+    assert normalize_encoding('latin-1') == 'cp1252'
+    assert normalize_encoding('us-ascii') == 'cp1252'
+    assert normalize_encoding('no-such-codec') is None
+    assert charset_from_content_type('text/html; charset="Shift_JIS"') == 'shift_jis'
+    assert charset_from_content_type('text/html') is None
+
+
+def test_markup_declarations():
+    assert charset_from_markup(b'<meta http-equiv="Content-Type" content="text/html; charset=koi8-r">') == 'koi8-r'
+    assert charset_from_markup(b'<?xml version="1.0" encoding="ISO-8859-2"?><rss/>') == 'iso8859-2'
+    # UTF-16 declared in ASCII-compatible bytes cannot be true
+    assert charset_from_markup(b'<meta charset="utf-16">') == 'utf-8'
+    # Declarations past the sniffed prefix are not read
+    assert charset_from_markup(b' ' * 5000 + b'<meta charset="koi8-r">') is None
+
+
+@pytest.mark.skipif(not HAVE_CHARDET, reason="chardet is not installed")
+def test_detector_guesses_undeclared_encodings():
+    text = "今日はとても良い天気ですね。公園に散歩に行きましょう。" * 20
+    body = text.encode('shift_jis')
+    encoding, source = detect_encoding('text/html', body)
+    assert source == 'detector'
+    assert body.decode(encoding) == text
+    assert detect_encoding('text/html', b'plain ascii text ' * 20) == ('utf-8', 'detector')
+    assert detect_encoding(None, b'') == (None, 'unknown')
@@ -0,0 +1,75 @@
+"""
+JSONL and columnar exports of crawl results.
+"""
+from io import StringIO
+import csv
+import json
+
+import pytest
+
+from web_scraper_agents import exporters
+from web_scraper_agents.exporters import ANALYSIS_COLUMNS, export_columnar, multi_result_to_record, write_jsonl
+from web_scraper_agents.models import (AnalysisResult, ExtractedData, Heading, Image, Link, MultiPageResult,
+                                       PageResult, StructuredData)
+
+
+@pytest.fixture
+def multi_result():
+    pages = []
+    for i in range(3):
+        data = ExtractedData(
+            url=f'https://example.com/{i}', title=f'Page {i} – “café”',
+            headings=[Heading(level=1, text=f'Heading {i}')], paragraphs=[f'Paragraph {i}.'],
+            links=[Link(url='https://example.com/', text='Home')], images=[Image(url='/a.png', alt='A')],
+            metadata={'description': 'Test'},
+            structured_data=StructuredData(json_ld_raw=['{"@type": "Article"}'], opengraph={'og:title': ['T']}))
+        analysis = AnalysisResult(url=data.url, summary=f'Summary {i}', key_points=['One', 'Two'],
+                                  topics=['café', 'tests'], word_count=10 * i, content_type='Article',
+                                  importance_score=0.5, relevance_score=0.25 * i)
+        pages.append(PageResult(extracted_data=data, analysis=analysis))
+    return MultiPageResult(base_url='https://example.com/', requirement=None, total_pages_crawled=3,
+                           matching_pages=pages)
+
+
+def test_jsonl_round_trip(multi_result):
+    sink = StringIO()
+    assert write_jsonl(multi_result.matching_pages, sink) == 3
+
+    lines = sink.getvalue().splitlines()
+    records = [json.loads(line) for line in lines]
+    assert records == multi_result_to_record(multi_result)['pages']
+    first = records[0]
+    assert first['title'] == 'Page 0 – “café”'
+    assert first['headings'] == [{'level': 1, 'text': 'Heading 0'}]
+    assert first['structured_data']['json_ld'] == [{'@type': 'Article'}]
+    assert first['analysis']['topics'] == ['café', 'tests']
+    assert first['extracted_fields'] is None
+
+
+def test_columnar_export_falls_back_to_csv(multi_result, tmp_path, monkeypatch):
+    monkeypatch.setattr(exporters, 'HAVE_PYARROW', False)
+    path = export_columnar(multi_result, str(tmp_path / 'analysis.parquet'))
+
+    assert path == str(tmp_path / 'analysis.csv')
+    with open(path, encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == ANALYSIS_COLUMNS
+    assert [row['url'] for row in rows] == [f'https://example.com/{i}' for i in range(3)]
+    assert rows[2]['word_count'] == '20'
+    assert rows[2]['relevance_score'] == '0.5'
+    assert rows[0]['key_points'] == 'One | Two'
+    assert rows[0]['title'] == 'Page 0 – “café”'
+
+
+def test_columnar_export_writes_parquet(multi_result, tmp_path, monkeypatch):
+    pyarrow_parquet = pytest.importorskip('pyarrow.parquet')
+    monkeypatch.setattr(exporters, 'PARQUET_BATCH_ROWS', 2)
+    path = export_columnar(multi_result, str(tmp_path / 'analysis.parquet'))
+
+    assert path == str(tmp_path / 'analysis.parquet')
+    parquet_file = pyarrow_parquet.ParquetFile(path)
+    assert parquet_file.metadata.num_row_groups == 2
+    table = parquet_file.read()
+    assert table.column_names == ANALYSIS_COLUMNS
+    assert table.column('word_count').to_pylist() == [0, 10, 20]
+    assert table.column('topics').to_pylist()[0] == ['café', 'tests']
@@ -0,0 +1,54 @@
+"""
+Content-type and size limits on fetched pages.
+"""
+from urllib.parse import urlparse
+
+from conftest import fast_config
+from web_scraper_agents.scraper_agent import WebScraperAgent
+
+
+def crawl(server, **config):
+    scraper = WebScraperAgent(fast_config(**config))
+    return scraper, scraper.execute_crawl(server.base_url)
+
+
+def test_binary_files_are_skipped_not_returned(fixture_site):
+    server = fixture_site(fan_out=3, depth=2, binary_ratio=1.0, binary_size=64 * 1024)
+    scraper, pages = crawl(server)
+
+    skipped = [url for url, reason in scraper.skipped_pages.items()
+               if reason == "Unsupported content type: application/octet-stream"]
+    assert skipped
+    result_urls = {page.url for page in pages}
+    assert not result_urls & set(scraper.skipped_pages)
+    assert not any(urlparse(url).path.startswith('/files/') for url in result_urls)
+    assert all(page.title != "Error fetching page" for page in pages)
+    assert len(pages) == 13
+
+
+def test_oversized_pages_are_truncated(fixture_site):
+    server = fixture_site(fan_out=3, depth=1, page_size=40 * 1024, compress=False)
+    scraper, pages = crawl(server, max_response_bytes=8 * 1024)
+
+    # Child links sit after the page text, so the cap also cuts them off
+    assert len(pages) == 1
+    assert pages[0].truncated
+    assert pages[0].title == "Synthetic Page 0"
+    assert not scraper.skipped_pages
+
+
+def test_oversized_pages_are_skipped_under_skip_policy(fixture_site):
+    server = fixture_site(fan_out=3, depth=1, page_size=40 * 1024, compress=False)
+    scraper, pages = crawl(server, max_response_bytes=8 * 1024, oversize_policy='skip')
+
+    assert pages == []
+    assert scraper.skipped_pages[server.base_url].startswith("Response too large")
+
+
+def test_compressed_pages_are_capped_on_decoded_size(fixture_site):
+    server = fixture_site(fan_out=3, depth=1, page_size=40 * 1024, compress=True)
+    scraper, pages = crawl(server, max_response_bytes=8 * 1024)
+
+    assert len(pages) == 1
+    assert pages[0].truncated
+    assert scraper.crawl_stats['decoded_bytes'] == 8 * 1024
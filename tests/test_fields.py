@@ -0,0 +1,28 @@
+"""
+Selective field extraction through the orchestrator.
+"""
+from conftest import fast_config
+from web_scraper_agents.orchestrator import AgentOrchestrator
+
+
+def test_run_page_without_title_field_succeeds(fixture_site):
+    server = fixture_site(fan_out=3, depth=1)
+    orchestrator = AgentOrchestrator({'scraper': fast_config(), 'extract_fields': ['links']})
+
+    page = orchestrator.run_page(server.base_url)
+
+    assert page is not None
+    assert page.extracted_data.extracted_fields == ('links',)
+    assert page.extracted_data.title == ''
+    assert [link.text for link in page.extracted_data.links][1:] == ['Child page 1', 'Child page 2', 'Child page 3']
+    assert page.extracted_data.paragraphs == []
+
+
+def test_run_page_with_title_field_keeps_the_title(fixture_site):
+    server = fixture_site(fan_out=3, depth=1)
+    orchestrator = AgentOrchestrator({'scraper': fast_config(), 'extract_fields': ['title', 'links']})
+
+    page = orchestrator.run_page(server.base_url)
+
+    assert page is not None
+    assert page.extracted_data.title == "Synthetic Page 0"
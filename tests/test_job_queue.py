@@ -0,0 +1,123 @@
+"""
+SQLite job queue, its worker processes and the jobs they run.
+"""
+import time
+
+import pytest
+
+from conftest import fast_config
+from web_scraper_agents.job_queue import DONE, FAILED, QUEUED, RUNNING, JobQueue, WorkerPool, run_job
+
+
+def single_page_job(url):
+    return {'id': 1, 'url': url, 'requirement': None, 'crawl': False, 'config': {}, 'attempts': 1}
+
+
+def test_run_job_scrapes_a_single_page(fixture_site):
+    server = fixture_site(fan_out=3, depth=1)
+    result = run_job(single_page_job(server.base_url), {'scraper': fast_config()})
+
+    assert result['page']['title'] == "Synthetic Page 0"
+    assert result['skipped_pages'] == {}
+
+
+def test_run_job_fails_an_unreachable_page():
+    with pytest.raises(ValueError, match="Failed to fetch page"):
+        run_job(single_page_job('http://127.0.0.1:1/'), {'scraper': fast_config(max_retries=0)})
+
+
+@pytest.fixture
+def job_queue(tmp_path):
+    return JobQueue(str(tmp_path / 'jobs.db'))
+
+
+def test_submit_claim_complete(job_queue):
+    job_id = job_queue.submit('https://example.com/', 'pricing', crawl=False, config={'scraper': {'max_pages': 5}})
+    assert job_queue.counts() == {QUEUED: 1, RUNNING: 0, DONE: 0, FAILED: 0}
+
+    job = job_queue.claim('w1')
+    assert job == {'id': job_id, 'url': 'https://example.com/', 'requirement': 'pricing', 'crawl': False,
+                   'config': {'scraper': {'max_pages': 5}}, 'attempts': 1}
+    assert job_queue.claim('w2') is None
+    assert job_queue.renew(job_id, 'w1')
+    assert not job_queue.renew(job_id, 'w2')
+
+    assert job_queue.complete(job_id, 'w1', {'pages': []})
+    stored = job_queue.get(job_id)
+    assert stored['status'] == DONE
+    assert stored['result'] == {'pages': []}
+    assert job_queue.pending() == 0
+
+
+def test_failed_job_keeps_its_error(job_queue):
+    job_id = job_queue.submit('https://example.com/')
+    job_queue.claim('w1')
+
+    assert job_queue.fail(job_id, 'w1', 'boom')
+    assert job_queue.get(job_id)['status'] == FAILED
+    assert job_queue.get(job_id)['error'] == 'boom'
+
+
+def test_expired_lease_is_taken_over(tmp_path):
+    job_queue = JobQueue(str(tmp_path / 'jobs.db'), lease_timeout=0.05)
+    job_id = job_queue.submit('https://example.com/')
+    job_queue.claim('w1')
+    assert job_queue.claim('w2') is None
+
+    time.sleep(0.1)
+    job = job_queue.claim('w2')
+    assert job['id'] == job_id
+    assert job['attempts'] == 2
+    # The first worker's late result is dropped
+    assert not job_queue.complete(job_id, 'w1', {'from': 'w1'})
+    assert not job_queue.renew(job_id, 'w1')
+    assert job_queue.complete(job_id, 'w2', {'from': 'w2'})
+    assert job_queue.get(job_id)['result'] == {'from': 'w2'}
+
+
+def test_expired_lease_fails_after_max_attempts(tmp_path):
+    job_queue = JobQueue(str(tmp_path / 'jobs.db'), lease_timeout=0.05)
+    job_id = job_queue.submit('https://example.com/', max_attempts=1)
+    job_queue.claim('w1')
+
+    time.sleep(0.1)
+    assert job_queue.claim('w2') is None
+    job = job_queue.get(job_id)
+    assert job['status'] == FAILED
+    assert job['error'] == 'Worker lost 1 times'
+
+
+def test_release_worker_requeues_then_fails(job_queue):
+    job_id = job_queue.submit('https://example.com/', max_attempts=2)
+    job_queue.claim('w1')
+
+    assert job_queue.release_worker('w1', 'Worker exited with code -9') == 1
+    job = job_queue.get(job_id)
+    assert job['status'] == QUEUED
+    assert job['error'] == 'Worker exited with code -9'
+
+    assert job_queue.claim('w2')['attempts'] == 2
+    assert job_queue.release_worker('w2', 'Worker exited with code -9') == 0
+    job = job_queue.get(job_id)
+    assert job['status'] == FAILED
+    assert job['error'] == 'Worker exited with code -9'
+    assert job_queue.claim('w3') is None
+
+
+def test_worker_pool_runs_jobs(fixture_site, tmp_path):
+    server = fixture_site(fan_out=3, depth=2)
+    path = str(tmp_path / 'jobs.db')
+    job_queue = JobQueue(path)
+    crawl_id = job_queue.submit(server.base_url, config={'scraper': {'max_depth': 1}})
+    page_id = job_queue.submit(server.base_url, crawl=False)
+    unreachable_id = job_queue.submit('http://127.0.0.1:1/', crawl=False)
+
+    pool = WorkerPool(path, {'processes': 2, 'poll_interval': 0.05, 'quiet': True,
+                             'scraper': fast_config(max_retries=0)})
+    counts = pool.execute(timeout=60)
+
+    assert counts == {QUEUED: 0, RUNNING: 0, DONE: 2, FAILED: 1}
+    assert len(job_queue.get(crawl_id)['result']['pages']) == 4
+    assert job_queue.get(page_id)['result']['page']['title'] == "Synthetic Page 0"
+    assert job_queue.get(unreachable_id)['error'].startswith("Failed to fetch page")
+    assert pool.restarts == 0
@@ -0,0 +1,84 @@
+"""
+Multi-host crawls: per-host queues, politeness and fair scheduling.
+"""
+import time
+from urllib.parse import urlparse
+
+from conftest import fast_config
+from web_scraper_agents.frontier import HostFrontier
+from web_scraper_agents.scraper_agent import WebScraperAgent
+
+
+def host(server):
+    return urlparse(server.base_url).netloc
+
+
+def test_every_seed_host_is_crawled(fixture_site):
+    first = fixture_site(fan_out=3, depth=2)
+    second = fixture_site(fan_out=2, depth=2)
+    scraper = WebScraperAgent(fast_config(seed_urls=[second.base_url]))
+    pages = scraper.execute_crawl(first.base_url)
+
+    assert len(pages) == 13 + 7
+    assert scraper.crawl_stats['pages_per_host'] == {host(first): 13, host(second): 7}
+
+
+def test_hosts_are_fetched_in_parallel_but_each_politely(fixture_site):
+    servers = [fixture_site(fan_out=2, depth=2, slow_ratio=1.0, slow_delay=0.05) for _ in range(3)]
+    scraper = WebScraperAgent(fast_config(seed_urls=[s.base_url for s in servers[1:]],
+                                          max_workers=6, max_connections_per_host=1))
+    started = time.monotonic()
+    pages = scraper.execute_crawl(servers[0].base_url)
+    elapsed = time.monotonic() - started
+
+    assert len(pages) == 3 * 7
+    assert all(server.peak_active == 1 for server in servers)
+    # Serially, 21 slow pages take over a second
+    assert elapsed < 21 * 0.05 * 0.75
+
+
+def test_hosts_take_turns_under_a_page_limit(fixture_site):
+    first = fixture_site(fan_out=3, depth=2)
+    second = fixture_site(fan_out=3, depth=2)
+    scraper = WebScraperAgent(fast_config(seed_urls=[second.base_url], max_pages=10, max_workers=1))
+    scraper.execute_crawl(first.base_url)
+
+    assert scraper.crawl_stats['pages_per_host'] == {host(first): 5, host(second): 5}
+
+
+def test_host_weights_share_the_page_limit(fixture_site):
+    first = fixture_site(fan_out=3, depth=2)
+    second = fixture_site(fan_out=3, depth=2)
+    scraper = WebScraperAgent(fast_config(seed_urls=[second.base_url], max_pages=12, max_workers=1,
+                                          host_weights={host(first): 3}))
+    scraper.execute_crawl(first.base_url)
+
+    assert scraper.crawl_stats['pages_per_host'] == {host(first): 9, host(second): 3}
+
+
+def test_allowed_hosts_admit_matching_links():
+    scraper = WebScraperAgent(fast_config(allowed_hosts=['*.example.com', 'partner.org:8080']))
+    scraper._seed_hosts = {'example.com'}
+
+    assert scraper._crawl_url('https://example.com/a#top') == 'https://example.com/a'
+    assert scraper._crawl_url('https://docs.example.com/b?x=1') == 'https://docs.example.com/b?x=1'
+    assert scraper._crawl_url('http://partner.org:8080/c') == 'http://partner.org:8080/c'
+    assert scraper._crawl_url('https://partner.org/c') is None
+    assert scraper._crawl_url('https://elsewhere.com/') is None
+    assert scraper._crawl_url('ftp://docs.example.com/file') is None
+
+
+def test_frontier_round_robin_and_per_host_limit():
+    frontier = HostFrontier(max_per_host=1)
+    for i in range(3):
+        frontier.push(f'http://a.test/{i}', 0)
+        frontier.push(f'http://b.test/{i}', 0)
+
+    first, _ = frontier.pop()
+    second, _ = frontier.pop()
+    assert {urlparse(first).netloc, urlparse(second).netloc} == {'a.test', 'b.test'}
+    # Both hosts are at their limit until a fetch completes
+    assert frontier.pop() is None
+    frontier.done(first)
+    third, _ = frontier.pop()
+    assert urlparse(third).netloc == urlparse(first).netloc
@@ -0,0 +1,45 @@
+"""
+Lazy imports of the package's public names.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import web_scraper_agents
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def imported_after(code):
+    """Run code in a fresh interpreter; return the heavy modules it left imported."""
+    script = code + "\nimport json, sys\nprint(json.dumps(sorted(m for m in ('bs4', 'requests', " \
+                    "'web_scraper_agents.scraper_agent', 'web_scraper_agents.orchestrator') if m in sys.modules)))"
+    output = subprocess.run([sys.executable, '-c', script], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.splitlines()[-1])
+
+
+def test_importing_the_package_imports_no_heavy_dependencies():
+    assert imported_after("import web_scraper_agents") == []
+    assert imported_after("from web_scraper_agents import ExtractedData, Link") == []
+
+
+def test_agents_are_imported_on_first_access():
+    # Only the scraper's own module (and requests) is loaded; BeautifulSoup waits for the first parse
+    assert imported_after("import web_scraper_agents\nweb_scraper_agents.WebScraperAgent") == [
+        'requests', 'web_scraper_agents.scraper_agent']
+
+
+@pytest.mark.parametrize('name', web_scraper_agents.__all__)
+def test_every_public_name_resolves(name):
+    value = getattr(web_scraper_agents, name)
+    assert value.__name__ == name
+    assert name in dir(web_scraper_agents)
+
+
+def test_unknown_names_raise_attribute_error():
+    with pytest.raises(AttributeError, match="has no attribute 'NoSuchAgent'"):
+        web_scraper_agents.NoSuchAgent
+    assert not hasattr(web_scraper_agents, '_private')
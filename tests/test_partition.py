@@ -0,0 +1,147 @@
+"""
+Partitioned crawls: the hash ring, URL forwarding and merged results.
+"""
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+
+import pytest
+
+from conftest import fast_config
+from web_scraper_agents.models import MultiPageResult
+from web_scraper_agents.orchestrator import AgentOrchestrator
+from web_scraper_agents.partition import HashRing, merge_results
+
+HOSTS = 6
+PAGES_PER_HOST = 4
+
+
+def resolve_locally(host, port):
+    """Resolver stub: every made-up host is this machine."""
+    return ['127.0.0.1']
+
+
+class _LinkedHostsHandler(BaseHTTPRequestHandler):
+    """
+    Serves pages /0 .. /3 on hosts h0.test .. h5.test.
+
+    Each page links to the next page on its host, and the first page of
+    each host to the first page of the next host, so most hosts are only
+    reachable through another host's links.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        host = self.headers['Host']
+        name, port = host.split(':')
+        index, page = int(name[1:].split('.')[0]), self.path.strip('/')
+        with self.server.lock:
+            self.server.hits[(name, self.path)] += 1
+        if not page.isdigit():
+            self._send(404, b"Not found")
+            return
+        page = int(page)
+        links = []
+        if page + 1 < PAGES_PER_HOST:
+            links.append(f"/{page + 1}")
+        if page == 0:
+            links.append(f"http://h{(index + 1) % HOSTS}.test:{port}/0")
+        body = (f"<html><head><title>{name} page {page}</title></head><body><main>"
+                f"<p>Page {page} of {name}, a partitioned crawl test page.</p>"
+                + ''.join(f"<a href='{link}'>{link}</a>" for link in links)
+                + "</main></body></html>")
+        self._send(200, body.encode('utf-8'))
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def linked_hosts():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _LinkedHostsHandler)
+    server.daemon_threads = True
+    server.hits = Counter()
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def crawl_config(**overrides):
+    return {'scraper': fast_config(dns_resolver=resolve_locally, allowed_hosts=['h*.test'],
+                                   max_depth=HOSTS + PAGES_PER_HOST, max_workers=2),
+            **overrides}
+
+
+def test_ring_assigns_each_host_to_one_node():
+    ring = HashRing(['node-0', 'node-1', 'node-2'])
+    hosts = [f'host{i}.example.com' for i in range(3000)]
+    owners = Counter(ring.owner(host) for host in hosts)
+
+    assert set(owners) == {'node-0', 'node-1', 'node-2'}
+    assert min(owners.values()) > 3000 / 3 * 0.6
+    assert ring.owner('HOST1.example.com') == ring.owner('host1.example.com')
+    assert HashRing(['node-0', 'node-1', 'node-2']).owner('host7.example.com') == ring.owner('host7.example.com')
+
+
+def test_adding_a_node_moves_few_hosts():
+    hosts = [f'host{i}.example.com' for i in range(3000)]
+    before = HashRing(['node-0', 'node-1', 'node-2'])
+    after = HashRing(['node-0', 'node-1', 'node-2', 'node-3'])
+    moved = [host for host in hosts if before.owner(host) != after.owner(host)]
+
+    # About a quarter of the hosts move, all of them to the new node
+    assert len(moved) < 3000 * 0.4
+    assert {after.owner(host) for host in moved} == {'node-3'}
+
+
+def test_partitioned_crawl_fetches_every_page_once(linked_hosts):
+    port = linked_hosts.server_address[1]
+    orchestrator = AgentOrchestrator(crawl_config(crawl_nodes=2))
+    result = orchestrator.run_crawl(f'http://h0.test:{port}/0')
+
+    assert len(result.matching_pages) == HOSTS * PAGES_PER_HOST
+    assert result.total_pages_crawled == HOSTS * PAGES_PER_HOST
+    pages = Counter((name, path) for (name, path) in linked_hosts.hits.elements() if path != '/robots.txt')
+    assert len(pages) == HOSTS * PAGES_PER_HOST
+    assert set(pages.values()) == {1}
+
+    nodes = result.crawl_stats['nodes']
+    assert set(nodes) == {'node-0', 'node-1'}
+    # Hosts are disjoint across nodes, and links to other nodes' hosts were forwarded
+    per_node_hosts = [set(stats['pages_per_host']) for stats in nodes.values()]
+    assert not per_node_hosts[0] & per_node_hosts[1]
+    assert len(result.crawl_stats['pages_per_host']) == HOSTS
+    forwarded = sum(stats['partition']['forwarded'] for stats in nodes.values())
+    received = sum(stats['partition']['received'] for stats in nodes.values())
+    assert forwarded == received > 0
+
+
+def test_merge_results_sums_counters_and_keeps_per_node_stats():
+    first = MultiPageResult(base_url='http://a/', requirement=None, total_pages_crawled=3,
+                            skipped_pages={'http://a/x': 'reason'},
+                            crawl_stats={'pages_fetched': 3, 'budget_exhausted': False,
+                                         'pages_per_host': {'a': 3}, 'partition': {'node': 'node-0'}})
+    second = MultiPageResult(base_url='http://a/', requirement=None, total_pages_crawled=2,
+                             crawl_stats={'pages_fetched': 2, 'budget_exhausted': True,
+                                          'pages_per_host': {'b': 2}, 'partition': {'node': 'node-1'}})
+    merged = merge_results([first, second])
+
+    assert merged.total_pages_crawled == 5
+    assert merged.skipped_pages == {'http://a/x': 'reason'}
+    assert merged.crawl_stats['pages_fetched'] == 5
+    assert merged.crawl_stats['budget_exhausted'] is True
+    assert merged.crawl_stats['pages_per_host'] == {'a': 3, 'b': 2}
+    assert set(merged.crawl_stats['nodes']) == {'node-0', 'node-1'}
+    with pytest.raises(ValueError):
+        merge_results([])
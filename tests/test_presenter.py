@@ -0,0 +1,68 @@
+"""
+Report rendering in every output format.
+"""
+from io import StringIO
+import json
+
+import pytest
+
+from web_scraper_agents.models import AnalysisResult, ExtractedData, Link, MultiPageResult, PageResult
+from web_scraper_agents.presenter_agent import PresenterAgent
+
+
+@pytest.fixture
+def page():
+    data = ExtractedData(url='http://example.com/a', title='Widgets & <Gadgets>',
+                         paragraphs=['Some text.'], links=[Link(url='http://example.com/b', text='B')],
+                         metadata={'description': 'A page'})
+    analysis = AnalysisResult(url=data.url, summary='A summary.', key_points=['First point'],
+                              topics=['widgets'], word_count=2, importance_score=0.5)
+    return data, analysis
+
+
+@pytest.mark.parametrize('output_format', ['text', 'markdown', 'html'])
+def test_reports_fill_in_every_field(page, output_format):
+    report = PresenterAgent({'output_format': output_format}).execute(*page).formatted_text
+
+    assert 'First point' in report and 'widgets' in report and '0.50' in report
+    assert '{' + 'title}' not in report
+    if output_format == 'html':
+        assert 'Widgets &amp; &lt;Gadgets&gt;' in report
+    else:
+        assert 'Widgets & <Gadgets>' in report
+
+
+def test_jsonl_report_is_one_record(page):
+    report = PresenterAgent({'output_format': 'jsonl'}).execute(*page).formatted_text
+    assert json.loads(report)['title'] == 'Widgets & <Gadgets>'
+
+
+@pytest.fixture
+def multi_result(page):
+    data, analysis = page
+    second = ExtractedData(url='http://example.com/b', title='Second page', paragraphs=['More text.'])
+    return MultiPageResult(
+        base_url='http://example.com/', requirement='widgets', total_pages_crawled=3,
+        matching_pages=[PageResult(data, analysis),
+                        PageResult(second, AnalysisResult(url=second.url, summary='Another summary.'))],
+        skipped_pages={'http://example.com/file.zip': 'Unsupported content type: application/zip'},
+        crawl_stats={'wire_bytes': 1000, 'decoded_bytes': 4000},
+        page_changes={data.url: 'new', second.url: 'unchanged'})
+
+
+@pytest.mark.parametrize('output_format', ['text', 'markdown', 'html', 'jsonl'])
+def test_streamed_report_matches_the_built_report(multi_result, output_format):
+    presenter = PresenterAgent({'output_format': output_format})
+    sink = StringIO()
+    presenter.write_multi(multi_result, sink)
+
+    report = presenter.execute_multi(multi_result).formatted_text
+    assert sink.getvalue() == report
+    assert 'Second page' in report
+
+
+def test_block_templates_render_with_str_format():
+    render = PresenterAgent()._templates['text'].multi_relevance
+    assert render(relevance_score=0.123, unused='x') == "Relevance:      0.12/1.00"
+    with pytest.raises(KeyError):
+        render()
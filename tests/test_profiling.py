@@ -0,0 +1,105 @@
+"""
+Per-page profiling: dumps of expensive calls, the summary, and tracing cleanup.
+"""
+import os
+import time
+import tracemalloc
+
+import pytest
+
+from conftest import fast_config
+from web_scraper_agents.orchestrator import AgentOrchestrator
+from web_scraper_agents.profiling import SUMMARY_FILE, PageProfiler
+
+
+@pytest.fixture(autouse=True)
+def no_tracing():
+    assert not tracemalloc.is_tracing()
+    yield
+    tracemalloc.stop()
+
+
+def slow_call(seconds):
+    time.sleep(seconds)
+
+
+def test_only_slow_calls_dump_profiles(tmp_path):
+    profiler = PageProfiler(str(tmp_path), min_seconds=0.05)
+    with profiler.profile('extract', 'https://example.com/fast'):
+        pass
+    with profiler.profile('extract', 'https://example.com/slow'):
+        slow_call(0.1)
+
+    assert [record.url for record in profiler.dumped] == ['https://example.com/slow']
+    assert profiler.dumped[0].files == [str(tmp_path / '0002-extract-example.com_slow.prof')]
+    assert os.listdir(tmp_path) == ['0002-extract-example.com_slow.prof']
+    assert [record.url for record in profiler.slowest()] == ['https://example.com/slow', 'https://example.com/fast']
+
+
+def test_only_large_calls_dump_snapshots(tmp_path):
+    profiler = PageProfiler(str(tmp_path), cpu=False, memory=True, min_memory=1024 * 1024)
+    assert tracemalloc.is_tracing()
+    with profiler.profile('analyze', 'https://example.com/small'):
+        data = bytearray(1024)
+    with profiler.profile('analyze', 'https://example.com/large'):
+        data = bytearray(4 * 1024 * 1024)
+    del data
+
+    small, large = sorted(profiler.slowest(), key=lambda record: record.peak_bytes)
+    assert small.peak_bytes < 1024 * 1024 <= large.peak_bytes
+    assert profiler.dumped == [large]
+    assert large.files == [str(tmp_path / '0002-analyze-example.com_large.snapshot')]
+    assert tracemalloc.Snapshot.load(large.files[0]).statistics('filename')
+
+    profiler.close()
+    assert not tracemalloc.is_tracing()
+
+
+def test_dumps_are_capped(tmp_path):
+    profiler = PageProfiler(str(tmp_path), min_seconds=0, max_dumps=2)
+    for i in range(5):
+        with profiler.profile('extract', f'https://example.com/{i}'):
+            pass
+
+    assert len(profiler.dumped) == 2
+    assert len(os.listdir(tmp_path)) == 2
+    assert len(profiler.slowest()) == 5
+
+
+def test_summary_lists_stages_slowest_calls_and_functions(tmp_path):
+    profiler = PageProfiler(str(tmp_path), min_seconds=0.05, top=2)
+    for stage, url, seconds in (('extract', 'https://example.com/a', 0.06), ('extract', 'https://example.com/b', 0),
+                                ('analyze', 'https://example.com/a', 0), ('present', 'report', 0)):
+        with profiler.profile(stage, url):
+            slow_call(seconds)
+
+    path = profiler.write_summary()
+    assert path == str(tmp_path / SUMMARY_FILE)
+    with open(path, encoding='utf-8') as f:
+        summary = f.read()
+    lines = summary.splitlines()
+    # Stages in pipeline order, with their call counts
+    stage_lines = [line.split()[:2] for line in lines[2:5]]
+    assert stage_lines == [['extract', '2'], ['analyze', '1'], ['present', '1']]
+    # Only the two slowest calls are kept; the dumped profile is listed with its functions
+    slowest = summary.split('SLOWEST CALLS', 1)[1]
+    assert 'extract  https://example.com/a' in slowest
+    assert '0001-extract-example.com_a.prof' in slowest
+    assert 'slow_call' in slowest
+    assert slowest.count('ms  ') == 2
+
+
+def test_orchestrator_run_stops_tracing(fixture_site, tmp_path):
+    server = fixture_site(fan_out=2, depth=1)
+    orchestrator = AgentOrchestrator({'scraper': fast_config(), 'profile_dir': str(tmp_path),
+                                      'profile_memory': True, 'profile_min_seconds': 60})
+    assert tracemalloc.is_tracing()
+
+    orchestrator.execute(server.base_url)
+    assert not tracemalloc.is_tracing()
+    assert os.path.exists(tmp_path / SUMMARY_FILE)
+
+    # A later run traces again
+    orchestrator.execute(server.base_url)
+    assert not tracemalloc.is_tracing()
+    assert orchestrator.profiler.slowest()[0].peak_bytes > 0
@@ -0,0 +1,119 @@
+"""
+Retries with backoff and per-host circuit breakers.
+"""
+import pytest
+import requests
+
+from conftest import fast_config
+from web_scraper_agents.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreakers, RetryPolicy
+from web_scraper_agents.scraper_agent import WebScraperAgent
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic for the resilience module."""
+    now = [1000.0]
+    monkeypatch.setattr('web_scraper_agents.resilience.time.monotonic', lambda: now[0])
+    return now
+
+
+def test_retry_policy_limits_and_backoff():
+    policy = RetryPolicy(max_retries=3, backoff=1.0, max_backoff=5.0, seed=1)
+    assert policy.should_retry(0, 0)
+    assert policy.should_retry(2, 503)
+    assert not policy.should_retry(3, 503)
+    assert not policy.should_retry(0, 404)
+
+    for attempt in range(6):
+        assert 0 <= policy.delay(attempt) <= min(5.0, 2 ** attempt)
+    assert policy.delay(0, retry_after=4) == 4
+    assert policy.delay(0, retry_after=60) is None
+
+
+def test_breaker_trips_and_probes_after_cool_down(clock):
+    breakers = CircuitBreakers(threshold=3, reset_timeout=10)
+    for _ in range(2):
+        assert breakers.allow('a')
+        assert not breakers.record_failure('a')
+    assert breakers.record_failure('a')
+    assert not breakers.allow('a')
+    assert breakers.is_open('a')
+
+    clock[0] += 10
+    assert breakers.allow('a')           # The probe
+    assert not breakers.allow('a')       # Only one probe at a time
+    assert breakers.snapshot()['a']['state'] == HALF_OPEN
+    breakers.record_success('a')
+    assert breakers.allow('a') and breakers.allow('a')
+    assert breakers.snapshot()['a'] == {'state': CLOSED, 'failures': 0, 'trips': 1, 'rejected': 2}
+
+
+def test_failed_probe_reopens_the_breaker(clock):
+    breakers = CircuitBreakers(threshold=1, reset_timeout=10)
+    breakers.record_failure('a')
+    clock[0] += 10
+    assert breakers.allow('a')
+    assert breakers.record_failure('a')
+    assert not breakers.allow('a')
+    assert breakers.snapshot()['a'] == {'state': OPEN, 'failures': 2, 'trips': 2, 'rejected': 1}
+
+
+def test_released_probe_lets_the_next_request_probe(clock):
+    breakers = CircuitBreakers(threshold=1, reset_timeout=10)
+    breakers.record_failure('a')
+    clock[0] += 10
+    assert breakers.allow('a')
+    breakers.release('a')
+    assert breakers.allow('a')
+    breakers.record_success('a')
+    assert breakers.snapshot()['a']['state'] == CLOSED
+
+
+def test_transient_errors_are_retried(fixture_site):
+    server = fixture_site(fan_out=3, depth=1, capacity=1, slow_ratio=1.0, slow_delay=0.05)
+    scraper = WebScraperAgent(fast_config(max_workers=4, max_connections_per_host=4, max_retries=10))
+    pages = scraper.execute_crawl(server.base_url)
+
+    assert len(pages) == 4
+    assert scraper.crawl_stats['retries'] >= server.overloaded > 0
+
+
+def test_permanent_errors_are_not_retried(fixture_site):
+    server = fixture_site(fan_out=3, depth=1, error_ratio=1.0, error_status=404)
+    scraper = WebScraperAgent(fast_config(max_retries=3))
+    scraper.execute_crawl(server.base_url)
+
+    assert scraper.crawl_stats['retries'] == 0
+    assert all(count == 1 for count in server.hits.values())
+
+
+def test_failing_host_trips_its_breaker(fixture_site):
+    server = fixture_site(fan_out=12, depth=1, error_ratio=1.0, error_status=500)
+    scraper = WebScraperAgent(fast_config(max_retries=0, circuit_breaker_threshold=3,
+                                          circuit_breaker_reset=60))
+    pages = scraper.execute_crawl(server.base_url)
+
+    # The seed page and the three failures that tripped the breaker
+    assert len(pages) == 1 + 3
+    rejected = [url for url, reason in scraper.skipped_pages.items() if reason.startswith("Circuit breaker open")]
+    assert len(rejected) == 12 - 3
+    assert scraper.crawl_stats['circuit_rejected'] == len(rejected)
+    assert server.total_hits == 1 + 3
+    assert not {page.url for page in pages} & set(rejected)
+
+
+def test_probe_without_a_response_does_not_block_the_host(fixture_site, monkeypatch):
+    server = fixture_site(fan_out=2, depth=1)
+    scraper = WebScraperAgent(fast_config(circuit_breaker_threshold=1, circuit_breaker_reset=0))
+    host = server.base_url.split('/')[2]
+    scraper.breakers.record_failure(host)
+
+    def redirect_loop(*args, **kwargs):
+        raise requests.exceptions.TooManyRedirects("Exceeded 30 redirects")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(scraper.session, 'get', redirect_loop)
+        assert scraper._fetch_page(server.base_url).error == "Exceeded 30 redirects"
+
+    assert scraper._fetch_page(server.base_url).status_code == 200
+    assert scraper.breakers.snapshot()[host]['state'] == CLOSED
@@ -0,0 +1,120 @@
+"""
+robots.txt parsing, product tokens and the per-host policy cache.
+"""
+import pytest
+
+from conftest import fast_config
+from web_scraper_agents.robots import ROBOTS_PRODUCT_TOKEN, RobotsCache, RobotsPolicy, product_token
+from web_scraper_agents.scraper_agent import WebScraperAgent
+
+ROBOTS_TXT = """
+User-agent: *
+Disallow: /private
+Allow: /private/open
+
+User-agent: WebScraperAgent
+Disallow: /crawler-only
+Disallow: /*.pdf$
+Crawl-delay: 2
+
+Sitemap: https://example.com/sitemap.xml
+"""
+
+
+def test_most_specific_group_applies():
+    policy = RobotsPolicy.parse(ROBOTS_TXT, 'WebScraperAgent')
+    assert not policy.allowed('/crawler-only/page')
+    assert not policy.allowed('/files/report.pdf')
+    assert policy.allowed('/files/report.pdf?download=1')
+    assert policy.allowed('/private')
+    assert policy.crawl_delay == 2
+    assert policy.sitemaps == ['https://example.com/sitemap.xml']
+
+
+def test_other_agents_get_the_star_group():
+    policy = RobotsPolicy.parse(ROBOTS_TXT, 'OtherBot')
+    assert not policy.allowed('/private/page')
+    assert policy.allowed('/private/open/page')
+    assert policy.allowed('/crawler-only')
+    assert policy.crawl_delay is None
+
+
+@pytest.mark.parametrize('user_agent, token', [
+    ('MyBot/1.0 (+https://example.com/bot)', 'MyBot'),
+    ('my_crawler', 'my_crawler'),
+    ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36', ROBOTS_PRODUCT_TOKEN),
+    ('', ROBOTS_PRODUCT_TOKEN),
+    (None, ROBOTS_PRODUCT_TOKEN),
+    ('Bot 2000/1.0', ROBOTS_PRODUCT_TOKEN),
+])
+def test_product_token(user_agent, token):
+    assert product_token(user_agent) == token
+
+
+def test_default_scraper_matches_its_own_group():
+    def robots_token(**config):
+        return WebScraperAgent(fast_config(respect_robots=True, **config)).robots.user_agent
+
+    assert robots_token() == ROBOTS_PRODUCT_TOKEN
+    assert robots_token(user_agent='MyBot/1.0') == 'MyBot'
+    assert robots_token(robots_user_agent='Other') == 'Other'
+
+
+class FakeFetch:
+    """robots.txt fetcher replaying a list of (status, text) responses or exceptions."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def __call__(self, url):
+        self.calls += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic for the robots module."""
+    now = [1000.0]
+    monkeypatch.setattr('web_scraper_agents.robots.time.monotonic', lambda: now[0])
+    return now
+
+
+def test_fetched_policy_is_cached_for_ttl(clock):
+    fetch = FakeFetch((200, "User-agent: *\nDisallow: /a\n"), (200, ""))
+    cache = RobotsCache('Bot', fetch, ttl=100, failure_ttl=10)
+
+    assert not cache.allowed('http://example.com/a')
+    clock[0] += 99
+    assert not cache.allowed('http://example.com/a/b')
+    assert fetch.calls == 1
+    clock[0] += 2
+    assert cache.allowed('http://example.com/a')
+    assert fetch.calls == 2
+
+
+def test_missing_robots_allows_everything(clock):
+    fetch = FakeFetch((404, ""))
+    cache = RobotsCache('Bot', fetch, ttl=100, failure_ttl=10)
+    assert cache.allowed('http://example.com/anything')
+    clock[0] += 50
+    assert cache.allowed('http://example.com/else')
+    assert fetch.calls == 1
+
+
+@pytest.mark.parametrize('failure', [(503, ""), ConnectionError("unreachable")])
+def test_failed_fetch_disallows_only_briefly(clock, failure):
+    fetch = FakeFetch(failure, (200, "User-agent: *\nDisallow: /a\n"))
+    cache = RobotsCache('Bot', fetch, ttl=24 * 60 * 60, failure_ttl=10)
+
+    assert not cache.allowed('http://example.com/page')
+    clock[0] += 5
+    assert not cache.allowed('http://example.com/page')
+    assert fetch.calls == 1
+    clock[0] += 6
+    assert cache.allowed('http://example.com/page')
+    assert not cache.allowed('http://example.com/a')
+    assert fetch.calls == 2
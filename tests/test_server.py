@@ -0,0 +1,99 @@
+"""
+The scraper server's JSON API.
+"""
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from conftest import fast_config
+from web_scraper_agents.server import ScraperServer, ScraperService
+
+
+@pytest.fixture(scope='module')
+def api():
+    with ScraperServer({'workers': 1, 'scraper': fast_config()}, port=0) as server:
+        yield server
+
+
+def post(server, payload):
+    """POST a job; return (status, decoded body)."""
+    request = urllib.request.Request(server.address + 'jobs', data=json.dumps(payload).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_scrape_job_waits_for_its_result(api, fixture_site):
+    site = fixture_site(fan_out=2, depth=1)
+    status, job = post(api, {'type': 'scrape', 'url': site.base_url, 'timeout': 30})
+
+    assert status == 200
+    assert job['status'] == 'done'
+    assert job['result']['page']['title'] == "Synthetic Page 0"
+
+
+def test_unreachable_page_fails_the_scrape_job(api):
+    status, job = post(api, {'type': 'scrape', 'url': 'http://127.0.0.1:1/', 'timeout': 30})
+
+    assert status == 200
+    assert job['status'] == 'failed'
+    assert job['error'].startswith("Failed to fetch page")
+    assert 'result' not in job
+
+
+def test_crawl_job_with_overrides(api, fixture_site):
+    site = fixture_site(fan_out=3, depth=2)
+    status, job = post(api, {'type': 'crawl', 'url': site.base_url, 'max_depth': 1, 'timeout': '30'})
+
+    assert status == 200
+    assert len(job['result']['pages']) == 4
+
+
+@pytest.mark.parametrize('timeout', ['soon', [5], {'seconds': 5}, True, -1, 'inf', 'nan'])
+def test_invalid_wait_timeout_is_refused(api, fixture_site, timeout):
+    site = fixture_site(fan_out=2, depth=1)
+    jobs = len(api.service._jobs)
+    status, body = post(api, {'type': 'scrape', 'url': site.base_url, 'timeout': timeout})
+
+    assert status == 400
+    assert "'timeout'" in body['error']
+    # Nothing was queued
+    assert len(api.service._jobs) == jobs
+    assert site.total_hits == 0
+
+
+def test_invalid_jobs_are_refused(api):
+    assert post(api, {'type': 'scrape', 'url': 'ftp://example.com/'})[0] == 400
+    assert post(api, {'type': 'compile'})[0] == 400
+    assert post(api, {'type': 'query'})[0] == 400
+
+
+@pytest.mark.parametrize('name, value', [
+    ('max_pages', 'many'), ('max_pages', 0), ('max_pages', 2.5), ('max_pages', True),
+    ('max_depth', -1), ('max_depth', [1]), ('time_budget', 'soon'), ('time_budget', -5),
+    ('time_budget', 'inf'), ('time_budget', 'nan'),
+])
+def test_invalid_crawl_numbers_are_refused(api, fixture_site, name, value):
+    site = fixture_site(fan_out=2, depth=1)
+    jobs = len(api.service._jobs)
+    status, body = post(api, {'type': 'crawl', 'url': site.base_url, name: value})
+
+    assert status == 400
+    assert f"'{name}'" in body['error']
+    assert len(api.service._jobs) == jobs
+    assert site.total_hits == 0
+
+
+@pytest.mark.parametrize('limit', ['ten', 0, 1.5])
+def test_invalid_query_limit_is_refused(tmp_path, limit):
+    # The service is not started, so submitted jobs stay queued
+    service = ScraperService({'state_file': str(tmp_path / 'state.json')})
+
+    assert service.submit('query', {'limit': '10'}).params['limit'] == 10
+    with pytest.raises(ValueError, match="'limit'"):
+        service.submit('query', {'limit': limit})
@@ -0,0 +1,120 @@
+"""
+JSON-LD, OpenGraph and microdata extraction.
+"""
+from bs4 import BeautifulSoup
+
+from web_scraper_agents.crawl_state import _extracted_from_dict, _extracted_to_dict
+from web_scraper_agents.models import StructuredData, WebPage
+from web_scraper_agents.scraper_agent import WebScraperAgent
+from web_scraper_agents.structured_data import extract_structured_data
+
+PAGE = """<html><head>
+<title>Widget</title>
+<meta name="description" content="A widget">
+<meta property="og:title" content="The Widget">
+<meta property="og:image" content="https://example.com/1.png">
+<meta property="og:image" content="https://example.com/2.png">
+<meta property="article:author" content="Ann">
+<script type="application/ld+json">
+{"@context": "https://schema.org", "@graph": [
+  {"@type": "Organization", "name": "Example Inc"},
+  {"@type": ["Product", "Thing"], "name": "Widget"}
+]}
+</script>
+<script type="application/ld+json; charset=utf-8">[{"@type": "BreadcrumbList"}]</script>
+<script type="application/ld+json">{ not json </script>
+<script type="text/javascript">var notData = 1;</script>
+</head><body>
+<div itemscope itemtype="https://schema.org/Product" itemid="/widgets/1">
+  <span itemprop="name">Widget</span>
+  <img itemprop="image" src="/img/widget.png">
+  <div itemprop="offers" itemscope itemtype="https://schema.org/Offer">
+    <meta itemprop="priceCurrency" content="EUR">
+    <data itemprop="price" value="9.99">9,99 €</data>
+    <time itemprop="validFrom" datetime="2024-01-01">New Year</time>
+  </div>
+  <span itemprop="name alternateName">Gadget</span>
+</div>
+<p>The widget page has a long enough paragraph to be extracted.</p>
+</body></html>"""
+
+
+def parse(html=PAGE, **kwargs):
+    return extract_structured_data(BeautifulSoup(html, 'html.parser'), 'https://example.com/p', **kwargs)
+
+
+def test_meta_tags_and_opengraph_in_one_pass():
+    metadata, data = parse()
+
+    assert metadata['description'] == 'A widget'
+    assert metadata['og:title'] == 'The Widget'
+    assert data.opengraph == {
+        'og:title': ['The Widget'],
+        'og:image': ['https://example.com/1.png', 'https://example.com/2.png'],
+        'article:author': ['Ann'],
+    }
+
+
+def test_json_ld_is_decoded_lazily_and_invalid_blocks_are_dropped():
+    _, data = parse()
+
+    assert len(data.json_ld_raw) == 3
+    assert data._json_ld is None
+    assert [item.get('@type') for item in data.json_ld] == [None, 'BreadcrumbList']
+    products = data.items('Product')
+    assert products[0] == {'@type': ['Product', 'Thing'], 'name': 'Widget'}
+    assert products[1]['type'] == ['https://schema.org/Product']
+    assert data.items('https://schema.org/Organization')[0]['name'] == 'Example Inc'
+
+
+def test_microdata_items_nest_and_resolve_urls():
+    _, data = parse()
+
+    assert len(data.microdata) == 1
+    item = data.microdata[0]
+    assert item['type'] == ['https://schema.org/Product']
+    assert item['id'] == 'https://example.com/widgets/1'
+    properties = item['properties']
+    assert properties['name'] == ['Widget', 'Gadget']
+    assert properties['alternateName'] == ['Gadget']
+    assert properties['image'] == ['https://example.com/img/widget.png']
+    offer = properties['offers'][0]
+    assert offer['type'] == ['https://schema.org/Offer']
+    assert offer['properties'] == {'priceCurrency': ['EUR'], 'price': ['9.99'], 'validFrom': ['2024-01-01']}
+
+
+def test_json_ld_beyond_the_size_budget_is_skipped():
+    _, data = parse(max_json_ld_size=50)
+
+    # The @graph block does not fit; the smaller blocks after it still do
+    assert data.json_ld_raw == ['[{"@type": "BreadcrumbList"}]', '{ not json']
+    assert data.skipped == 1
+    assert data.items('Product')[0]['type'] == ['https://schema.org/Product']
+
+
+def test_pages_without_structured_data():
+    metadata, data = parse("<html><head><title>Plain</title></head><body><p>Text</p></body></html>")
+    assert metadata == {}
+    assert not data
+    assert data.items() == []
+
+
+def test_scraper_extracts_structured_data_and_state_round_trips():
+    scraper = WebScraperAgent()
+    extracted = scraper._extract_data(WebPage(url='https://example.com/p', content=PAGE, status_code=200))
+
+    assert extracted.structured_data.opengraph['og:title'] == ['The Widget']
+    assert extracted.metadata['description'] == 'A widget'
+    assert len(extracted.structured_data.items('Product')) == 2
+
+    restored = _extracted_from_dict(_extracted_to_dict(extracted))
+    assert restored.structured_data == extracted.structured_data
+    assert restored.structured_data.items('Offer') == []
+    assert len(restored.structured_data.items('Product')) == 2
+
+
+def test_old_state_records_load_without_structured_data():
+    record = _extracted_to_dict(WebScraperAgent()._extract_data(
+        WebPage(url='https://example.com/p', content=PAGE, status_code=200)))
+    del record['structured_data']
+    assert _extracted_from_dict(record).structured_data == StructuredData()
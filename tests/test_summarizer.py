@@ -0,0 +1,84 @@
+"""
+Sentence splitting and extractive summaries.
+"""
+from web_scraper_agents.analyzer_agent import AnalyzerAgent
+from web_scraper_agents.models import ExtractedData
+from web_scraper_agents.summarizer import split_sentences, summarize
+
+# Sentences about one subject, so they share enough words to rank each other
+GARDEN = [
+    "The community garden grows tomatoes, beans and herbs every summer season.",
+    "Volunteers water the garden beds early each morning before the heat arrives.",
+    "Tomatoes in the garden need staking once the plants grow tall in summer.",
+    "Local schools visit the garden to learn how beans and herbs are grown.",
+    "The garden committee meets monthly to plan planting for the next season.",
+    "Compost from nearby kitchens feeds the garden beds throughout the year.",
+    "Herbs such as basil and mint spread quickly across the garden beds.",
+    "Neighbours share the summer harvest of tomatoes and beans at a weekly market.",
+    "A rain barrel beside the shed collects water for the garden in dry weeks.",
+    "New volunteers are always welcome to join the garden on weekend mornings.",
+]
+
+
+def test_split_sentences_at_terminal_punctuation():
+    text = 'It rained all day. Did the roads flood? Yes! He said "Stay inside." Then the sun came out.'
+    assert split_sentences(text) == ["It rained all day.", "Did the roads flood?", "Yes!",
+                                     'He said "Stay inside."', "Then the sun came out."]
+
+
+def test_split_sentences_keeps_abbreviations_and_initials():
+    text = ("Dr. Smith met J. R. R. Tolkien at the U.S. Embassy, e.g. During the war. "
+            "Prices rose approx. 5 percent. Version 2.0 shipped in 2004.")
+    assert split_sentences(text) == ["Dr. Smith met J. R. R. Tolkien at the U.S. Embassy, e.g. During the war.",
+                                     "Prices rose approx. 5 percent.",
+                                     "Version 2.0 shipped in 2004."]
+
+
+def test_split_sentences_needs_a_capital_or_digit_after_the_boundary():
+    assert split_sentences("see the docs. then retry") == ["see the docs. then retry"]
+    assert split_sentences("  ") == []
+
+
+def test_summary_respects_max_sentences_and_keeps_document_order():
+    summary = summarize(GARDEN, max_sentences=3)
+
+    assert len(summary) == 3
+    assert summary == [sentence for sentence in GARDEN if sentence in summary]
+    assert summarize(GARDEN, max_sentences=0) == []
+
+
+def test_short_texts_are_returned_whole():
+    assert summarize(GARDEN[:2] + ["Too short."], max_sentences=5) == GARDEN[:2]
+
+
+def test_only_max_candidates_sentences_are_considered():
+    assert summarize(GARDEN, max_sentences=5, max_candidates=4) == GARDEN[:4]
+    assert set(summarize(GARDEN, max_sentences=2, max_candidates=4)) <= set(GARDEN[:4])
+
+
+def test_sentences_with_the_requirement_are_preferred():
+    paragraphs = GARDEN + ["A fox was once seen crossing the street at night near the station."]
+
+    assert paragraphs[-1] not in summarize(paragraphs, max_sentences=2)
+    summary = summarize(paragraphs, max_sentences=2, requirement='FOX')
+    assert paragraphs[-1] in summary
+    assert len(summary) == 2
+
+
+def test_near_duplicate_sentences_are_picked_once():
+    repeated = "The community garden grows tomatoes, beans and herbs every summer season."
+    paragraphs = [repeated, repeated + " ", repeated.replace("every", "each")] + GARDEN[1:]
+
+    summary = summarize(paragraphs, max_sentences=4)
+    assert len(summary) == 4
+    assert sum(1 for sentence in summary if "grows tomatoes, beans and herbs" in sentence) == 1
+
+
+def test_analyzer_bounds_key_sentences():
+    data = ExtractedData(url='https://example.com/garden', title="Garden", paragraphs=GARDEN)
+    summary = AnalyzerAgent({'max_summary_sentences': 2}).execute(data).summary
+
+    lines = summary.splitlines()
+    key_sentences = lines[lines.index("Key Sentences:") + 1:]
+    assert len(key_sentences) == 2
+    assert all(line[2:] in GARDEN for line in key_sentences)
@@ -0,0 +1,93 @@
+"""
+Connect/read timeouts, the per-page deadline and the crawl time budget.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+
+import pytest
+
+from conftest import fast_config
+from web_scraper_agents.orchestrator import AgentOrchestrator
+from web_scraper_agents.scraper_agent import BUDGET_EXHAUSTED, WebScraperAgent
+
+
+class _DripHandler(BaseHTTPRequestHandler):
+    """Sends its headers at once, then one body byte every 50 ms."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', '1000')
+        self.end_headers()
+        try:
+            for _ in range(1000):
+                self.wfile.write(b' ')
+                self.wfile.flush()
+                time.sleep(0.05)
+        except OSError:
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def drip_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _DripHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_read_timeout_fails_a_stalled_response(fixture_site):
+    server = fixture_site(fan_out=1, depth=1, slow_ratio=1.0, slow_delay=0.5)
+    scraper = WebScraperAgent(fast_config(read_timeout=0.1, max_retries=0))
+    started = time.monotonic()
+    web_page = scraper._fetch_page(server.base_url)
+
+    assert web_page.error and 'timed out' in web_page.error.lower()
+    assert time.monotonic() - started < 0.45
+
+
+def test_page_deadline_stops_a_slow_drip(drip_server):
+    # Every read returns within the read timeout, but the page as a whole takes too long
+    scraper = WebScraperAgent(fast_config(read_timeout=5, page_timeout=0.5, max_retries=2))
+    started = time.monotonic()
+    web_page = scraper._fetch_page(drip_server)
+    elapsed = time.monotonic() - started
+
+    assert web_page.error == "Deadline exceeded while reading the response body"
+    assert elapsed < 1.5
+    # No retry starts once the deadline has passed
+    assert scraper.crawl_stats['retries'] == 0
+
+
+def test_time_budget_returns_partial_results(fixture_site):
+    server = fixture_site(fan_out=4, depth=2, slow_ratio=1.0, slow_delay=0.1)
+    scraper = WebScraperAgent(fast_config(max_workers=2, max_connections_per_host=2))
+    started = time.monotonic()
+    pages = scraper.execute_crawl(server.base_url, time_budget=0.5)
+    elapsed = time.monotonic() - started
+
+    assert scraper.crawl_stats['budget_exhausted']
+    assert 0 < len(pages) < 21
+    assert elapsed < 0.5 + 0.5
+    budget_skipped = {url for url, reason in scraper.skipped_pages.items() if reason == BUDGET_EXHAUSTED}
+    assert not {page.url for page in pages} & budget_skipped
+    assert all(page.title.startswith("Synthetic Page") for page in pages)
+
+
+def test_orchestrator_time_budget(fixture_site):
+    server = fixture_site(fan_out=4, depth=2, slow_ratio=1.0, slow_delay=0.1)
+    orchestrator = AgentOrchestrator({'scraper': fast_config(max_workers=2, max_connections_per_host=2),
+                                      'time_budget': 0.5})
+    result = orchestrator.run_crawl(server.base_url)
+
+    assert result.crawl_stats['budget_exhausted']
+    assert 0 < len(result.matching_pages) < 21
@@ -1,28 +1,58 @@
 """
 Web Scraper Agents - An agent-based architecture for web scraping and analysis.
+
+Submodules are imported on first attribute access (PEP 562), so importing
+the package, or a light submodule such as models, does not pull in
+requests, BeautifulSoup or the agents.
 """
+from typing import TYPE_CHECKING
+import importlib
+
+if TYPE_CHECKING:
+    from .base_agent import BaseAgent
+    from .scraper_agent import WebScraperAgent
+    from .analyzer_agent import AnalyzerAgent
+    from .presenter_agent import PresenterAgent
+    from .orchestrator import AgentOrchestrator
+    from .models import (
+        WebPage,
+        ExtractedData,
+        AnalysisResult,
+        PresentationResult,
+        Heading,
+        Link,
+        Image
+    )
 
-from .base_agent import BaseAgent
-from .scraper_agent import WebScraperAgent
-from .analyzer_agent import AnalyzerAgent
-from .presenter_agent import PresenterAgent
-from .orchestrator import AgentOrchestrator
-from .models import (
-    WebPage,
-    ExtractedData,
-    AnalysisResult,
-    PresentationResult
-)
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'BaseAgent': 'base_agent',
+    'WebScraperAgent': 'scraper_agent',
+    'AnalyzerAgent': 'analyzer_agent',
+    'PresenterAgent': 'presenter_agent',
+    'AgentOrchestrator': 'orchestrator',
+    'WebPage': 'models',
+    'ExtractedData': 'models',
+    'AnalysisResult': 'models',
+    'PresentationResult': 'models',
+    'Heading': 'models',
+    'Link': 'models',
+    'Image': 'models',
+}
 
 __version__ = '1.0.0'
-__all__ = [
-    'BaseAgent',
-    'WebScraperAgent',
-    'AnalyzerAgent',
-    'PresenterAgent',
-    'AgentOrchestrator',
-    'WebPage',
-    'ExtractedData',
-    'AnalysisResult',
-    'PresentationResult',
-]
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """Import the submodule that defines a public name on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
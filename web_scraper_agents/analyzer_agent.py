@@ -7,6 +7,7 @@ from collections import Counter
 
 from .base_agent import BaseAgent
 from .models import ExtractedData, AnalysisResult
+from .summarizer import MAX_CANDIDATES, summarize
 
 
 class AnalyzerAgent(BaseAgent):
@@ -16,6 +17,8 @@ class AnalyzerAgent(BaseAgent):
         """Initialize the analyzer agent."""
         super().__init__("AnalyzerAgent", config)
         self.max_summary_sentences = self.config.get('max_summary_sentences', 5)
+        # Sentences scored per page; bounds the cost of summarizing very long pages
+        self.max_summary_candidates = self.config.get('max_summary_candidates', MAX_CANDIDATES)
         self.min_topic_frequency = self.config.get('min_topic_frequency', 3)
 
     def execute(self, extracted_data: ExtractedData, requirement: str = None) -> AnalysisResult:
@@ -72,6 +75,10 @@ class AnalyzerAgent(BaseAgent):
         """
         Generate a summary of the content.
 
+        The title and meta description are followed by the page's most
+        central sentences (see summarizer.py), at most max_summary_sentences
+        of them, in page order.
+
         Args:
             data: ExtractedData object
             requirement: Optional keyword/phrase to highlight
@@ -90,16 +97,13 @@ class AnalyzerAgent(BaseAgent):
         if description:
             summary_parts.append(f"Description: {description}")
 
-        # Extract first few meaningful paragraphs
+        # Pick the most central sentences of the content
         if data.paragraphs:
-            meaningful_paragraphs = [p for p in data.paragraphs if len(p.split()) > 10][:3]
-            if meaningful_paragraphs:
-                summary_parts.append("Content Preview:")
-                for para in meaningful_paragraphs:
-                    # Truncate long paragraphs
-                    if len(para) > 200:
-                        para = para[:200] + "..."
-                    summary_parts.append(f"- {para}")
+            sentences = summarize(data.paragraphs, self.max_summary_sentences, requirement,
+                                  max_candidates=self.max_summary_candidates)
+            if sentences:
+                summary_parts.append("Key Sentences:")
+                summary_parts.extend(f"- {sentence}" for sentence in sentences)
 
         return "\n".join(summary_parts) if summary_parts else "No summary available."
 
@@ -121,7 +125,7 @@ class AnalyzerAgent(BaseAgent):
             requirement_lower = requirement.lower()
 
             # Find headings that match requirement
-            matching_headings = [h for h in data.headings if requirement_lower in h.lower()]
+            matching_headings = [str(h) for h in data.headings if requirement_lower in h.text.lower()]
             key_points.extend(matching_headings[:5])
 
             # Find paragraphs that contain requirement
@@ -136,7 +140,7 @@ class AnalyzerAgent(BaseAgent):
         # Use headings as key points
         if data.headings:
             # Filter to main headings (H1, H2, H3)
-            main_headings = [h for h in data.headings if h.startswith(('H1:', 'H2:', 'H3:'))]
+            main_headings = [str(h) for h in data.headings if h.level <= 3]
             # Avoid duplicates
             for heading in main_headings[:10]:
                 if heading not in key_points:
@@ -166,7 +170,7 @@ class AnalyzerAgent(BaseAgent):
             List of topics
         """
         # Combine all text
-        all_text = " ".join([data.title or ""] + data.headings + data.paragraphs)
+        all_text = " ".join([data.title or ""] + [h.text for h in data.headings] + data.paragraphs)
 
         # Extract words (simple tokenization)
         words = re.findall(r'\b[a-zA-Z]{4,}\b', all_text.lower())
@@ -216,7 +220,7 @@ class AnalyzerAgent(BaseAgent):
             Content type string
         """
         title_lower = (data.title or "").lower()
-        all_text = " ".join(data.headings + data.paragraphs[:5]).lower()
+        all_text = " ".join([h.text for h in data.headings] + data.paragraphs[:5]).lower()
 
         # Simple heuristics
         if any(word in title_lower for word in ['blog', 'article', 'post']):
@@ -308,7 +312,7 @@ class AnalyzerAgent(BaseAgent):
             score += min(title_matches * 0.4, 0.4)
 
         # Heading matches are very important
-        heading_matches = sum(h.lower().count(requirement_lower) for h in data.headings)
+        heading_matches = sum(h.text.lower().count(requirement_lower) for h in data.headings)
         score += min(heading_matches * 0.15, 0.3)
 
         # Paragraph matches (capped to avoid over-weighting)
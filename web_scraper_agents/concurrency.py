@@ -0,0 +1,242 @@
+"""
+Adaptive per-host concurrency - an AIMD controller for crawl fetches.
+
+Each host starts with one request in flight. Successful, fast responses
+raise the host's limit additively (about one extra request per round of
+responses, as in TCP congestion avoidance); 429/503 responses, timeouts,
+connection failures and latency far above the host's baseline cut it
+multiplicatively. Retry-After headers pause the host. Every change of a
+host's limit is recorded so crawls can report what the controller did.
+"""
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
+import threading
+import time
+
+
+# Status codes that mean the server wants fewer requests
+THROTTLE_STATUSES = (429, 503)
+
+# Decisions kept for the crawl metrics
+MAX_EVENTS = 200
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Delay in seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class _HostState:
+    """Controller state of one host."""
+
+    __slots__ = ('limit', 'latency', 'baseline', 'last_decrease', 'retry_at',
+                 'responses', 'increases', 'decreases', 'throttled', 'timeouts', 'slow')
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.latency: Optional[float] = None   # Moving average of response latency
+        self.baseline: Optional[float] = None  # Lowest moving average seen
+        self.last_decrease = float('-inf')
+        self.retry_at = 0.0                    # time.monotonic() before which the host is paused
+        self.responses = 0
+        self.increases = 0
+        self.decreases = 0
+        self.throttled = 0
+        self.timeouts = 0
+        self.slow = 0
+
+
+class AIMDController:
+    """
+    Additive-increase/multiplicative-decrease limit on requests in flight per host.
+
+    The controller is thread-safe: crawl workers report outcomes while the
+    scheduler reads limits.
+    """
+
+    def __init__(self, max_limit: int, adaptive: bool = True, min_limit: int = 1,
+                 decrease_factor: float = 0.5, latency_factor: float = 3.0,
+                 latency_slack: float = 0.05, smoothing: float = 0.3,
+                 max_retry_after: float = 120.0):
+        """
+        Initialize the controller.
+
+        Args:
+            max_limit: Highest concurrency any host may reach
+            adaptive: Whether limits move; when False every host stays at
+                max_limit and only Retry-After pauses and metrics apply
+            min_limit: Lowest concurrency of a host
+            decrease_factor: Multiplier applied to a host's limit on congestion
+            latency_factor: Latency above baseline * latency_factor counts as congestion
+            latency_slack: Latency must also exceed baseline by this many seconds,
+                so jitter on very fast hosts is not mistaken for congestion
+            smoothing: Weight of the newest sample in the latency moving average
+            max_retry_after: Longest Retry-After pause honoured, in seconds
+        """
+        self.adaptive = adaptive
+        self.max_limit = max(min_limit, max_limit)
+        self.min_limit = min_limit
+        self.initial_limit = min_limit if adaptive else self.max_limit
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+        self.latency_slack = latency_slack
+        self.smoothing = smoothing
+        self.max_retry_after = max_retry_after
+        self._hosts: Dict[str, _HostState] = {}
+        self._events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+    def _state(self, host: str) -> _HostState:
+        """Return the state of a host, creating it on first use (lock held)."""
+        state = self._hosts.get(host)
+        if state is None:
+            state = _HostState(float(self.initial_limit))
+            self._hosts[host] = state
+        return state
+
+    def limit(self, host: str) -> int:
+        """
+        Return the number of requests a host may have in flight.
+
+        Args:
+            host: Host (netloc)
+
+        Returns:
+            Current limit
+        """
+        with self._lock:
+            return int(self._state(host).limit)
+
+    def retry_at(self, host: str) -> float:
+        """
+        Return when a paused host may be contacted again.
+
+        Args:
+            host: Host (netloc)
+
+        Returns:
+            time.monotonic() value (in the past if the host is not paused)
+        """
+        with self._lock:
+            return self._state(host).retry_at
+
+    def record(self, host: str, status: int = 0, latency: Optional[float] = None,
+               retry_after: Optional[str] = None, failed: bool = False):
+        """
+        Report the outcome of one request and adjust the host's limit.
+
+        Args:
+            host: Host (netloc)
+            status: HTTP status code (0 if no response was received)
+            latency: Seconds until the response headers arrived
+            retry_after: Retry-After header of the response, if any
+            failed: True for timeouts and connection failures
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._state(host)
+            state.responses += 1
+
+            pause = parse_retry_after(retry_after)
+            if pause is not None and status in THROTTLE_STATUSES:
+                pause = min(pause, self.max_retry_after)
+                state.retry_at = max(state.retry_at, now + pause)
+                self._event(host, state, 'pause', f"Retry-After {pause:.1f}s")
+
+            if failed:
+                state.timeouts += 1
+                self._decrease(host, state, now, 'timeout or connection failure')
+                return
+            if status in THROTTLE_STATUSES:
+                state.throttled += 1
+                self._decrease(host, state, now, f"HTTP {status}")
+                return
+            if latency is None:
+                return
+
+            if state.latency is None:
+                state.latency = latency
+            else:
+                state.latency += self.smoothing * (latency - state.latency)
+            if state.baseline is None or state.latency < state.baseline:
+                state.baseline = state.latency
+
+            if latency > max(state.baseline * self.latency_factor, state.baseline + self.latency_slack):
+                state.slow += 1
+                self._decrease(host, state, now, f"latency {latency * 1000:.0f} ms")
+            elif self.adaptive and state.limit < self.max_limit:
+                # About +1 per round of responses at the current limit
+                before = int(state.limit)
+                state.limit = min(self.max_limit, state.limit + 1.0 / state.limit)
+                if int(state.limit) > before:
+                    state.increases += 1
+                    self._event(host, state, 'increase', f"latency {latency * 1000:.0f} ms")
+
+    def _decrease(self, host: str, state: _HostState, now: float, reason: str):
+        """Cut a host's limit, at most once per observed round trip (lock held)."""
+        if not self.adaptive or state.limit <= self.min_limit:
+            return
+        if now - state.last_decrease < (state.latency or 0.0):
+            return
+        state.last_decrease = now
+        state.limit = max(float(self.min_limit), state.limit * self.decrease_factor)
+        state.decreases += 1
+        self._event(host, state, 'decrease', reason)
+
+    def _event(self, host: str, state: _HostState, action: str, reason: str):
+        """Record a decision for the metrics (lock held)."""
+        self._events.append({
+            'time': round(time.monotonic() - self._started, 3),
+            'host': host,
+            'action': action,
+            'limit': int(state.limit),
+            'reason': reason,
+        })
+        if len(self._events) > MAX_EVENTS:
+            del self._events[0]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the controller's metrics.
+
+        Returns:
+            Dictionary with per-host state under 'hosts' and the most recent
+            decisions under 'events'
+        """
+        with self._lock:
+            hosts = {
+                host: {
+                    'limit': int(state.limit),
+                    'latency_ms': round(state.latency * 1000, 1) if state.latency is not None else None,
+                    'baseline_ms': round(state.baseline * 1000, 1) if state.baseline is not None else None,
+                    'responses': state.responses,
+                    'increases': state.increases,
+                    'decreases': state.decreases,
+                    'throttled': state.throttled,
+                    'timeouts': state.timeouts,
+                    'slow': state.slow,
+                }
+                for host, state in self._hosts.items()
+            }
+            return {'adaptive': self.adaptive, 'hosts': hosts, 'events': list(self._events)}
@@ -0,0 +1,265 @@
+"""
+Content-coding (transfer compression) support for fetched pages.
+
+Advertises every Content-Encoding whose codec is installed and decodes
+response bodies incrementally, so the download cap can be applied to the
+decoded output chunk by chunk. Every decoder stops inflating near the cap,
+however far a small body would expand.
+"""
+from typing import List, Optional
+import zlib
+
+try:
+    import brotli
+except ImportError:  # Brotli support is optional
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    zstd = None
+    try:
+        import zstandard
+    except ImportError:  # zstd support is optional
+        zstandard = None
+else:
+    zstandard = None
+
+
+def available_encodings() -> List[str]:
+    """
+    List the content codings that can be decoded in this environment.
+
+    Returns:
+        Content-coding tokens, most preferred first
+    """
+    encodings = []
+    if zstd is not None or zstandard is not None:
+        encodings.append('zstd')
+    if brotli is not None:
+        encodings.append('br')
+    encodings.extend(['gzip', 'deflate'])
+    return encodings
+
+
+def accept_encoding_header() -> str:
+    """Build an Accept-Encoding header value for the available codecs."""
+    return ', '.join(available_encodings())
+
+
+# Most output one byte of input can stand for: a 4-byte zstd RLE block
+# expands to 128 KB. Codecs that cannot bound their own output get their
+# input in steps sized so even that stays within the remaining limit.
+_MAX_EXPANSION = 32 * 1024
+
+# Size of the pieces an inner layer of stacked codings hands to the next one
+_CHAIN_STEP = 16 * 1024
+
+
+class _PendingInput:
+    """Undecoded input, consumed from the front."""
+
+    def __init__(self):
+        self._data = b''
+        self._offset = 0
+
+    def add(self, data: bytes):
+        if data:
+            self._data = self._data[self._offset:] + data
+            self._offset = 0
+
+    def take(self, size: Optional[int] = None) -> bytes:
+        end = len(self._data) if size is None else self._offset + size
+        chunk = self._data[self._offset:end]
+        self._offset += len(chunk)
+        return chunk
+
+
+def _decode_in_steps(decode, pending: _PendingInput, max_length: int) -> bytes:
+    """Feed pending input to decode() a step at a time until max_length bytes are out."""
+    output = []
+    size = 0
+    while not max_length or size < max_length:
+        chunk = pending.take(max(1, (max_length - size) // _MAX_EXPANSION) if max_length else None)
+        if not chunk:
+            break
+        piece = decode(chunk)
+        output.append(piece)
+        size += len(piece)
+    return b''.join(output)
+
+
+class _ZlibDecoder:
+    """Incremental gzip/zlib/raw-deflate decoder with bounded output."""
+
+    def __init__(self, wbits: int, raw_fallback: bool = False):
+        self._obj = zlib.decompressobj(wbits)
+        self._raw_fallback = raw_fallback
+        self._started = False
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        # Input left over by a call that reached max_length is decoded first
+        if self._obj.unconsumed_tail:
+            data = self._obj.unconsumed_tail + data
+        try:
+            try:
+                output = self._obj.decompress(data, max_length)
+            except zlib.error:
+                # Some servers send raw deflate streams without the zlib header
+                if not self._raw_fallback or self._started:
+                    raise
+                self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+                output = self._obj.decompress(data, max_length)
+        except zlib.error as e:
+            raise ValueError(f"Invalid compressed data: {e}") from e
+        self._started = True
+        return output
+
+    def flush(self) -> bytes:
+        try:
+            return self._obj.flush()
+        except zlib.error as e:
+            raise ValueError(f"Invalid compressed data: {e}") from e
+
+
+class _BrotliDecoder:
+    """Incremental Brotli decoder with bounded output."""
+
+    def __init__(self):
+        self._obj = brotli.Decompressor()
+        self._process = getattr(self._obj, 'process', None) or self._obj.decompress
+        # brotli 1.2+ and brotlicffi can pause at an output limit and keep the rest of the input
+        self._bounded = hasattr(self._obj, 'can_accept_more_data')
+        self._pending = _PendingInput()
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        self._pending.add(data)
+        try:
+            if not self._bounded:
+                return _decode_in_steps(self._process, self._pending, max_length)
+            output = []
+            size = 0
+            while not max_length or size < max_length:
+                # Input the decoder still holds is finished before more is given
+                chunk = self._pending.take() if self._obj.can_accept_more_data() else b''
+                if max_length:
+                    piece = self._process(chunk, output_buffer_limit=max_length - size)
+                else:
+                    piece = self._process(chunk)
+                if not piece and not chunk:
+                    break
+                output.append(piece)
+                size += len(piece)
+            return b''.join(output)
+        except brotli.error as e:
+            raise ValueError(f"Invalid br data: {e}") from e
+
+    def flush(self) -> bytes:
+        return b''
+
+
+class _ZstdDecoder:
+    """Incremental zstd decoder with bounded output."""
+
+    def __init__(self):
+        if zstd is not None:
+            self._obj = zstd.ZstdDecompressor()
+            self._bounded = True
+        else:
+            # zstandard's decompressobj has no output limit, so it gets its input in small steps
+            self._obj = zstandard.ZstdDecompressor().decompressobj()
+            self._bounded = False
+            self._pending = _PendingInput()
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        try:
+            if self._bounded:
+                return self._obj.decompress(data, max_length or -1)
+            self._pending.add(data)
+            return _decode_in_steps(self._obj.decompress, self._pending, max_length)
+        except (zstd or zstandard).ZstdError as e:
+            raise ValueError(f"Invalid zstd data: {e}") from e
+
+    def flush(self) -> bytes:
+        return b''
+
+
+class _ChainDecoder:
+    """Decoder for stacked codings, e.g. 'gzip, br'."""
+
+    def __init__(self, decoders: list):
+        self._decoders = decoders
+
+    def decompress(self, data: bytes, max_length: int = 0) -> bytes:
+        return self._decode(0, data, max_length)
+
+    def _decode(self, index: int, data: bytes, max_length: int) -> bytes:
+        """Decode data through decoders[index:], with at most about max_length bytes out."""
+        decoder = self._decoders[index]
+        if index == len(self._decoders) - 1:
+            return decoder.decompress(data, max_length)
+        # Inner layers hand on their output in bounded pieces, so none inflates past the cap
+        output = []
+        size = 0
+        while not max_length or size < max_length:
+            piece = decoder.decompress(data, _CHAIN_STEP)
+            data = b''
+            if not piece:
+                break
+            piece = self._decode(index + 1, piece, max_length - size if max_length else 0)
+            output.append(piece)
+            size += len(piece)
+        return b''.join(output)
+
+    def flush(self) -> bytes:
+        data = b''
+        for decoder in self._decoders:
+            if data:
+                data = decoder.decompress(data)
+            data += decoder.flush()
+        return data
+
+
+def _make_single_decoder(coding: str):
+    """Create a decoder for one content-coding token."""
+    if coding in ('gzip', 'x-gzip'):
+        return _ZlibDecoder(zlib.MAX_WBITS | 16)
+    if coding == 'deflate':
+        return _ZlibDecoder(zlib.MAX_WBITS, raw_fallback=True)
+    if coding == 'br' and brotli is not None:
+        return _BrotliDecoder()
+    if coding == 'zstd' and (zstd is not None or zstandard is not None):
+        return _ZstdDecoder()
+    raise ValueError(f"Unsupported content encoding: {coding}")
+
+
+def make_decoder(content_encoding: Optional[str]):
+    """
+    Create an incremental decoder for a Content-Encoding header value.
+
+    The decoder has decompress(data, max_length=0) and flush() methods.
+    A decompress() call stops once about max_length bytes are out and
+    keeps the input it has not decoded for the next call; 0 means no limit.
+    Codecs without an output limit of their own may overshoot it by at most
+    about max_length, Brotli by one output buffer. Both raise ValueError on
+    corrupt input.
+
+    Args:
+        content_encoding: Content-Encoding header value
+
+    Returns:
+        Decoder object, or None if the body is not encoded
+
+    Raises:
+        ValueError: If a coding is not supported
+    """
+    codings = [c.strip().lower() for c in (content_encoding or '').split(',')]
+    codings = [c for c in codings if c and c != 'identity']
+    if not codings:
+        return None
+    # Codings are listed in the order they were applied, so undo them in reverse
+    decoders = [_make_single_decoder(c) for c in reversed(codings)]
+    return decoders[0] if len(decoders) == 1 else _ChainDecoder(decoders)
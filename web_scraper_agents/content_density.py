@@ -0,0 +1,241 @@
+"""
+Main content detection - finds a page's article text by text and link density.
+
+Pages without a `<main>` or `<article>` element still usually keep their
+prose in one container, surrounded by navigation, sidebars and footers.
+One post-order pass over the parse tree measures, for every element, its
+text length, the part of it that is link text and the number of tags it
+spans. Each block of prose (the text an element holds outside nested
+blocks) that is long enough, dense enough and not mostly links adds its
+score to its parent container, and half of it to the grandparent. The
+best-scoring container, discounted by its own link density, is the main
+content; sibling containers that score nearly as well are kept with it,
+so articles split across several `<div>`s are not cut short.
+"""
+from typing import Dict, List, Optional
+
+
+# Subtrees whose text is never main content
+SKIPPED_TAGS = frozenset((
+    'script', 'style', 'noscript', 'template', 'svg', 'iframe', 'button', 'select', 'textarea',
+    'nav', 'header', 'footer', 'aside',
+))
+
+# Elements that may be picked as the main content
+CONTAINER_TAGS = frozenset(('body', 'main', 'article', 'section', 'div', 'td'))
+
+# Elements whose own text forms a separate block of prose
+BLOCK_TAGS = CONTAINER_TAGS | frozenset((
+    'p', 'pre', 'blockquote', 'li', 'ul', 'ol', 'dl', 'dd', 'dt', 'table', 'tr', 'th', 'form',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'figure', 'figcaption', 'address',
+))
+
+# A block of prose counts only if it has at least this many characters...
+MIN_BLOCK_CHARS = 25
+# ...at least this many characters per tag (menus and tag clouds fall below)...
+MIN_TEXT_DENSITY = 8.0
+# ...and at most this share of link text
+MAX_LINK_DENSITY = 0.5
+
+# Siblings of the best container scoring at least this fraction of it are included
+SIBLING_RATIO = 0.25
+
+
+class _Stats:
+    """Text measurements of one element's subtree."""
+    __slots__ = ('chars', 'link_chars', 'tags', 'own_chars', 'own_link_chars', 'own_tags', 'score')
+
+    def __init__(self):
+        self.chars = 0           # Text characters in the subtree
+        self.link_chars = 0      # ...of which inside <a> elements
+        self.tags = 1            # Elements in the subtree, this one included
+        self.own_chars = 0       # Text outside nested blocks
+        self.own_link_chars = 0
+        self.own_tags = 1
+        self.score = 0.0         # Scores of prose blocks credited to this element
+
+
+def _block_score(stats: _Stats) -> float:
+    """Score of an element's own text as a block of prose, 0 if it is not one."""
+    chars = stats.own_chars
+    if chars < MIN_BLOCK_CHARS or chars / stats.own_tags < MIN_TEXT_DENSITY:
+        return 0.0
+    link_density = stats.own_link_chars / chars
+    if link_density > MAX_LINK_DENSITY:
+        return 0.0
+    return chars * (1.0 - link_density)
+
+
+def find_main_content(root) -> List:
+    """
+    Find the elements holding a page's main content.
+
+    Args:
+        root: BeautifulSoup object or Tag to search (usually `<body>`)
+
+    Returns:
+        The best container and its high-scoring siblings, in document
+        order; empty if the page has no block of prose at all
+    """
+    from bs4.element import PreformattedString
+
+    stats: Dict[int, _Stats] = {}
+    parents: Dict[int, object] = {}
+    best = None
+    best_score = 0.0
+    candidates = []  # (tag, final score) of every container that was credited
+
+    # Post-order walk: an element is finished once all its children are
+    stack = [(root, False)]
+    while stack:
+        node, finished = stack.pop()
+        if not finished:
+            stack.append((node, True))
+            for child in reversed(node.contents):
+                if child.name is not None and child.name not in SKIPPED_TAGS:
+                    parents[id(child)] = node
+                    stack.append((child, False))
+            continue
+
+        node_stats = _Stats()
+        for child in node.contents:
+            if child.name is None:
+                # Text; comments, CDATA and doctypes are PreformattedStrings
+                if not isinstance(child, PreformattedString):
+                    length = len(child.strip())
+                    node_stats.chars += length
+                    node_stats.own_chars += length
+                continue
+            child_stats = stats.pop(id(child), None)
+            if child_stats is None:
+                continue  # Skipped subtree
+            node_stats.chars += child_stats.chars
+            node_stats.link_chars += child_stats.link_chars
+            node_stats.tags += child_stats.tags
+            if child.name not in BLOCK_TAGS:
+                node_stats.own_chars += child_stats.own_chars
+                node_stats.own_link_chars += child_stats.own_link_chars
+                node_stats.own_tags += child_stats.own_tags
+        if node.name == 'a':
+            node_stats.link_chars = node_stats.chars
+            node_stats.own_link_chars = node_stats.own_chars
+        node_stats.score = stats[id(node)].score if id(node) in stats else 0.0
+
+        if node.name in BLOCK_TAGS:
+            # Credit this element's own prose to its parent and grandparent
+            block_score = _block_score(node_stats)
+            if block_score:
+                if node.name in CONTAINER_TAGS:
+                    node_stats.score += block_score
+                parent = parents.get(id(node))
+                if parent is not None:
+                    _credit(stats, parent, block_score)
+                    grandparent = parents.get(id(parent))
+                    if grandparent is not None:
+                        _credit(stats, grandparent, block_score / 2)
+
+        if node.name in CONTAINER_TAGS and node_stats.score:
+            link_density = node_stats.link_chars / node_stats.chars if node_stats.chars else 1.0
+            final = node_stats.score * (1.0 - link_density)
+            candidates.append((node, final))
+            if final > best_score:
+                best, best_score = node, final
+
+        # Keep only what the parent will read
+        if node is not root:
+            stats[id(node)] = node_stats
+
+    if best is None:
+        return []
+    return _with_siblings(best, best_score, {id(tag): score for tag, score in candidates})
+
+
+def _credit(stats: Dict[int, _Stats], node, score: float):
+    """Add a block's score to an element that has not been finished yet."""
+    node_stats = stats.get(id(node))
+    if node_stats is None:
+        node_stats = stats[id(node)] = _Stats()
+    node_stats.score += score
+
+
+def _with_siblings(best, best_score: float, scores: Dict[int, float]) -> List:
+    """The best container and the sibling containers that score close to it."""
+    parent = best.parent
+    if parent is None or best.name == 'body':
+        return [best]
+    threshold = best_score * SIBLING_RATIO
+    return [child for child in parent.contents
+            if child is best or (child.name in CONTAINER_TAGS and scores.get(id(child), 0.0) >= threshold)]
+
+
+def content_text(roots: List) -> str:
+    """
+    Join the text of content elements, leaving out skipped subtrees.
+
+    Args:
+        roots: Elements returned by find_main_content (or any Tags)
+
+    Returns:
+        Their text, whitespace-separated
+    """
+    from bs4.element import PreformattedString
+
+    parts: List[str] = []
+    for root in roots:
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.name is None:
+                if not isinstance(node, PreformattedString):
+                    text = node.strip()
+                    if text:
+                        parts.append(text)
+            elif node.name not in SKIPPED_TAGS:
+                stack.extend(reversed(node.contents))
+    return ' '.join(parts)
+
+
+def content_elements(roots: List, name: str) -> List:
+    """
+    Find the elements of a kind in content elements, leaving out skipped subtrees.
+
+    Args:
+        roots: Elements returned by find_main_content (or any Tags)
+        name: Tag name, e.g. 'p'
+
+    Returns:
+        Matching Tags outside navigation, headers, footers, asides and the
+        like, in document order
+    """
+    found = []
+    for root in roots:
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.name is None or node.name in SKIPPED_TAGS:
+                continue
+            if node.name == name:
+                found.append(node)
+            stack.extend(reversed(node.contents))
+    return found
+
+
+def outermost(tags: List) -> List:
+    """
+    Drop tags that are nested inside another of the given tags.
+
+    Args:
+        tags: Tags in document order
+
+    Returns:
+        The outermost tags, in document order
+    """
+    found = set(map(id, tags))
+    result = []
+    for tag in tags:
+        parent: Optional[object] = tag.parent
+        while parent is not None and id(parent) not in found:
+            parent = parent.parent
+        if parent is None:
+            result.append(tag)
+    return result
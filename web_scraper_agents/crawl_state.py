@@ -0,0 +1,215 @@
+"""
+Crawl state - what incremental crawls remember about pages between runs.
+
+Each page's content fingerprint, HTTP validators (ETag/Last-Modified),
+extracted data and analysis are kept in a JSON file. A re-crawl sends the
+validators as conditional request headers and compares fingerprints, so
+pages that have not changed can reuse their stored extraction and analysis.
+"""
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import os
+import threading
+
+from .models import AnalysisResult, ExtractedData, Heading, Image, Link, PageState, StructuredData
+
+
+# Bumped whenever the on-disk record layout changes; older files are ignored
+STATE_FORMAT_VERSION = 1
+
+
+def fingerprint(body: bytes) -> str:
+    """
+    Compute the content fingerprint of a page body.
+
+    Args:
+        body: Decoded response body
+
+    Returns:
+        Hex digest of the body
+    """
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def _extracted_to_dict(data: ExtractedData) -> Dict[str, Any]:
+    """Convert extracted data into a JSON-serializable dict."""
+    return {
+        'url': data.url,
+        'title': data.title,
+        'headings': [list(h) for h in data.headings],
+        'paragraphs': list(data.paragraphs),
+        'links': [list(link) for link in data.links],
+        'images': [list(image) for image in data.images],
+        'metadata': dict(data.metadata),
+        # JSON-LD stays undecoded, as extracted
+        'structured_data': {
+            'json_ld_raw': list(data.structured_data.json_ld_raw),
+            'opengraph': data.structured_data.opengraph,
+            'microdata': data.structured_data.microdata,
+            'skipped': data.structured_data.skipped,
+        },
+        'main_content': data.main_content,
+        'truncated': data.truncated,
+        'extracted_fields': list(data.extracted_fields) if data.extracted_fields is not None else None,
+    }
+
+
+def _extracted_from_dict(record: Dict[str, Any]) -> ExtractedData:
+    """Rebuild extracted data from its stored dict."""
+    fields = record.get('extracted_fields')
+    return ExtractedData(
+        url=record['url'],
+        title=record['title'],
+        headings=[Heading(*h) for h in record['headings']],
+        paragraphs=record['paragraphs'],
+        links=[Link(*link) for link in record['links']],
+        images=[Image(*image) for image in record['images']],
+        metadata=record['metadata'],
+        # Records stored before structured data was extracted have none
+        structured_data=StructuredData(**record.get('structured_data', {})),
+        main_content=record['main_content'],
+        truncated=record['truncated'],
+        extracted_fields=tuple(fields) if fields is not None else None
+    )
+
+
+def _analysis_to_dict(analysis: AnalysisResult) -> Dict[str, Any]:
+    """Convert an analysis result into a JSON-serializable dict."""
+    return {
+        'url': analysis.url,
+        'summary': analysis.summary,
+        'key_points': list(analysis.key_points),
+        'topics': list(analysis.topics),
+        'word_count': analysis.word_count,
+        'content_type': analysis.content_type,
+        'importance_score': analysis.importance_score,
+        'relevance_score': analysis.relevance_score,
+    }
+
+
+class CrawlStateStore:
+    """
+    JSON-file backed store of PageState records, keyed by URL.
+
+    Records are kept serialized, so objects handed out by get() can be
+    modified freely (for example by dropping main_content) without
+    changing what is stored. The store is thread-safe, so several
+    orchestrators (e.g. the workers of a server) can share one.
+    """
+
+    def __init__(self, path: str):
+        """
+        Load the store from a file, if it exists.
+
+        Args:
+            path: Path of the JSON state file
+        """
+        self.path = path
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('version') == STATE_FORMAT_VERSION:
+                self._records = state.get('pages', {})
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._records
+
+    def urls(self) -> List[str]:
+        """Return the URLs of every stored page."""
+        with self._lock:
+            return list(self._records)
+
+    def get(self, url: str) -> Optional[PageState]:
+        """
+        Return the stored state of a page.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            PageState object, or None if the page has not been seen before
+        """
+        with self._lock:
+            record = self._records.get(url)
+            if record is None:
+                return None
+            record = dict(record)  # Updates replace values, so a shallow copy is a stable view
+        extracted = record.get('extracted_data')
+        analysis = record.get('analysis')
+        return PageState(
+            url=url,
+            fingerprint=record['fingerprint'],
+            etag=record.get('etag'),
+            last_modified=record.get('last_modified'),
+            extracted_data=_extracted_from_dict(extracted) if extracted else None,
+            analysis=AnalysisResult(**analysis) if analysis else None,
+            requirement=record.get('requirement')
+        )
+
+    def put(self, state: PageState):
+        """
+        Store the state of a page, replacing any earlier record.
+
+        Args:
+            state: PageState object
+        """
+        record = {
+            'fingerprint': state.fingerprint,
+            'etag': state.etag,
+            'last_modified': state.last_modified,
+            'extracted_data': _extracted_to_dict(state.extracted_data) if state.extracted_data else None,
+            'analysis': _analysis_to_dict(state.analysis) if state.analysis else None,
+            'requirement': state.requirement,
+        }
+        with self._lock:
+            self._records[state.url] = record
+
+    def update_validators(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        """
+        Refresh the HTTP validators of an unchanged page.
+
+        Args:
+            url: Page URL
+            etag: ETag header of the latest response
+            last_modified: Last-Modified header of the latest response
+        """
+        with self._lock:
+            record = self._records.get(url)
+            if record is None:
+                return
+            if etag:
+                record['etag'] = etag
+            if last_modified:
+                record['last_modified'] = last_modified
+
+    def record_analysis(self, url: str, analysis: AnalysisResult, requirement: Optional[str]):
+        """
+        Attach an analysis to a stored page.
+
+        Args:
+            url: Page URL
+            analysis: AnalysisResult object
+            requirement: Requirement the analysis was computed for
+        """
+        with self._lock:
+            record = self._records.get(url)
+            if record is None:
+                return
+            record['analysis'] = _analysis_to_dict(analysis)
+            record['requirement'] = requirement
+
+    def save(self):
+        """Write the store to its file, replacing the old file atomically."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with self._lock:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': STATE_FORMAT_VERSION, 'pages': self._records}, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
@@ -0,0 +1,263 @@
+"""
+DNS cache - in-process name resolution with a TTL for the crawl's HTTP session.
+
+urllib3 resolves the host name every time it opens a connection. Crawls
+open many short-lived connections to the same few hosts, so lookups are
+cached here for a fixed TTL (the system resolver does not report record
+TTLs) and failed lookups for a shorter one. DNSCachingAdapter plugs the
+cache into a requests session; the resolver itself is injectable, so
+crawls can be tested offline against made-up host names.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import ipaddress
+import socket
+import threading
+import time
+
+import requests
+import requests.adapters
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+
+
+# Callable taking (host, port) and returning the host's IP addresses, in preference order
+Resolver = Callable[[str, int], List[str]]
+
+DEFAULT_DNS_TTL = 300.0
+DEFAULT_NEGATIVE_TTL = 5.0
+
+
+def system_resolver(host: str, port: int) -> List[str]:
+    """
+    Resolve a host name with the system resolver (getaddrinfo).
+
+    Args:
+        host: Host name
+        port: Port the addresses will be used with
+
+    Returns:
+        Unique IP addresses, in the order the resolver returned them
+    """
+    addresses = []
+    for _, _, _, _, sockaddr in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM):
+        if sockaddr[0] not in addresses:
+            addresses.append(sockaddr[0])
+    return addresses
+
+
+def _is_ip_address(host: str) -> bool:
+    """Check whether a host is an IP literal (which needs no lookup)."""
+    try:
+        ipaddress.ip_address(host.strip('[]'))
+    except ValueError:
+        return False
+    return True
+
+
+class DNSCache:
+    """
+    Thread-safe cache of host name lookups.
+
+    Concurrent lookups of the same host wait for a single resolver call.
+    Failed lookups are remembered for negative_ttl seconds, so a host
+    that does not resolve is not looked up again for every queued page.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_DNS_TTL, negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+                 resolver: Optional[Resolver] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a successful lookup is reused
+            negative_ttl: Seconds a failed lookup is remembered
+            resolver: Callable taking (host, port) and returning IP addresses;
+                defaults to the system resolver
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.resolver = resolver or system_resolver
+        self._entries: Dict[str, Tuple[float, Any]] = {}  # host -> (expiry, addresses or error)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+
+    def _cached(self, host: str) -> Optional[Any]:
+        """Return the unexpired entry of a host, if any."""
+        entry = self._entries.get(host)
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry[1]
+        return None
+
+    def resolve(self, host: str, port: int = 80) -> List[str]:
+        """
+        Return the IP addresses of a host, looking it up if needed.
+
+        Args:
+            host: Host name or IP literal
+            port: Port the addresses will be used with
+
+        Returns:
+            IP addresses in preference order
+
+        Raises:
+            socket.gaierror: If the host does not resolve (possibly cached)
+        """
+        if _is_ip_address(host):
+            return [host.strip('[]')]
+        host = host.lower()
+
+        cached = self._cached(host)
+        if cached is None:
+            with self._lock:
+                lock = self._locks.setdefault(host, threading.Lock())
+            with lock:
+                cached = self._cached(host)
+                if cached is None:
+                    cached = self._lookup(host, port)
+                else:
+                    self._count('hits')
+        else:
+            self._count('hits')
+
+        if isinstance(cached, Exception):
+            raise cached
+        return list(cached)
+
+    def _lookup(self, host: str, port: int) -> Any:
+        """Ask the resolver and store the result (the host's lock is held)."""
+        self._count('misses')
+        try:
+            addresses = list(self.resolver(host, port))
+            if not addresses:
+                raise socket.gaierror(socket.EAI_NONAME, f"No addresses for {host}")
+        except OSError as e:
+            error = e if isinstance(e, socket.gaierror) else socket.gaierror(str(e))
+            self._count('failures')
+            self._entries[host] = (time.monotonic() + self.negative_ttl, error)
+            return error
+        self._entries[host] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    def _count(self, name: str):
+        """Increment a counter."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def prefetch(self, hosts: Iterable[str], port: int = 80):
+        """
+        Resolve hosts ahead of their first connection, ignoring failures.
+
+        Args:
+            hosts: Host names
+            port: Port the addresses will be used with
+        """
+        for host in hosts:
+            try:
+                self.resolve(host, port)
+            except OSError:
+                pass
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Return the cache counters.
+
+        Returns:
+            Dictionary with hits, misses, failures and cached entries
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'failures': self.failures,
+                    'entries': len(self._entries)}
+
+
+class _CachedDNSConnectionMixin:
+    """Makes a urllib3 connection resolve its host through a DNSCache."""
+
+    dns_cache: DNSCache = None
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            addresses = self.dns_cache.resolve(host, self.port)
+        except socket.gaierror as e:
+            raise NewConnectionError(self, f"Failed to resolve '{host}': {e}") from e
+
+        # Connect to the cached addresses in turn; TLS still verifies self.host
+        last_error = None
+        try:
+            for address in addresses:
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except NewConnectionError as e:
+                    last_error = e
+        finally:
+            self._dns_host = host
+        raise last_error
+
+
+def _pool_classes(dns_cache: DNSCache) -> Dict[str, type]:
+    """Return urllib3 connection pool classes bound to a DNS cache, by scheme."""
+    attrs = {'dns_cache': dns_cache}
+    http_connection = type('CachedDNSHTTPConnection', (_CachedDNSConnectionMixin, HTTPConnection), attrs)
+    https_connection = type('CachedDNSHTTPSConnection', (_CachedDNSConnectionMixin, HTTPSConnection), attrs)
+    return {
+        'http': type('CachedDNSHTTPConnectionPool', (HTTPConnectionPool,),
+                     {'ConnectionCls': http_connection}),
+        'https': type('CachedDNSHTTPSConnectionPool', (HTTPSConnectionPool,),
+                      {'ConnectionCls': https_connection}),
+    }
+
+
+class DNSCachingAdapter(requests.adapters.HTTPAdapter):
+    """HTTPAdapter whose connections resolve host names through a DNSCache."""
+
+    __attrs__ = requests.adapters.HTTPAdapter.__attrs__ + ['dns_cache']
+
+    def __init__(self, dns_cache: DNSCache, **kwargs):
+        """
+        Initialize the adapter.
+
+        Args:
+            dns_cache: DNSCache used for every connection
+            **kwargs: Passed to HTTPAdapter (pool_connections, pool_maxsize, ...)
+        """
+        self.dns_cache = dns_cache
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _pool_classes(self.dns_cache)
+
+
+def warm_connection(adapter: requests.adapters.HTTPAdapter, url: str, verify: bool = True):
+    """
+    Open a connection to the origin of a URL and leave it idle in the adapter's pool.
+
+    The DNS lookup, TCP handshake and any TLS handshake then happen before
+    the first request to the host instead of during it.
+
+    Args:
+        adapter: Adapter of the session that will fetch from the host
+        url: Any URL on the host
+        verify: TLS verification setting of the session, so the connection
+            lands in the pool its requests will use
+    """
+    request = requests.Request('GET', url).prepare()
+    if hasattr(adapter, 'get_connection_with_tls_context'):
+        pool = adapter.get_connection_with_tls_context(request, verify)
+    else:
+        pool = adapter.get_connection(url)
+    # Borrow a pool slot, connect it and hand it back idle
+    connection = pool._get_conn()
+    try:
+        if connection.sock is None:
+            connection.connect()
+    except Exception:
+        connection.close()
+        raise
+    finally:
+        pool._put_conn(connection)
@@ -0,0 +1,134 @@
+"""
+Character encoding detection for fetched pages.
+
+Encodings are resolved from cheap, authoritative sources first (byte order
+mark, HTTP charset, <meta charset> in the first few KB) and only fall back
+to statistical detection over a bounded sample of the body.
+"""
+from typing import Optional, Tuple
+import codecs
+import importlib.util
+import re
+
+# chardet is optional and only needed when no charset is declared, so it is imported on first use
+HAVE_CHARDET = importlib.util.find_spec('chardet') is not None
+
+
+# How many leading bytes to search for a <meta charset> or XML declaration
+META_SNIFF_BYTES = 4096
+
+# How many leading bytes a statistical detector may look at
+DETECTOR_SAMPLE_BYTES = 32 * 1024
+
+# Minimum detector confidence to trust its answer
+DETECTOR_MIN_CONFIDENCE = 0.5
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+_CHARSET_PARAM = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+_XML_ENCODING = re.compile(rb'^\s*<\?xml[^>]+encoding\s*=\s*["\']([\w.:-]+)["\']', re.IGNORECASE)
+
+# Labels that browsers (per the WHATWG encoding standard) read as windows-1252
+_WINDOWS_1252_ALIASES = {'latin-1', 'iso8859-1', 'ascii'}
+
+
+def normalize_encoding(name: Optional[str]) -> Optional[str]:
+    """
+    Map an encoding label to a Python codec name.
+
+    Args:
+        name: Encoding label as found in headers or markup
+
+    Returns:
+        Canonical codec name, or None if Python has no such codec
+    """
+    if not name:
+        return None
+    try:
+        codec_name = codecs.lookup(name.strip().strip('"\'')).name
+    except LookupError:
+        return None
+    if codec_name in _WINDOWS_1252_ALIASES:
+        return 'cp1252'
+    return codec_name
+
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    """
+    Extract the charset parameter from a Content-Type header.
+
+    Args:
+        content_type: Content-Type header value
+
+    Returns:
+        Codec name, or None if the header has no usable charset
+    """
+    if not content_type:
+        return None
+    match = _CHARSET_PARAM.search(content_type)
+    return normalize_encoding(match.group(1)) if match else None
+
+
+def charset_from_markup(head: bytes) -> Optional[str]:
+    """
+    Find the encoding declared in the first bytes of a document.
+
+    Args:
+        head: Leading bytes of the document
+
+    Returns:
+        Codec name, or None if no usable declaration was found
+    """
+    head = head[:META_SNIFF_BYTES]
+    match = _XML_ENCODING.search(head) or _META_CHARSET.search(head)
+    if not match:
+        return None
+    encoding = normalize_encoding(match.group(1).decode('ascii', 'ignore'))
+    # A document that declares UTF-16 in ASCII-compatible bytes is really UTF-8
+    if encoding and encoding.startswith('utf-16'):
+        return 'utf-8'
+    return encoding
+
+
+def detect_encoding(content_type: Optional[str], body: bytes) -> Tuple[Optional[str], str]:
+    """
+    Resolve the encoding of a response body.
+
+    Args:
+        content_type: Content-Type header value
+        body: Raw response body
+
+    Returns:
+        Tuple of (codec name or None, source) where source is one of
+        'bom', 'http', 'meta', 'detector' or 'unknown'
+    """
+    for bom, encoding in _BOMS:
+        if body.startswith(bom):
+            return encoding, 'bom'
+
+    encoding = charset_from_content_type(content_type)
+    if encoding:
+        return encoding, 'http'
+
+    encoding = charset_from_markup(body)
+    if encoding:
+        return encoding, 'meta'
+
+    if HAVE_CHARDET and body:
+        import chardet
+        guess = chardet.detect(body[:DETECTOR_SAMPLE_BYTES])
+        if guess.get('confidence', 0) >= DETECTOR_MIN_CONFIDENCE:
+            label = guess.get('encoding') or ''
+            # An all-ASCII sample says nothing about the rest of the body; UTF-8 covers both
+            encoding = 'utf-8' if label.lower() == 'ascii' else normalize_encoding(label)
+            if encoding:
+                return encoding, 'detector'
+
+    return None, 'unknown'
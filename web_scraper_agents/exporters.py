@@ -0,0 +1,186 @@
+"""
+Structured exporters - machine-readable output for crawl results.
+
+JSONL streams one JSON record per PageResult. The columnar export writes
+the AnalysisResult fields of every page as a table: Parquet when pyarrow
+is installed, CSV otherwise.
+"""
+from typing import Any, Dict, Iterable, List, TextIO
+import csv
+import importlib.util
+import json
+import os
+
+from .models import PageResult, MultiPageResult
+
+# pyarrow is optional and slow to import, so it is only imported when Parquet is written
+HAVE_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+
+# Columns of the columnar export, in order
+ANALYSIS_COLUMNS = [
+    'url', 'title', 'content_type', 'word_count', 'importance_score',
+    'relevance_score', 'summary', 'key_points', 'topics',
+]
+
+# Rows buffered per Parquet row group
+PARQUET_BATCH_ROWS = 1000
+
+
+def page_result_to_record(page_result: PageResult) -> Dict[str, Any]:
+    """
+    Convert a page result into a JSON-serializable record.
+
+    Args:
+        page_result: PageResult object
+
+    Returns:
+        Dictionary with the page's extracted data and analysis
+    """
+    data = page_result.extracted_data
+    analysis = page_result.analysis
+    return {
+        'url': data.url,
+        'title': data.title,
+        'headings': [{'level': h.level, 'text': h.text} for h in data.headings],
+        'paragraphs': data.paragraphs,
+        'links': [{'url': link.url, 'text': link.text} for link in data.links],
+        'images': [{'url': image.url, 'alt': image.alt} for image in data.images],
+        'metadata': data.metadata,
+        'structured_data': {
+            'json_ld': data.structured_data.json_ld,
+            'opengraph': data.structured_data.opengraph,
+            'microdata': data.structured_data.microdata,
+        },
+        'truncated': data.truncated,
+        'extracted_fields': list(data.extracted_fields) if data.extracted_fields is not None else None,
+        'analysis': {
+            'summary': analysis.summary,
+            'key_points': analysis.key_points,
+            'topics': analysis.topics,
+            'word_count': analysis.word_count,
+            'content_type': analysis.content_type,
+            'importance_score': analysis.importance_score,
+            'relevance_score': analysis.relevance_score,
+        },
+    }
+
+
+def multi_result_to_record(multi_result: MultiPageResult) -> Dict[str, Any]:
+    """
+    Convert a crawl result into a JSON-serializable record.
+
+    Args:
+        multi_result: MultiPageResult object
+
+    Returns:
+        Dictionary with the crawl summary and one record per matching page
+    """
+    return {
+        'base_url': multi_result.base_url,
+        'requirement': multi_result.requirement,
+        'total_pages_crawled': multi_result.total_pages_crawled,
+        'pages': [page_result_to_record(page) for page in multi_result.matching_pages],
+        'skipped_pages': multi_result.skipped_pages,
+        'crawl_stats': multi_result.crawl_stats,
+        'page_changes': multi_result.page_changes,
+    }
+
+
+def write_jsonl(page_results: Iterable[PageResult], sink: TextIO) -> int:
+    """
+    Stream page results to a sink as JSON Lines, one record per page.
+
+    Args:
+        page_results: PageResult objects to write
+        sink: Text stream to write to
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    for page_result in page_results:
+        sink.write(json.dumps(page_result_to_record(page_result), ensure_ascii=False))
+        sink.write("\n")
+        count += 1
+    return count
+
+
+def _analysis_row(page_result: PageResult) -> Dict[str, Any]:
+    """Flatten a page's analysis into one row of the columnar export."""
+    analysis = page_result.analysis
+    return {
+        'url': analysis.url,
+        'title': page_result.extracted_data.title,
+        'content_type': analysis.content_type,
+        'word_count': analysis.word_count,
+        'importance_score': analysis.importance_score,
+        'relevance_score': analysis.relevance_score,
+        'summary': analysis.summary,
+        'key_points': analysis.key_points,
+        'topics': analysis.topics,
+    }
+
+
+def _write_parquet(page_results: Iterable[PageResult], file_path: str):
+    """Write analysis rows to a Parquet file in row groups."""
+    import pyarrow
+    import pyarrow.parquet
+
+    schema = pyarrow.schema([
+        ('url', pyarrow.string()),
+        ('title', pyarrow.string()),
+        ('content_type', pyarrow.string()),
+        ('word_count', pyarrow.int64()),
+        ('importance_score', pyarrow.float64()),
+        ('relevance_score', pyarrow.float64()),
+        ('summary', pyarrow.string()),
+        ('key_points', pyarrow.list_(pyarrow.string())),
+        ('topics', pyarrow.list_(pyarrow.string())),
+    ])
+    with pyarrow.parquet.ParquetWriter(file_path, schema) as writer:
+        batch: List[Dict[str, Any]] = []
+        for page_result in page_results:
+            batch.append(_analysis_row(page_result))
+            if len(batch) >= PARQUET_BATCH_ROWS:
+                writer.write_table(pyarrow.Table.from_pylist(batch, schema=schema))
+                batch = []
+        if batch:
+            writer.write_table(pyarrow.Table.from_pylist(batch, schema=schema))
+
+
+def _write_csv(page_results: Iterable[PageResult], file_path: str):
+    """Write analysis rows to a CSV file; list columns are joined with ' | '."""
+    with open(file_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=ANALYSIS_COLUMNS)
+        writer.writeheader()
+        for page_result in page_results:
+            row = _analysis_row(page_result)
+            row['key_points'] = ' | '.join(row['key_points'])
+            row['topics'] = ' | '.join(row['topics'])
+            writer.writerow(row)
+
+
+def export_columnar(multi_result: MultiPageResult, file_path: str) -> str:
+    """
+    Export the analysis of every page as a table.
+
+    Writes Parquet when pyarrow is installed; otherwise writes CSV, swapping
+    a '.parquet' extension for '.csv'.
+
+    Args:
+        multi_result: MultiPageResult object
+        file_path: Destination path
+
+    Returns:
+        Path of the file actually written
+    """
+    if HAVE_PYARROW and not file_path.endswith('.csv'):
+        _write_parquet(multi_result.matching_pages, file_path)
+        return file_path
+
+    root, ext = os.path.splitext(file_path)
+    if ext == '.parquet':
+        file_path = root + '.csv'
+    _write_csv(multi_result.matching_pages, file_path)
+    return file_path
@@ -0,0 +1,515 @@
+"""
+Fixture Server - a local, deterministic synthetic website for crawl testing.
+
+The generated site is a tree of pages with a configurable fan-out and depth.
+Pages can be made to redirect, respond slowly, fail, or duplicate the body
+of another page, so crawl speed and robustness can be measured offline.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+import datetime
+import gzip
+import hashlib
+import random
+import sys
+import threading
+import time
+
+from . import content_coding
+
+
+# Small fixed vocabulary so generated text looks like prose to the analyzer
+_VOCABULARY = (
+    'agent analysis archive article campus catalog college course data '
+    'degree department research faculty library lecture network program '
+    'project report science student study system technology theory topic '
+    'university workshop market product price review service support team '
+    'mission company history policy community event seminar journal'
+).split()
+
+
+@dataclass
+class FixtureSiteConfig:
+    """Shape of the synthetic site served by FixtureSiteServer."""
+    fan_out: int = 5
+    depth: int = 3
+    page_size: int = 2000           # Approximate bytes of paragraph text per page
+    duplicate_ratio: float = 0.0    # Share of links pointing at a duplicate copy of a page
+    redirect_ratio: float = 0.0     # Share of links that go through a redirect
+    slow_ratio: float = 0.0         # Share of pages that respond slowly
+    slow_delay: float = 0.5         # Delay in seconds for slow pages
+    error_ratio: float = 0.0        # Share of pages that respond with an error
+    error_status: int = 500
+    binary_ratio: float = 0.0       # Share of pages that also link to a large binary file
+    binary_size: int = 1024 * 1024  # Size in bytes of linked binary files
+    compress: bool = True           # Honour Accept-Encoding for HTML pages
+    capacity: int = 0               # Concurrent page requests served before answering 503 (0 = unlimited)
+    retry_after: int = 0            # Retry-After seconds sent with overload 503s (0 = no header)
+    etags: bool = False             # Send ETags and answer If-None-Match with 304
+    robots_disallow: Tuple[str, ...] = ()  # Paths disallowed for every agent in robots.txt
+    sitemap: bool = False           # Serve /sitemap.xml listing every page
+    sitemap_chunk: int = 1000       # Pages per sitemap; larger sites get an index of gzipped sitemaps
+    keyword: str = 'fixture'        # Term inserted into some pages for requirement matching
+    keyword_ratio: float = 0.5      # Share of pages that contain the keyword
+    seed: int = 0
+
+    @property
+    def total_pages(self) -> int:
+        """Number of distinct pages in the generated tree."""
+        return sum(self.fan_out ** level for level in range(self.depth + 1))
+
+
+class FixtureSite:
+    """Deterministic generator for the pages of a synthetic site."""
+
+    def __init__(self, config: FixtureSiteConfig = None):
+        """
+        Initialize the site generator.
+
+        Args:
+            config: FixtureSiteConfig describing the site
+        """
+        self.config = config or FixtureSiteConfig()
+        self._render = lru_cache(maxsize=4096)(self._render_page)
+
+    def _rng(self, page_id: int, salt: str) -> random.Random:
+        """Return a random generator that is stable for a page and purpose."""
+        return random.Random(f"{self.config.seed}:{salt}:{page_id}")
+
+    def exists(self, page_id: int) -> bool:
+        """Check whether a page id is part of the site."""
+        return 0 <= page_id < self.config.total_pages
+
+    def children(self, page_id: int) -> List[int]:
+        """Return the ids of the pages linked from a page."""
+        first = page_id * self.config.fan_out + 1
+        return [child for child in range(first, first + self.config.fan_out)
+                if self.exists(child)]
+
+    def is_slow(self, page_id: int) -> bool:
+        """Check whether a page responds slowly."""
+        return self._rng(page_id, 'slow').random() < self.config.slow_ratio
+
+    def is_error(self, page_id: int) -> bool:
+        """Check whether a page responds with an error (the root never does)."""
+        return page_id != 0 and self._rng(page_id, 'error').random() < self.config.error_ratio
+
+    def has_keyword(self, page_id: int) -> bool:
+        """Check whether a page contains the configured keyword."""
+        return self._rng(page_id, 'keyword').random() < self.config.keyword_ratio
+
+    def has_binary(self, page_id: int) -> bool:
+        """Check whether a page links to a large binary file."""
+        return self._rng(page_id, 'binary').random() < self.config.binary_ratio
+
+    def link_path(self, page_id: int) -> str:
+        """Return the path used when linking to a page (direct, redirect or duplicate)."""
+        roll = self._rng(page_id, 'link').random()
+        if roll < self.config.redirect_ratio:
+            return f"/redirect/{page_id}"
+        if roll < self.config.redirect_ratio + self.config.duplicate_ratio:
+            return f"/dup/{page_id}"
+        return self.page_path(page_id)
+
+    def lastmod(self, page_id: int) -> str:
+        """Return the sitemap lastmod date of a page."""
+        day = self._rng(page_id, 'lastmod').randint(0, 364)
+        return (datetime.date(2024, 1, 1) + datetime.timedelta(days=day)).isoformat()
+
+    def robots_txt(self, base_url: str) -> Optional[bytes]:
+        """Return the site's robots.txt, or None if it has none."""
+        if not self.config.robots_disallow and not self.config.sitemap:
+            return None
+        lines = ["User-agent: *"]
+        lines.extend(f"Disallow: {path}" for path in self.config.robots_disallow)
+        if self.config.sitemap:
+            lines.append(f"Sitemap: {base_url}/sitemap.xml")
+        return ("\n".join(lines) + "\n").encode('utf-8')
+
+    def sitemap_xml(self, base_url: str, chunk: Optional[int] = None) -> bytes:
+        """
+        Return /sitemap.xml, or one numbered chunk of it.
+
+        Sites with more than sitemap_chunk pages get a sitemap index at
+        /sitemap.xml pointing at gzipped chunks under /sitemaps/.
+        """
+        size = self.config.sitemap_chunk
+        total = self.config.total_pages
+        namespace = "http://www.sitemaps.org/schemas/sitemap/0.9"
+        if chunk is None and total > size:
+            parts = ["<?xml version='1.0' encoding='UTF-8'?>", f"<sitemapindex xmlns='{namespace}'>"]
+            for index in range((total + size - 1) // size):
+                parts.append(f"<sitemap><loc>{base_url}/sitemaps/{index}.xml.gz</loc></sitemap>")
+            parts.append("</sitemapindex>")
+            return "\n".join(parts).encode('utf-8')
+
+        first = (chunk or 0) * size
+        parts = ["<?xml version='1.0' encoding='UTF-8'?>", f"<urlset xmlns='{namespace}'>"]
+        for page_id in range(first, min(first + size, total)):
+            parts.append(f"<url><loc>{base_url}{self.page_path(page_id)}</loc>"
+                         f"<lastmod>{self.lastmod(page_id)}</lastmod></url>")
+        parts.append("</urlset>")
+        return "\n".join(parts).encode('utf-8')
+
+    @staticmethod
+    def page_path(page_id: int) -> str:
+        """Return the canonical path of a page."""
+        return "/" if page_id == 0 else f"/p/{page_id}"
+
+    def render(self, page_id: int) -> bytes:
+        """Return the HTML body of a page."""
+        return self._render(page_id)
+
+    def _render_page(self, page_id: int) -> bytes:
+        """Build the HTML body of a page."""
+        rng = self._rng(page_id, 'text')
+        title = f"Synthetic Page {page_id}"
+        paragraphs = []
+        size = 0
+        while size < self.config.page_size:
+            words = [rng.choice(_VOCABULARY) for _ in range(rng.randint(12, 40))]
+            if not paragraphs and self.has_keyword(page_id):
+                words.insert(rng.randint(0, len(words)), self.config.keyword)
+            sentence = ' '.join(words).capitalize() + '.'
+            paragraphs.append(sentence)
+            size += len(sentence)
+
+        parts = [
+            "<!DOCTYPE html>",
+            "<html>",
+            "<head>",
+            "<meta charset='utf-8'>",
+            f"<title>{title}</title>",
+            f"<meta name='description' content='Synthetic page {page_id}'>",
+            "</head>",
+            "<body>",
+            "<nav><a href='/'>Home</a></nav>",
+            "<main>",
+            f"<h1>{title}</h1>",
+        ]
+        for i, paragraph in enumerate(paragraphs):
+            if i and i % 3 == 0:
+                parts.append(f"<h2>Section {i // 3}</h2>")
+            parts.append(f"<p>{paragraph}</p>")
+        parts.append("<ul>")
+        for child in self.children(page_id):
+            parts.append(f"<li><a href='{self.link_path(child)}'>Child page {child}</a></li>")
+        parts.append("</ul>")
+        if self.has_binary(page_id):
+            parts.append(f"<p><a href='/files/{page_id}.bin'>Download data file</a></p>")
+        parts.extend(["</main>", "</body>", "</html>"])
+        return "\n".join(parts).encode('utf-8')
+
+
+class _FixtureRequestHandler(BaseHTTPRequestHandler):
+    """Request handler serving pages from the server's FixtureSite."""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without TCP_NODELAY, kept-alive
+    # connections stall on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        """Serve a page, redirect or error for the requested path."""
+        fixture = self.server.fixture
+        path = self.path.split('?', 1)[0].split('#', 1)[0]
+        fixture.record_hit(path)
+
+        if path.startswith('/files/'):
+            self._send_binary(path)
+            return
+
+        if path == '/robots.txt' or path == '/sitemap.xml' or path.startswith('/sitemaps/'):
+            self._send_site_file(path)
+            return
+
+        page_id = self._parse_page_id(path)
+        if page_id is None or not fixture.site.exists(page_id):
+            self._send(404, b"Not Found", 'text/plain')
+            return
+
+        if path.startswith('/redirect/'):
+            self.send_response(302)
+            self.send_header('Location', FixtureSite.page_path(page_id))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        if not fixture.enter():
+            self.send_response(503)
+            if fixture.site.config.retry_after:
+                self.send_header('Retry-After', str(fixture.site.config.retry_after))
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', '10')
+            self.end_headers()
+            self.wfile.write(b"Overloaded")
+            return
+        try:
+            self._send_page(page_id)
+        finally:
+            fixture.leave()
+
+    def _send_page(self, page_id: int):
+        """Serve a page, honouring the slow and error settings."""
+        fixture = self.server.fixture
+        if fixture.site.is_slow(page_id):
+            time.sleep(fixture.site.config.slow_delay)
+
+        if fixture.site.is_error(page_id):
+            self._send(fixture.site.config.error_status, b"Fixture error", 'text/plain')
+            return
+
+        body, coding, etag = fixture.site.render(page_id), None, None
+        if fixture.site.config.etags:
+            etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+        if fixture.site.config.compress:
+            body, coding = self._compress(body, self.headers.get('Accept-Encoding', ''))
+        self._send(200, body, 'text/html; charset=utf-8', coding, etag)
+
+    @staticmethod
+    def _compress(body: bytes, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+        """Compress a body with the best coding both sides support."""
+        accepted = {token.split(';', 1)[0].strip().lower() for token in accept_encoding.split(',')}
+        if 'zstd' in accepted:
+            if content_coding.zstd is not None:
+                return content_coding.zstd.compress(body), 'zstd'
+            if content_coding.zstandard is not None:
+                return content_coding.zstandard.ZstdCompressor().compress(body), 'zstd'
+        if 'br' in accepted and content_coding.brotli is not None:
+            return content_coding.brotli.compress(body), 'br'
+        if 'gzip' in accepted:
+            return gzip.compress(body, mtime=0), 'gzip'
+        return body, None
+
+    @staticmethod
+    def _parse_page_id(path: str) -> Optional[int]:
+        """Map a request path to a page id."""
+        if path in ('', '/'):
+            return 0
+        for prefix in ('/p/', '/redirect/', '/dup/'):
+            if path.startswith(prefix):
+                try:
+                    return int(path[len(prefix):])
+                except ValueError:
+                    return None
+        return None
+
+    def _send_site_file(self, path: str):
+        """Serve robots.txt, the sitemap (index) or a gzipped sitemap chunk."""
+        site = self.server.fixture.site
+        base_url = f"http://{self.headers.get('Host', '')}"
+        if path == '/robots.txt':
+            body = site.robots_txt(base_url)
+            if body is None:
+                self._send(404, b"Not Found", 'text/plain')
+            else:
+                self._send(200, body, 'text/plain; charset=utf-8')
+            return
+        if not site.config.sitemap:
+            self._send(404, b"Not Found", 'text/plain')
+            return
+        if path == '/sitemap.xml':
+            self._send(200, site.sitemap_xml(base_url), 'application/xml')
+            return
+        try:
+            chunk = int(path[len('/sitemaps/'):].split('.', 1)[0])
+        except ValueError:
+            self._send(404, b"Not Found", 'text/plain')
+            return
+        body = gzip.compress(site.sitemap_xml(base_url, chunk), mtime=0)
+        self._send(200, body, 'application/gzip')
+
+    def _send_binary(self, path: str):
+        """Stream a large binary file in chunks."""
+        size = self.server.fixture.site.config.binary_size
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(size))
+        self.end_headers()
+        chunk = bytes(range(256)) * 256
+        try:
+            while size > 0:
+                self.wfile.write(chunk[:size])
+                size -= len(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            # Clients that filter on Content-Type hang up early
+            self.close_connection = True
+
+    def _send(self, status: int, body: bytes, content_type: str, content_encoding: str = None,
+              etag: str = None):
+        """Send a complete response."""
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        if content_encoding:
+            self.send_header('Content-Encoding', content_encoding)
+        if etag:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Silence the default per-request stderr logging."""
+        pass
+
+
+class _FixtureHTTPServer(ThreadingHTTPServer):
+    """Threading HTTP server that ignores clients hanging up mid-response."""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        """Report unexpected errors, but not dropped connections."""
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+
+class FixtureSiteServer:
+    """
+    Serve a FixtureSite over HTTP on a local port.
+
+    The server runs in a background thread and can be used as a context manager:
+
+        with FixtureSiteServer(FixtureSiteConfig(fan_out=3, depth=2)) as server:
+            pages = WebScraperAgent({'crawl_delay': 0}).execute_crawl(server.base_url)
+    """
+
+    def __init__(self, config: FixtureSiteConfig = None, host: str = '127.0.0.1', port: int = 0):
+        """
+        Initialize the fixture server.
+
+        Args:
+            config: FixtureSiteConfig describing the site
+            host: Interface to bind to
+            port: Port to bind to (0 picks a free port)
+        """
+        self.site = FixtureSite(config)
+        self.host = host
+        self.port = port
+        self.hits: Dict[str, int] = {}
+        self._hits_lock = threading.Lock()
+        self.active = 0           # Page requests being served
+        self.peak_active = 0
+        self.overloaded = 0       # Requests refused with 503 because of capacity
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """Root URL of the running site."""
+        return f"http://{self.host}:{self.port}/"
+
+    @property
+    def total_hits(self) -> int:
+        """Total number of requests served."""
+        with self._hits_lock:
+            return sum(self.hits.values())
+
+    def record_hit(self, path: str):
+        """Count a request for a path."""
+        with self._hits_lock:
+            self.hits[path] = self.hits.get(path, 0) + 1
+
+    def reset_hits(self):
+        """Clear the request counters."""
+        with self._hits_lock:
+            self.hits.clear()
+            self.peak_active = 0
+            self.overloaded = 0
+
+    def enter(self) -> bool:
+        """Start serving a page request; False if the site is over capacity."""
+        capacity = self.site.config.capacity
+        with self._hits_lock:
+            if capacity and self.active >= capacity:
+                self.overloaded += 1
+                return False
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+            return True
+
+    def leave(self):
+        """Finish serving a page request."""
+        with self._hits_lock:
+            self.active -= 1
+
+    def start(self) -> 'FixtureSiteServer':
+        """Start serving in a background thread."""
+        self._httpd = _FixtureHTTPServer((self.host, self.port), _FixtureRequestHandler)
+        self._httpd.fixture = self
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server and release the port."""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+            self._thread = None
+
+    def __enter__(self) -> 'FixtureSiteServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main():
+    """Run a fixture site in the foreground."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serve a synthetic website for crawl testing')
+    parser.add_argument('--port', type=int, default=8800, help='Port to listen on (default: 8800)')
+    parser.add_argument('--fan-out', type=int, default=5, help='Links per page (default: 5)')
+    parser.add_argument('--depth', type=int, default=3, help='Depth of the page tree (default: 3)')
+    parser.add_argument('--page-size', type=int, default=2000, help='Approximate text bytes per page')
+    parser.add_argument('--duplicate-ratio', type=float, default=0.0, help='Share of duplicate links')
+    parser.add_argument('--redirect-ratio', type=float, default=0.0, help='Share of redirected links')
+    parser.add_argument('--slow-ratio', type=float, default=0.0, help='Share of slow pages')
+    parser.add_argument('--error-ratio', type=float, default=0.0, help='Share of failing pages')
+    parser.add_argument('--binary-ratio', type=float, default=0.0, help='Share of pages linking a binary file')
+    parser.add_argument('--capacity', type=int, default=0, help='Concurrent requests before 503s (0 = unlimited)')
+    parser.add_argument('--etags', action='store_true', help='Send ETags and honour If-None-Match')
+    parser.add_argument('--robots-disallow', nargs='*', default=[], help='Paths disallowed in robots.txt')
+    parser.add_argument('--sitemap', action='store_true', help='Serve /sitemap.xml')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    args = parser.parse_args()
+
+    config = FixtureSiteConfig(
+        fan_out=args.fan_out,
+        depth=args.depth,
+        page_size=args.page_size,
+        duplicate_ratio=args.duplicate_ratio,
+        redirect_ratio=args.redirect_ratio,
+        slow_ratio=args.slow_ratio,
+        error_ratio=args.error_ratio,
+        binary_ratio=args.binary_ratio,
+        capacity=args.capacity,
+        etags=args.etags,
+        robots_disallow=tuple(args.robots_disallow),
+        sitemap=args.sitemap,
+        seed=args.seed
+    )
+    server = FixtureSiteServer(config, port=args.port).start()
+    print(f"Serving {config.total_pages} pages at {server.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
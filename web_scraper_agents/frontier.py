@@ -0,0 +1,258 @@
+"""
+Crawl frontier - the queue of URLs waiting to be fetched.
+
+URLs are served breadth-first: shallower pages come first, and among pages
+at the same depth, those with a more recent sitemap lastmod come first.
+Ties keep insertion order. HostFrontier keeps one such queue per host and
+decides which host is fetched next.
+"""
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import heapq
+import itertools
+import time
+
+
+class CrawlFrontier:
+    """Priority queue of (url, depth) pairs that ignores URLs already queued."""
+
+    def __init__(self):
+        """Initialize an empty frontier."""
+        self._heap = []
+        self._counter = itertools.count()
+        self._queued = set()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, url: str, depth: int, lastmod: Optional[float] = None) -> bool:
+        """
+        Queue a URL.
+
+        Args:
+            url: Normalized URL
+            depth: Link depth from the seeds
+            lastmod: Sitemap lastmod timestamp, if known
+
+        Returns:
+            True if the URL was queued, False if it had been queued before
+        """
+        if url in self._queued:
+            return False
+        self._queued.add(url)
+        heapq.heappush(self._heap, (depth, -(lastmod or 0.0), next(self._counter), url))
+        return True
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        """
+        Take the next URL to fetch.
+
+        Returns:
+            (url, depth) tuple, or None if the frontier is empty
+        """
+        if not self._heap:
+            return None
+        depth, _, _, url = heapq.heappop(self._heap)
+        return url, depth
+
+    def clear(self) -> List[str]:
+        """
+        Remove every queued URL; they still count as queued for push().
+
+        Returns:
+            The removed URLs, in the order they would have been served
+        """
+        urls = [url for _, _, _, url in sorted(self._heap)]
+        self._heap = []
+        return urls
+
+
+class _HostQueue:
+    """Queued URLs and scheduling state of one host."""
+
+    __slots__ = ('frontier', 'weight', 'pass_value', 'in_flight', 'limit', 'delay', 'next_time')
+
+    def __init__(self, weight: float, pass_value: float, limit: int, delay: float):
+        self.frontier = CrawlFrontier()
+        self.weight = weight
+        self.pass_value = pass_value  # Virtual time of the host for weighted-fair scheduling
+        self.in_flight = 0
+        self.limit = limit
+        self.delay = delay
+        self.next_time = 0.0
+
+
+class HostFrontier:
+    """
+    Crawl frontier with one queue per host and weighted-fair scheduling.
+
+    Hosts take turns by stride scheduling: every fetch advances a host's
+    virtual time by 1 / weight, and the ready host with the lowest virtual
+    time goes next, so equal weights give round-robin. A host is ready when
+    it has fewer fetches in flight than its limit (max_per_host unless
+    changed with set_limit) and its politeness delay since the previous
+    fetch has passed.
+    """
+
+    def __init__(self, max_per_host: int = 1, delay: float = 0.0,
+                 weights: Optional[Dict[str, float]] = None):
+        """
+        Initialize an empty frontier.
+
+        Args:
+            max_per_host: Maximum concurrent fetches per host
+            delay: Minimum seconds between fetch starts on one host
+            weights: Optional scheduling weight per host (default 1)
+        """
+        self.max_per_host = max(1, max_per_host)
+        self.delay = delay
+        self.weights = weights or {}
+        self._hosts: Dict[str, _HostQueue] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _host(self, host: str) -> _HostQueue:
+        """Return the queue of a host, creating it on first use."""
+        queue = self._hosts.get(host)
+        if queue is None:
+            queue = _HostQueue(float(self.weights.get(host, 1.0)) or 1.0, 0.0, self.max_per_host, self.delay)
+            self._hosts[host] = queue
+        return queue
+
+    def _min_active_pass(self) -> Optional[float]:
+        """Return the lowest virtual time among hosts with queued URLs."""
+        return min((q.pass_value for q in self._hosts.values() if len(q.frontier)), default=None)
+
+    def push(self, url: str, depth: int, lastmod: Optional[float] = None) -> bool:
+        """
+        Queue a URL on its host's queue.
+
+        Args:
+            url: Normalized URL
+            depth: Link depth from the seeds
+            lastmod: Sitemap lastmod timestamp, if known
+
+        Returns:
+            True if the URL was queued, False if it had been queued before
+        """
+        queue = self._host(urlparse(url).netloc)
+        idle = not len(queue.frontier)
+        if idle:
+            # A host joining (or rejoining) the rotation starts level with the
+            # others, so it neither starves nor gets a burst of catch-up turns
+            active = self._min_active_pass()
+            if active is not None:
+                queue.pass_value = max(queue.pass_value, active)
+        if not queue.frontier.push(url, depth, lastmod):
+            return False
+        self._size += 1
+        return True
+
+    def pop(self, now: Optional[float] = None) -> Optional[Tuple[str, int]]:
+        """
+        Take the next URL from the ready host with the lowest virtual time.
+
+        The host is marked as having one more fetch in flight until done()
+        is called for it.
+
+        Args:
+            now: Current time.monotonic() value
+
+        Returns:
+            (url, depth) tuple, or None if no host is ready
+        """
+        now = time.monotonic() if now is None else now
+        best = None
+        for queue in self._hosts.values():
+            if (len(queue.frontier) and queue.in_flight < queue.limit
+                    and queue.next_time <= now
+                    and (best is None or queue.pass_value < best.pass_value)):
+                best = queue
+        if best is None:
+            return None
+
+        best.pass_value += 1.0 / best.weight
+        best.in_flight += 1
+        best.next_time = now + best.delay
+        self._size -= 1
+        return best.frontier.pop()
+
+    def done(self, url: str):
+        """
+        Record that a fetch taken with pop() has finished.
+
+        Args:
+            url: URL that was fetched
+        """
+        queue = self._hosts.get(urlparse(url).netloc)
+        if queue is not None and queue.in_flight:
+            queue.in_flight -= 1
+
+    def set_delay(self, host: str, delay: float):
+        """
+        Set the politeness delay of one host (e.g. from its robots.txt Crawl-delay).
+
+        Args:
+            host: Host (netloc)
+            delay: Minimum seconds between fetch starts
+        """
+        queue = self._host(host)
+        if delay != queue.delay:
+            queue.next_time += delay - queue.delay
+            queue.delay = delay
+
+    def set_limit(self, host: str, limit: int):
+        """
+        Set how many fetches one host may have in flight.
+
+        Args:
+            host: Host (netloc)
+            limit: Concurrent fetch limit (at least 1)
+        """
+        self._host(host).limit = max(1, limit)
+
+    def defer(self, host: str, until: float):
+        """
+        Pause a host, e.g. for a Retry-After header.
+
+        Args:
+            host: Host (netloc)
+            until: time.monotonic() value before which the host is not fetched
+        """
+        queue = self._host(host)
+        queue.next_time = max(queue.next_time, until)
+
+    def drop(self, host: str) -> List[str]:
+        """
+        Remove every queued URL of a host, e.g. when the host is down.
+
+        Args:
+            host: Host (netloc)
+
+        Returns:
+            The removed URLs
+        """
+        queue = self._hosts.get(host)
+        if queue is None:
+            return []
+        urls = queue.frontier.clear()
+        self._size -= len(urls)
+        return urls
+
+    def next_ready_time(self) -> Optional[float]:
+        """
+        Return when the next host with queued URLs will be ready.
+
+        Returns:
+            time.monotonic() value, or None if every host with queued URLs
+            is waiting for fetches in flight (or nothing is queued)
+        """
+        times = [queue.next_time for queue in self._hosts.values()
+                 if len(queue.frontier) and queue.in_flight < queue.limit]
+        return min(times) if times else None
+
+    def hosts(self) -> List[str]:
+        """Return every host seen so far."""
+        return list(self._hosts)
@@ -0,0 +1,575 @@
+"""
+Job Queue - a SQLite-backed crawl queue worked by a pool of processes.
+
+Independent crawls scale across cores by running each in its own worker
+process. Jobs, their per-job configuration and their results live in one
+SQLite database, which any number of processes (and pools) can submit to
+and work from. A worker holds a lease on the job it is running and keeps
+renewing it; if the worker dies, its job goes back to the queue, either
+as soon as the pool notices the dead process or, if the whole pool died,
+when the lease runs out. A job that keeps killing its workers fails after
+max_attempts tries.
+
+    python -m web_scraper_agents.job_queue jobs.db submit https://www.example.com --max-pages 20
+    python -m web_scraper_agents.job_queue jobs.db work --processes 8
+    python -m web_scraper_agents.job_queue jobs.db status
+    python -m web_scraper_agents.job_queue jobs.db result 1
+"""
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sqlite3
+import threading
+import time
+
+from .base_agent import BaseAgent
+
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    requirement TEXT,
+    crawl INTEGER NOT NULL DEFAULT 1,
+    config TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    worker TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    submitted REAL NOT NULL,
+    started REAL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+"""
+
+DEFAULT_LEASE_TIMEOUT = 60.0
+
+
+def _merge_config(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply a job's configuration on top of the pool's.
+
+    Args:
+        base: Pool-wide orchestrator configuration
+        override: The job's configuration; agent sections ('scraper', ...) are
+            merged key by key, other keys replace the pool's
+
+    Returns:
+        Merged configuration
+    """
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = {**merged[key], **value}
+        else:
+            merged[key] = value
+    return merged
+
+
+class JobQueue:
+    """
+    Crawl jobs stored in a SQLite database.
+
+    Every state change is a single short transaction, so the queue can be
+    shared by many processes. Each process opens its own connection on
+    first use; threads within a process share it under a lock.
+    """
+
+    def __init__(self, path: str, lease_timeout: float = DEFAULT_LEASE_TIMEOUT):
+        """
+        Open (or create) a queue.
+
+        Args:
+            path: Path of the SQLite database
+            lease_timeout: Seconds a claimed job stays with its worker without
+                a renewal before another worker may take it over
+        """
+        self.path = path
+        self.lease_timeout = lease_timeout
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.RLock()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this process's connection; connections are not carried across fork."""
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                               check_same_thread=False)
+            self._connection.row_factory = sqlite3.Row
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._lock = threading.RLock()
+            self._pid = os.getpid()
+        return self._connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in one write transaction."""
+        connection = self._connect()
+        with self._lock:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield connection
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+            connection.execute('COMMIT')
+
+    def submit(self, url: str, requirement: Optional[str] = None, crawl: bool = True,
+               config: Optional[Dict[str, Any]] = None, max_attempts: int = 3) -> int:
+        """
+        Add a job to the queue.
+
+        Args:
+            url: URL to crawl (or scrape)
+            requirement: Optional keyword/phrase to search for
+            crawl: Crawl from the URL rather than scrape the single page
+            config: Orchestrator configuration for this job, applied on top of the pool's
+            max_attempts: Workers that may die running the job before it fails
+
+        Returns:
+            Job id
+        """
+        with self._transaction() as db:
+            cursor = db.execute(
+                "INSERT INTO jobs (url, requirement, crawl, config, max_attempts, submitted) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, requirement, int(crawl), json.dumps(config or {}), max(1, max_attempts), time.time())
+            )
+            return cursor.lastrowid
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """
+        Take the oldest runnable job: a queued one, or one whose lease has expired.
+
+        Args:
+            worker: Id of the claiming worker
+
+        Returns:
+            Dictionary with the job's id, url, requirement, crawl, config and
+            attempts, or None if no job is runnable
+        """
+        now = time.time()
+        with self._transaction() as db:
+            # Jobs whose workers died on every attempt are given up on
+            db.execute(
+                "UPDATE jobs SET status = ?, finished = ?, "
+                "error = COALESCE(error, 'Worker lost ' || attempts || ' times') "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= max_attempts",
+                (FAILED, now, RUNNING, now)
+            )
+            row = db.execute(
+                "SELECT id, url, requirement, crawl, config, attempts FROM jobs "
+                "WHERE status = ? OR (status = ? AND lease_expires < ?) ORDER BY id LIMIT 1",
+                (QUEUED, RUNNING, now)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, "
+                "lease_expires = ?, started = ? WHERE id = ?",
+                (RUNNING, worker, now + self.lease_timeout, now, row['id'])
+            )
+        return {
+            'id': row['id'],
+            'url': row['url'],
+            'requirement': row['requirement'],
+            'crawl': bool(row['crawl']),
+            'config': json.loads(row['config']),
+            'attempts': row['attempts'] + 1,
+        }
+
+    def renew(self, job_id: int, worker: str) -> bool:
+        """
+        Extend a worker's lease on a running job.
+
+        Args:
+            job_id: Job id
+            worker: Id of the worker holding the lease
+
+        Returns:
+            False if the job is no longer this worker's
+        """
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ? AND status = ?",
+                (time.time() + self.lease_timeout, job_id, worker, RUNNING)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker: str, result: Dict[str, Any]) -> bool:
+        """
+        Store a job's result.
+
+        Args:
+            job_id: Job id
+            worker: Id of the worker holding the lease
+            result: JSON-serializable result
+
+        Returns:
+            False if the job was taken over by another worker (the result is dropped)
+        """
+        return self._finish(job_id, worker, DONE, result=json.dumps(result, default=str))
+
+    def fail(self, job_id: int, worker: str, error: str) -> bool:
+        """
+        Mark a job as failed.
+
+        Args:
+            job_id: Job id
+            worker: Id of the worker holding the lease
+            error: Error message
+
+        Returns:
+            False if the job was taken over by another worker
+        """
+        return self._finish(job_id, worker, FAILED, error=error)
+
+    def _finish(self, job_id: int, worker: str, status: str, result: Optional[str] = None,
+                error: Optional[str] = None) -> bool:
+        """Move a job to a final state if the worker still holds it."""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished = ?, lease_expires = NULL "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (status, result, error, time.time(), job_id, worker, RUNNING)
+            )
+            return cursor.rowcount == 1
+
+    def release_worker(self, worker: str, reason: str = 'Worker died') -> int:
+        """
+        Put the running jobs of a dead worker back in the queue.
+
+        Jobs that have used up their attempts are failed instead.
+
+        Args:
+            worker: Id of the dead worker
+            reason: Error recorded on the jobs
+
+        Returns:
+            Number of jobs released
+        """
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE jobs SET status = ?, finished = ?, error = ?, lease_expires = NULL "
+                "WHERE worker = ? AND status = ? AND attempts >= max_attempts",
+                (FAILED, time.time(), reason, worker, RUNNING)
+            )
+            cursor = db.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, error = ?, lease_expires = NULL "
+                "WHERE worker = ? AND status = ?",
+                (QUEUED, reason, worker, RUNNING)
+            )
+            return cursor.rowcount
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Return a job, including its result once it is done.
+
+        Args:
+            job_id: Job id
+
+        Returns:
+            Dictionary of the job's columns, or None for an unknown id
+        """
+        connection = self._connect()
+        with self._lock:
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['crawl'] = bool(job['crawl'])
+        job['config'] = json.loads(job['config'])
+        if job['result'] is not None:
+            job['result'] = json.loads(job['result'])
+        return job
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Return the number of jobs in each state.
+
+        Returns:
+            Dictionary with queued, running, done and failed counts
+        """
+        connection = self._connect()
+        with self._lock:
+            rows = connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def pending(self) -> int:
+        """Return the number of jobs that are queued or running."""
+        counts = self.counts()
+        return counts[QUEUED] + counts[RUNNING]
+
+
+def run_job(job: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a job through the orchestrator pipeline.
+
+    Args:
+        job: Job as returned by JobQueue.claim()
+        config: Pool-wide orchestrator configuration
+
+    Returns:
+        JSON-serializable result: the crawl record, or {'page': ...} for single pages
+
+    Raises:
+        ValueError: If a single page cannot be fetched or yields no data
+    """
+    from .exporters import multi_result_to_record, page_result_to_record
+    from .orchestrator import AgentOrchestrator
+
+    orchestrator = AgentOrchestrator(_merge_config(config, job['config']))
+    scraper = orchestrator.scraper_agent
+    try:
+        if not job['crawl']:
+            page = orchestrator.run_page(job['url'], job['requirement'])
+            if page is None:
+                raise ValueError("Failed to extract data")
+            if page.extracted_data.fetch_error:
+                raise ValueError(f"Failed to fetch page: {page.extracted_data.fetch_error}")
+            return {'page': page_result_to_record(page), 'skipped_pages': scraper.skipped_pages}
+
+        multi_result = orchestrator.run_crawl(job['url'], job['requirement'])
+    finally:
+        orchestrator.close()
+    if multi_result is None:
+        return {'base_url': job['url'], 'requirement': job['requirement'],
+                'total_pages_crawled': len(scraper.visited_urls), 'pages': [],
+                'skipped_pages': scraper.skipped_pages, 'crawl_stats': scraper.crawl_stats}
+    return multi_result_to_record(multi_result)
+
+
+def _work(path: str, worker: str, config: Dict[str, Any], lease_timeout: float,
+          poll_interval: float, stop: Any, quiet: bool):
+    """
+    Worker process: claim and run jobs until the pool stops.
+
+    A background thread renews the lease of the running job every third
+    of the lease timeout.
+    """
+    # Ctrl+C is handled by the pool, which lets workers finish or hands their jobs back
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if quiet:
+        logging.disable(logging.INFO)
+    logger = logging.getLogger('JobWorker')
+    job_queue = JobQueue(path, lease_timeout)
+
+    while not stop.is_set():
+        job = job_queue.claim(worker)
+        if job is None:
+            stop.wait(poll_interval)
+            continue
+
+        finished = threading.Event()
+
+        def renew_lease():
+            while not finished.wait(lease_timeout / 3):
+                if not job_queue.renew(job['id'], worker):
+                    logger.error(f"{worker} lost the lease on job {job['id']}")
+                    return
+
+        renewer = threading.Thread(target=renew_lease, daemon=True)
+        renewer.start()
+        try:
+            result = run_job(job, config)
+        except Exception as e:
+            job_queue.fail(job['id'], worker, str(e))
+        else:
+            if not job_queue.complete(job['id'], worker, result):
+                logger.error(f"{worker} finished job {job['id']} after losing its lease; result dropped")
+        finally:
+            finished.set()
+            renewer.join()
+
+
+class WorkerPool(BaseAgent):
+    """
+    Runs the jobs of a JobQueue in a pool of worker processes.
+
+    The pool watches its processes: when one dies, its running job is put
+    back in the queue at once and a replacement process is started.
+    """
+
+    def __init__(self, path: str, config: Dict[str, Any] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            path: Path of the queue's SQLite database
+            config: Orchestrator configuration shared by all jobs, plus the pool settings
+                processes (default: number of CPUs), lease_timeout (default 60),
+                poll_interval (seconds between queue polls when idle, default 0.5),
+                quiet (only log errors in workers) and start_method (multiprocessing
+                start method, default: the platform's)
+        """
+        super().__init__("WorkerPool", config)
+        self.path = path
+        self.processes = max(1, self.config.get('processes') or os.cpu_count() or 1)
+        self.lease_timeout = self.config.get('lease_timeout', DEFAULT_LEASE_TIMEOUT)
+        self.poll_interval = self.config.get('poll_interval', 0.5)
+        self.quiet = self.config.get('quiet', False)
+        self._context = multiprocessing.get_context(self.config.get('start_method'))
+        self.queue = JobQueue(path, self.lease_timeout)
+        self._job_config = {key: value for key, value in self.config.items()
+                            if key not in ('processes', 'lease_timeout', 'poll_interval',
+                                           'quiet', 'start_method')}
+        self._stop = self._context.Event()
+        self._workers: Dict[str, Any] = {}
+        self._spawned = 0
+        self.restarts = 0
+
+    def _spawn(self):
+        """Start one worker process."""
+        self._spawned += 1
+        worker = f"{os.getpid()}-{self._spawned}"
+        process = self._context.Process(
+            target=_work, name=f"JobWorker-{worker}", daemon=True,
+            args=(self.path, worker, self._job_config, self.lease_timeout,
+                  self.poll_interval, self._stop, self.quiet)
+        )
+        process.start()
+        self._workers[worker] = process
+
+    def start(self) -> 'WorkerPool':
+        """Start the worker processes."""
+        self._stop.clear()
+        while len(self._workers) < self.processes:
+            self._spawn()
+        self.log_info(f"Started {self.processes} worker processes on {self.path}")
+        return self
+
+    def _reap(self):
+        """Release the jobs of dead workers and replace them."""
+        for worker, process in list(self._workers.items()):
+            if process.is_alive():
+                continue
+            del self._workers[worker]
+            released = self.queue.release_worker(worker, f"Worker exited with code {process.exitcode}")
+            self.log_error(f"Worker {worker} exited with code {process.exitcode}; "
+                           f"{released} job(s) returned to the queue")
+            if not self._stop.is_set():
+                self.restarts += 1
+                self._spawn()
+
+    def execute(self, until_empty: bool = True, timeout: Optional[float] = None) -> Dict[str, int]:
+        """
+        Run jobs until the queue is empty (or forever), then stop the workers.
+
+        Args:
+            until_empty: Stop once no job is queued or running
+            timeout: Optional limit in seconds on how long to run
+
+        Returns:
+            Job counts by state when the pool stopped
+        """
+        if not self._workers:
+            self.start()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                self._reap()
+                if until_empty and self.queue.pending() == 0:
+                    break
+                time.sleep(self.poll_interval)
+        finally:
+            self.stop()
+        counts = self.queue.counts()
+        self.log_info(f"Worker pool stopped: {counts}")
+        return counts
+
+    def stop(self, grace: float = 5.0):
+        """
+        Stop the workers after their current jobs.
+
+        Args:
+            grace: Seconds to wait for each worker before terminating it; a
+                terminated worker's job goes back to the queue
+        """
+        self._stop.set()
+        for worker, process in list(self._workers.items()):
+            process.join(grace)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+            self.queue.release_worker(worker, 'Worker stopped')
+        self._workers.clear()
+
+
+def main():
+    """Submit jobs to, work, or inspect a job queue from the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='SQLite-backed crawl job queue with a worker process pool')
+    parser.add_argument('database', help='Path of the queue database (created if missing)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    submit = commands.add_parser('submit', help='Queue a crawl job')
+    submit.add_argument('url', nargs='+', help='Start URL(s); one job each')
+    submit.add_argument('-r', '--requirement', help='Keyword/phrase to search for')
+    submit.add_argument('--single', action='store_true', help='Scrape only the given page')
+    submit.add_argument('--max-pages', type=int, help='Maximum pages to crawl')
+    submit.add_argument('--max-depth', type=int, help='Maximum crawl depth')
+    submit.add_argument('--time-budget', type=float, help='Wall-clock seconds the crawl may take')
+    submit.add_argument('--config', help='Further orchestrator configuration as JSON')
+    submit.add_argument('--attempts', type=int, default=3, help='Worker crashes tolerated per job (default: 3)')
+
+    work = commands.add_parser('work', help='Run queued jobs in worker processes')
+    work.add_argument('--processes', type=int, default=None, help='Worker processes (default: CPUs)')
+    work.add_argument('--lease', type=float, default=DEFAULT_LEASE_TIMEOUT,
+                      help='Seconds before a silent worker\'s job is handed to another (default: 60)')
+    work.add_argument('--forever', action='store_true', help='Keep polling when the queue is empty')
+    work.add_argument('--quiet', action='store_true', help='Only log errors')
+
+    commands.add_parser('status', help='Show job counts')
+    result = commands.add_parser('result', help='Print a job and its result as JSON')
+    result.add_argument('job_id', type=int)
+    args = parser.parse_args()
+
+    if args.command == 'submit':
+        config = json.loads(args.config) if args.config else {}
+        scraper = {name: value for name, value in (('max_pages', args.max_pages),
+                                                   ('max_depth', args.max_depth)) if value is not None}
+        if scraper:
+            config['scraper'] = {**config.get('scraper', {}), **scraper}
+        if args.time_budget is not None:
+            config['time_budget'] = args.time_budget
+        job_queue = JobQueue(args.database)
+        for url in args.url:
+            job_id = job_queue.submit(url, args.requirement, crawl=not args.single, config=config,
+                                      max_attempts=args.attempts)
+            print(job_id)
+    elif args.command == 'work':
+        pool = WorkerPool(args.database, {'processes': args.processes, 'lease_timeout': args.lease,
+                                          'quiet': args.quiet})
+        try:
+            pool.execute(until_empty=not args.forever)
+        except KeyboardInterrupt:
+            pass  # execute() has stopped the workers
+    elif args.command == 'status':
+        print(json.dumps(JobQueue(args.database).counts()))
+    else:
+        job = JobQueue(args.database).get(args.job_id)
+        if job is None:
+            parser.exit(1, f"Unknown job {args.job_id}\n")
+        print(json.dumps(job, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,36 +2,135 @@
 Data models for the web scraper agent system.
 """
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 from datetime import datetime
 
 
-@dataclass
+class Heading(NamedTuple):
+    """A heading on a page; level is 1-6 for <h1>-<h6>."""
+    level: int
+    text: str
+
+    def __str__(self) -> str:
+        return f"H{self.level}: {self.text}"
+
+
+class Link(NamedTuple):
+    """A hyperlink on a page, with its absolute URL."""
+    url: str
+    text: str
+
+
+class Image(NamedTuple):
+    """An image on a page, with its absolute URL."""
+    url: str
+    alt: str
+
+
+@dataclass(slots=True)
 class WebPage:
     """Represents a fetched web page."""
     url: str
     title: Optional[str] = None
     content: str = ""
+    body: bytes = b""  # Undecoded body; used instead of content when non-empty
+    encoding: Optional[str] = None  # Codec for body
     headers: Dict[str, str] = field(default_factory=dict)
     status_code: int = 0
     fetch_time: datetime = field(default_factory=datetime.now)
     error: Optional[str] = None
+    bytes_read: int = 0   # Decoded body bytes kept
+    wire_bytes: int = 0   # Body bytes received before content decoding
+    truncated: bool = False
+
+
+@dataclass(slots=True)
+class StructuredData:
+    """
+    Structured data embedded in a page: JSON-LD, OpenGraph and microdata.
+
+    JSON-LD blocks are kept as the raw strings found in the page and are
+    only decoded when json_ld is first read, so pages whose structured
+    data is never used don't pay for decoding it.
+    """
+    json_ld_raw: List[str] = field(default_factory=list)  # Bodies of <script type="application/ld+json">
+    opengraph: Dict[str, List[str]] = field(default_factory=dict)  # og:*/article:*/... -> values
+    microdata: List[Dict[str, Any]] = field(default_factory=list)  # Top-level itemscope items
+    skipped: int = 0  # JSON-LD blocks or microdata items dropped by the size limits
+    _json_ld: Optional[List[Any]] = field(default=None, init=False, repr=False, compare=False)
 
+    @property
+    def json_ld(self) -> List[Any]:
+        """Decoded JSON-LD objects, in page order; blocks that are not valid JSON are left out."""
+        if self._json_ld is None:
+            import json
 
-@dataclass
+            decoded = []
+            for raw in self.json_ld_raw:
+                try:
+                    value = json.loads(raw)
+                except ValueError:
+                    continue
+                decoded.extend(value if isinstance(value, list) else [value])
+            self._json_ld = decoded
+        return self._json_ld
+
+    def items(self, item_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Return JSON-LD objects (@graph members included) and microdata items.
+
+        Args:
+            item_type: Only items of this type, such as 'Article' or
+                'https://schema.org/Product'; matched on the last path segment
+
+        Returns:
+            Matching items, JSON-LD first
+        """
+        found = []
+        for value in self.json_ld:
+            if not isinstance(value, dict):
+                continue
+            graph = value.get('@graph')
+            if isinstance(graph, list):
+                found.extend(item for item in graph if isinstance(item, dict))
+            else:
+                found.append(value)
+        found.extend(self.microdata)
+        if item_type is None:
+            return found
+        wanted = item_type.rstrip('/').rsplit('/', 1)[-1]
+        return [item for item in found if wanted in _type_names(item)]
+
+    def __bool__(self) -> bool:
+        return bool(self.json_ld_raw or self.opengraph or self.microdata)
+
+
+def _type_names(item: Dict[str, Any]) -> List[str]:
+    """Short type names of a JSON-LD object or microdata item."""
+    types = item.get('@type', item.get('type', []))
+    if isinstance(types, str):
+        types = [types]
+    return [str(name).rstrip('/').rsplit('/', 1)[-1] for name in types]
+
+
+@dataclass(slots=True)
 class ExtractedData:
     """Represents extracted and structured data from a web page."""
     url: str
     title: str
-    headings: List[str] = field(default_factory=list)
+    headings: List[Heading] = field(default_factory=list)
     paragraphs: List[str] = field(default_factory=list)
-    links: List[Dict[str, str]] = field(default_factory=list)
-    images: List[Dict[str, str]] = field(default_factory=list)
+    links: List[Link] = field(default_factory=list)
+    images: List[Image] = field(default_factory=list)
     metadata: Dict[str, str] = field(default_factory=dict)
+    structured_data: StructuredData = field(default_factory=StructuredData)
     main_content: str = ""
+    truncated: bool = False  # Body was cut at the scraper's max_response_bytes
+    extracted_fields: Optional[Tuple[str, ...]] = None  # Fields that were extracted; None for all
+    fetch_error: Optional[str] = None  # Why the page could not be fetched; set on placeholder results
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     """Represents the analysis results."""
     url: str
@@ -44,7 +143,7 @@ class AnalysisResult:
     relevance_score: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class PresentationResult:
     """Represents the final formatted presentation."""
     url: str
@@ -52,14 +151,14 @@ class PresentationResult:
     timestamp: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class PageResult:
     """Represents a single page's extracted data and analysis."""
     extracted_data: ExtractedData
     analysis: AnalysisResult
 
 
-@dataclass
+@dataclass(slots=True)
 class MultiPageResult:
     """Represents results from crawling multiple pages."""
     base_url: str
@@ -67,3 +166,18 @@ class MultiPageResult:
     total_pages_crawled: int
     matching_pages: List[PageResult] = field(default_factory=list)
     timestamp: datetime = field(default_factory=datetime.now)
+    skipped_pages: Dict[str, str] = field(default_factory=dict)  # URL -> reason it was not downloaded
+    crawl_stats: Dict[str, Any] = field(default_factory=dict)  # Counters collected by the scraper
+    page_changes: Dict[str, str] = field(default_factory=dict)  # URL -> 'new', 'changed' or 'unchanged'
+
+
+@dataclass(slots=True)
+class PageState:
+    """What an incremental crawl remembers about a page between runs."""
+    url: str
+    fingerprint: str  # Digest of the decoded body
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    extracted_data: Optional[ExtractedData] = None
+    analysis: Optional[AnalysisResult] = None
+    requirement: Optional[str] = None  # Requirement the analysis was computed for
@@ -1,12 +1,15 @@
 """
 Agent Orchestrator - coordinates the workflow between all agents.
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 from .base_agent import BaseAgent
-from .scraper_agent import WebScraperAgent
+from .scraper_agent import WebScraperAgent, select_fields
 from .analyzer_agent import AnalyzerAgent
 from .presenter_agent import PresenterAgent
+from .crawl_state import CrawlStateStore
+from .exporters import export_columnar
+from .profiling import PageProfiler, profiled
 from .models import ExtractedData, AnalysisResult, PresentationResult, PageResult, MultiPageResult
 
 
@@ -15,12 +18,14 @@ class AgentOrchestrator(BaseAgent):
     Orchestrates the workflow between scraper, analyzer, and presenter agents.
     """
 
-    def __init__(self, config: Dict[str, Any] = None):
+    def __init__(self, config: Dict[str, Any] = None, state_store: Optional[CrawlStateStore] = None):
         """
         Initialize the orchestrator.
 
         Args:
             config: Configuration dictionary for all agents
+            state_store: Optional CrawlStateStore shared with other orchestrators;
+                used instead of loading the configured state_file
         """
         super().__init__("AgentOrchestrator", config)
 
@@ -33,6 +38,46 @@ class AgentOrchestrator(BaseAgent):
         self.analyzer_agent = AnalyzerAgent(analyzer_config)
         self.presenter_agent = PresenterAgent(presenter_config)
 
+        # ExtractedData fields pages are extracted with (overrides the scraper's extract_fields)
+        extract_fields = self.config.get('extract_fields')
+        if extract_fields is not None:
+            self.scraper_agent.extract_fields = select_fields(extract_fields)
+
+        # Release raw main content once a page has been analyzed (saves memory on large crawls)
+        self.drop_main_content = self.config.get('drop_main_content', False)
+        # Write crawl reports incrementally to the output file instead of building them in memory
+        self.stream_output = self.config.get('stream_output', False)
+        # Optional Parquet/CSV export of the analysis of every page
+        self.columnar_output = self.config.get('columnar_output')
+
+        # Incremental re-crawls: keep page fingerprints and analyses between runs
+        self.state_store = state_store
+        state_file = self.config.get('state_file')
+        if self.state_store is None and state_file:
+            self.state_store = CrawlStateStore(state_file)
+        if self.state_store is not None:
+            self.scraper_agent.state_store = self.state_store
+        # Only report pages that are new or changed since the last crawl
+        self.changed_only = self.config.get('changed_only', False)
+        # Wall-clock seconds a crawl may take; analysis then runs on the pages fetched so far
+        self.time_budget = self.config.get('time_budget')
+        # Processes a crawl is partitioned across by host (1 = crawl in this process)
+        self.crawl_nodes = self.config.get('crawl_nodes', 1)
+
+        # Opt-in profiling of extraction, analysis and formatting; expensive calls are dumped
+        self.profiler: Optional[PageProfiler] = None
+        profile_dir = self.config.get('profile_dir')
+        if profile_dir:
+            self.profiler = PageProfiler(
+                profile_dir,
+                cpu=self.config.get('profile_cpu', True),
+                memory=self.config.get('profile_memory', False),
+                min_seconds=self.config.get('profile_min_seconds', 0.5),
+                min_memory=self.config.get('profile_min_memory', 16 * 1024 * 1024),
+                max_dumps=self.config.get('profile_max_dumps', 50)
+            )
+            self.scraper_agent.profiler = self.profiler
+
         self.log_info("Agent Orchestrator initialized with all sub-agents")
 
     def execute(self, url: str, requirement: Optional[str] = None,
@@ -59,57 +104,40 @@ class AgentOrchestrator(BaseAgent):
         try:
             if crawl:
                 # Multi-page crawl mode
-                self.log_info("[STEP 1/3] Initiating web crawling...")
-                extracted_pages = self.scraper_agent.execute_crawl(url, requirement)
-
-                if not extracted_pages:
-                    self.log_error("No pages found matching the criteria")
+                multi_result = self.run_crawl(url, requirement)
+                if multi_result is None:
                     return self._create_error_result(url, "No matching pages found")
-
-                self.log_info(f"Found {len(extracted_pages)} matching pages")
-
-                # Step 2: Analyze all matching pages
-                self.log_info("[STEP 2/3] Analyzing extracted pages...")
-                page_results = []
-                for i, page_data in enumerate(extracted_pages, 1):
-                    self.log_info(f"Analyzing page {i}/{len(extracted_pages)}: {page_data.url}")
-                    analysis = self.analyzer_agent.execute(page_data, requirement)
-                    page_results.append(PageResult(extracted_data=page_data, analysis=analysis))
-
-                # Sort by relevance if requirement specified
-                if requirement:
-                    page_results.sort(key=lambda x: x.analysis.relevance_score, reverse=True)
-                    self.log_info("Sorted results by relevance score")
-
-                # Create multi-page result
-                multi_result = MultiPageResult(
-                    base_url=url,
-                    requirement=requirement,
-                    total_pages_crawled=len(self.scraper_agent.visited_urls),
-                    matching_pages=page_results
-                )
+                if self.columnar_output:
+                    self._export_columnar(multi_result)
 
                 # Step 3: Format and present the results
                 self.log_info("[STEP 3/3] Formatting multi-page presentation...")
-                presentation_result = self.presenter_agent.execute_multi(multi_result)
+                if save_to_file and self.stream_output:
+                    presentation_result = self._stream_to_file(multi_result, save_to_file)
+                    save_to_file = None
+                else:
+                    with profiled(self.profiler, 'present', url):
+                        presentation_result = self.presenter_agent.execute_multi(multi_result)
 
             else:
                 # Single page mode (original behavior)
-                # Step 1: Scrape the web page
-                self.log_info("[STEP 1/3] Initiating web scraping...")
-                extracted_data = self.scraper_agent.execute(url)
-
-                if not extracted_data.title:
-                    self.log_error("Failed to extract meaningful data from the page")
+                page_result = self.run_page(url, requirement)
+                if page_result is None:
                     return self._create_error_result(url, "Failed to extract data")
 
-                # Step 2: Analyze the extracted data
-                self.log_info("[STEP 2/3] Analyzing extracted data...")
-                analysis_result = self.analyzer_agent.execute(extracted_data, requirement)
+                if self.columnar_output:
+                    self._export_columnar(MultiPageResult(
+                        base_url=url,
+                        requirement=requirement,
+                        total_pages_crawled=1,
+                        matching_pages=[page_result]
+                    ))
 
                 # Step 3: Format and present the results
                 self.log_info("[STEP 3/3] Formatting presentation...")
-                presentation_result = self.presenter_agent.execute(extracted_data, analysis_result)
+                with profiled(self.profiler, 'present', url):
+                    presentation_result = self.presenter_agent.execute(page_result.extracted_data,
+                                                                       page_result.analysis)
 
             # Save to file if requested
             if save_to_file:
@@ -123,6 +151,212 @@ class AgentOrchestrator(BaseAgent):
         except Exception as e:
             self.log_error(f"Error in orchestration: {str(e)}")
             return self._create_error_result(url, str(e))
+        finally:
+            self.close()
+
+    def run_page(self, url: str, requirement: Optional[str] = None) -> Optional[PageResult]:
+        """
+        Scrape and analyze a single page, without formatting.
+
+        Args:
+            url: The URL to scrape and analyze
+            requirement: Optional keyword/phrase to search for
+
+        Returns:
+            PageResult object, or None if no meaningful data was extracted
+        """
+        # Step 1: Scrape the web page
+        self.log_info("[STEP 1/3] Initiating web scraping...")
+        extracted_data = self.scraper_agent.execute(url)
+
+        # Pages extracted without their title have nothing to check it against
+        fields = extracted_data.extracted_fields
+        if (fields is None or 'title' in fields) and not extracted_data.title:
+            self.log_error("Failed to extract meaningful data from the page")
+            return None
+
+        # Step 2: Analyze the extracted data
+        self.log_info("[STEP 2/3] Analyzing extracted data...")
+        analysis_result = self._analyze(extracted_data, requirement)
+        self._save_state()
+        return PageResult(extracted_data=extracted_data, analysis=analysis_result)
+
+    def query_state(self, requirement: Optional[str] = None, limit: int = 50) -> List[PageResult]:
+        """
+        Search the pages kept in the incremental crawl state, without fetching anything.
+
+        Args:
+            requirement: Optional keyword/phrase the pages must contain
+            limit: Maximum number of pages to return
+
+        Returns:
+            PageResult objects, most relevant first when a requirement is given
+        """
+        if self.state_store is None:
+            raise ValueError("No crawl state configured (state_file)")
+
+        page_results = []
+        for url in self.state_store.urls():
+            state = self.state_store.get(url)
+            if state is None or state.extracted_data is None:
+                continue
+            if requirement and not self.scraper_agent._matches_requirement(state.extracted_data, requirement):
+                continue
+            analysis = state.analysis
+            if analysis is None or state.requirement != requirement:
+                analysis = self.analyzer_agent.execute(state.extracted_data, requirement)
+            page_results.append(PageResult(extracted_data=state.extracted_data, analysis=analysis))
+
+        if requirement:
+            page_results.sort(key=lambda x: x.analysis.relevance_score, reverse=True)
+        return page_results[:limit]
+
+    def run_crawl(self, url: str, requirement: Optional[str] = None) -> Optional[MultiPageResult]:
+        """
+        Crawl from a URL and analyze every matching page, without formatting.
+
+        With crawl_nodes above 1 the crawl is partitioned by host across that
+        many processes, which analyze their own pages (see partition.py).
+
+        Args:
+            url: The URL to start crawling from
+            requirement: Optional keyword/phrase to search for
+
+        Returns:
+            MultiPageResult object, or None if no pages matched
+        """
+        if self.crawl_nodes > 1:
+            from .partition import run_partitioned_crawl
+            self.log_info(f"[STEP 1/3] Crawling across {self.crawl_nodes} partitioned node processes...")
+            multi_result = run_partitioned_crawl(url, requirement, self.config, nodes=self.crawl_nodes)
+            self.log_info(f"Crawled {multi_result.total_pages_crawled} pages, "
+                          f"{len(multi_result.matching_pages)} matching")
+            return multi_result if multi_result.matching_pages else None
+
+        self.log_info("[STEP 1/3] Initiating web crawling...")
+        extracted_pages = self.scraper_agent.execute_crawl(url, requirement, time_budget=self.time_budget)
+        if self.scraper_agent.crawl_stats.get('budget_exhausted'):
+            self.log_info("Crawl stopped at its time budget; analyzing the pages fetched so far")
+
+        if not extracted_pages:
+            self.log_error("No pages found matching the criteria")
+            return None
+
+        self.log_info(f"Found {len(extracted_pages)} matching pages")
+
+        # Step 2: Analyze all matching pages
+        self.log_info("[STEP 2/3] Analyzing extracted pages...")
+        page_results = []
+        for i, page_data in enumerate(extracted_pages, 1):
+            self.log_info(f"Analyzing page {i}/{len(extracted_pages)}: {page_data.url}")
+            analysis = self._analyze(page_data, requirement)
+            if self.drop_main_content:
+                page_data.main_content = ""
+            page_results.append(PageResult(extracted_data=page_data, analysis=analysis))
+
+        self._save_state()
+
+        page_changes = dict(self.scraper_agent.page_changes)
+        if self.changed_only and page_changes:
+            page_results = [page for page in page_results
+                            if page_changes.get(page.extracted_data.url) != 'unchanged']
+            self.log_info(f"Reporting {len(page_results)} new or changed pages")
+
+        # Sort by relevance if requirement specified
+        if requirement:
+            page_results.sort(key=lambda x: x.analysis.relevance_score, reverse=True)
+            self.log_info("Sorted results by relevance score")
+
+        return MultiPageResult(
+            base_url=url,
+            requirement=requirement,
+            total_pages_crawled=len(self.scraper_agent.visited_urls),
+            matching_pages=page_results,
+            skipped_pages=dict(self.scraper_agent.skipped_pages),
+            crawl_stats=dict(self.scraper_agent.crawl_stats),
+            page_changes=page_changes
+        )
+
+    def _analyze(self, page_data: ExtractedData, requirement: Optional[str]) -> AnalysisResult:
+        """
+        Analyze a page, reusing the stored analysis of pages that have not changed.
+
+        Args:
+            page_data: ExtractedData object
+            requirement: Optional keyword/phrase to search for
+
+        Returns:
+            AnalysisResult object
+        """
+        if self.state_store is None:
+            with profiled(self.profiler, 'analyze', page_data.url):
+                return self.analyzer_agent.execute(page_data, requirement)
+
+        if self.scraper_agent.page_changes.get(page_data.url) == 'unchanged':
+            state = self.state_store.get(page_data.url)
+            if state and state.analysis and state.requirement == requirement:
+                self.log_info(f"Reusing analysis of unchanged page: {page_data.url}")
+                return state.analysis
+
+        with profiled(self.profiler, 'analyze', page_data.url):
+            analysis = self.analyzer_agent.execute(page_data, requirement)
+        # Only fresh extractions are stored; a failed fetch must not replace the analysis of the stored page
+        if page_data.fetch_error is None and self.scraper_agent.page_changes.get(page_data.url) in ('new', 'changed'):
+            self.state_store.record_analysis(page_data.url, analysis, requirement)
+        return analysis
+
+    def close(self):
+        """
+        End a run: write the profile summary and stop tracing allocations.
+
+        Callers that use run_page, run_crawl or query_state directly call this
+        when they are done; execute() calls it itself. Profiling resumes if the
+        orchestrator is used again.
+        """
+        if self.profiler is not None:
+            self.log_info(f"Profile summary written to: {self.profiler.close()}")
+
+    def _save_state(self):
+        """Persist the incremental crawl state, if enabled."""
+        if self.state_store is None:
+            return
+        try:
+            self.state_store.save()
+            self.log_info(f"Crawl state saved to: {self.state_store.path} ({len(self.state_store)} pages)")
+        except OSError as e:
+            self.log_error(f"Failed to save crawl state: {str(e)}")
+
+    def _stream_to_file(self, multi_result: MultiPageResult, file_path: str) -> PresentationResult:
+        """
+        Write a multi-page report straight to a file, page by page.
+
+        Args:
+            multi_result: MultiPageResult object
+            file_path: Path to save the file
+
+        Returns:
+            PresentationResult whose text points at the written report
+        """
+        with open(file_path, 'w', encoding='utf-8') as f, profiled(self.profiler, 'present', multi_result.base_url):
+            self.presenter_agent.write_multi(multi_result, f)
+        self.log_info(f"Results streamed to: {file_path}")
+        return PresentationResult(
+            url=multi_result.base_url,
+            formatted_text=f"Crawl report for {len(multi_result.matching_pages)} pages written to {file_path}"
+        )
+
+    def _export_columnar(self, multi_result: MultiPageResult):
+        """
+        Export page analyses to the configured columnar file.
+
+        Args:
+            multi_result: MultiPageResult object
+        """
+        try:
+            written = export_columnar(multi_result, self.columnar_output)
+            self.log_info(f"Columnar export saved to: {written}")
+        except Exception as e:
+            self.log_error(f"Failed to write columnar export: {str(e)}")
 
     def _save_to_file(self, result: PresentationResult, file_path: str):
         """
@@ -0,0 +1,465 @@
+"""
+Partitioned crawling - split one crawl across nodes by a consistent hash of the host.
+
+Every host belongs to exactly one node (HashRing), so each node keeps its
+own frontier, visited set, politeness state and incremental state for its
+hosts, and no two nodes ever fetch from the same host. A node that finds
+a link to a host it does not own forwards it to the owner through a
+Transport. The crawl is over when every node is idle and no forwarded
+URLs are in transit; each node then analyzes its own pages, and
+merge_results() combines the per-node results into one MultiPageResult.
+
+LocalTransport runs the nodes as processes on one machine, which uses
+every core and stands in for a networked transport in tests:
+
+    result = run_partitioned_crawl('https://www.example.com', nodes=4)
+"""
+from abc import ABC, abstractmethod
+from bisect import bisect
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import hashlib
+import multiprocessing
+import os
+import queue
+
+from .models import MultiPageResult
+
+
+# Virtual points per node on the hash ring; more points spread hosts more evenly
+DEFAULT_REPLICAS = 64
+
+# Seconds a node waits for forwarded URLs before checking its fetches or whether the crawl is over
+IDLE_POLL = 0.05
+
+
+def _hash(key: str) -> int:
+    """Stable 64-bit hash of a string (the same in every process and on every machine)."""
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class HashRing:
+    """
+    Consistent hash ring mapping hosts to nodes.
+
+    Adding or removing a node only moves the hosts next to its points on
+    the ring, so most hosts keep their node (and its state) between runs.
+    """
+
+    def __init__(self, nodes: List[str], replicas: int = DEFAULT_REPLICAS):
+        """
+        Initialize the ring.
+
+        Args:
+            nodes: Node names
+            replicas: Points per node on the ring
+        """
+        if not nodes:
+            raise ValueError("A hash ring needs at least one node")
+        self.nodes = list(nodes)
+        points = sorted((_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(replicas))
+        self._keys = [key for key, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def owner(self, host: str) -> str:
+        """
+        Return the node that owns a host.
+
+        Args:
+            host: Host (netloc)
+
+        Returns:
+            Node name
+        """
+        index = bisect(self._keys, _hash(host.lower())) % len(self._keys)
+        return self._nodes[index]
+
+
+class Transport(ABC):
+    """
+    Carries forwarded URLs between nodes and detects the end of the crawl.
+
+    A forwarded batch counts as in transit from send() until the receiving
+    node has taken it in receive(), which also marks that node busy. The
+    crawl is finished once every node is idle and nothing is in transit.
+    """
+
+    @abstractmethod
+    def send(self, node: str, urls: List[Tuple[str, int]]):
+        """
+        Forward a batch of URLs to the node that owns them.
+
+        Args:
+            node: Receiving node
+            urls: (url, depth) pairs
+        """
+
+    @abstractmethod
+    def receive(self, node: str, timeout: float = 0.0) -> List[Tuple[str, int]]:
+        """
+        Take the URLs forwarded to a node, marking it busy if there are any.
+
+        Args:
+            node: Receiving node
+            timeout: Seconds to wait for a first batch
+
+        Returns:
+            (url, depth) pairs, possibly empty
+        """
+
+    @abstractmethod
+    def set_idle(self, node: str):
+        """
+        Mark a node as having no work left.
+
+        Args:
+            node: Node name
+        """
+
+    @abstractmethod
+    def finished(self) -> bool:
+        """Check whether every node is idle and no URLs are in transit."""
+
+    @abstractmethod
+    def retire(self, node: str):
+        """
+        Take a failed node out of the crawl, dropping the URLs sent to it,
+        so that the other nodes can still finish.
+
+        Args:
+            node: Node name
+        """
+
+
+class LocalTransport(Transport):
+    """
+    Transport between processes on one machine, over multiprocessing queues.
+
+    Create it before starting the node processes and pass it to them.
+    """
+
+    def __init__(self, nodes: List[str], context: Any = None):
+        """
+        Initialize the transport.
+
+        Args:
+            nodes: Node names
+            context: multiprocessing context (default: the platform's)
+        """
+        context = context or multiprocessing.get_context()
+        self.nodes = list(nodes)
+        self._inboxes = {node: context.Queue() for node in self.nodes}
+        self._index = {node: i for i, node in enumerate(self.nodes)}
+        self._idle = context.Array('b', len(self.nodes), lock=False)
+        self._retired = context.Array('b', len(self.nodes), lock=False)
+        self._in_transit = context.Array('q', len(self.nodes), lock=False)  # Batches per receiver
+        self._lock = context.Lock()
+
+    def send(self, node: str, urls: List[Tuple[str, int]]):
+        index = self._index[node]
+        with self._lock:
+            if self._retired[index]:
+                return
+            self._in_transit[index] += 1
+            self._inboxes[node].put(urls)
+
+    def receive(self, node: str, timeout: float = 0.0) -> List[Tuple[str, int]]:
+        inbox = self._inboxes[node]
+        batches = []
+        try:
+            batches.append(inbox.get(timeout=timeout) if timeout > 0 else inbox.get_nowait())
+            while True:
+                batches.append(inbox.get_nowait())
+        except queue.Empty:
+            pass
+        if batches:
+            # Busy before the batches stop counting as in transit, so finished() can't see a gap
+            with self._lock:
+                self._idle[self._index[node]] = 0
+                self._in_transit[self._index[node]] -= len(batches)
+        return [item for batch in batches for item in batch]
+
+    def set_idle(self, node: str):
+        with self._lock:
+            self._idle[self._index[node]] = 1
+
+    def finished(self) -> bool:
+        with self._lock:
+            return not any(self._in_transit) and all(self._idle)
+
+    def retire(self, node: str):
+        index = self._index[node]
+        with self._lock:
+            self._retired[index] = 1
+        while self._in_transit[index]:
+            self.receive(node, timeout=IDLE_POLL)
+        self.set_idle(node)
+
+
+class CrawlPartition:
+    """
+    One node's share of a partitioned crawl, as seen by WebScraperAgent.
+
+    URLs on other nodes' hosts are buffered and sent in one batch per node
+    on flush(), so the transport carries few, larger messages.
+    """
+
+    def __init__(self, node: str, ring: HashRing, transport: Transport, poll_interval: float = IDLE_POLL):
+        """
+        Initialize the partition.
+
+        Args:
+            node: This node's name
+            ring: HashRing shared by all nodes
+            transport: Transport shared by all nodes
+            poll_interval: Seconds between checks for forwarded URLs while
+                the node waits on fetches or has run out of work
+        """
+        self.node = node
+        self.ring = ring
+        self.transport = transport
+        self.poll_interval = poll_interval
+        self._outbox: Dict[str, List[Tuple[str, int]]] = {}
+        self._owned: Dict[str, bool] = {}  # host -> owned by this node
+        self.forwarded = 0
+        self.received = 0
+
+    def owns(self, url: str) -> bool:
+        """
+        Check whether this node crawls a URL's host.
+
+        Args:
+            url: Absolute URL
+
+        Returns:
+            True if the URL's host hashes to this node
+        """
+        host = urlparse(url).netloc.lower()
+        owned = self._owned.get(host)
+        if owned is None:
+            owned = self._owned[host] = self.ring.owner(host) == self.node
+        return owned
+
+    def forward(self, url: str, depth: int):
+        """
+        Queue a URL for its owner; it is sent on the next flush().
+
+        Args:
+            url: Normalized URL on a host this node does not own
+            depth: Crawl depth of the URL
+        """
+        self._outbox.setdefault(self.ring.owner(urlparse(url).netloc), []).append((url, depth))
+        self.forwarded += 1
+
+    def flush(self):
+        """Send the buffered URLs, one batch per node."""
+        for node, urls in self._outbox.items():
+            self.transport.send(node, urls)
+        self._outbox = {}
+
+    def receive(self, timeout: float = 0.0) -> List[Tuple[str, int]]:
+        """
+        Take the URLs other nodes forwarded to this one.
+
+        Args:
+            timeout: Seconds to wait for a first batch
+
+        Returns:
+            (url, depth) pairs
+        """
+        urls = self.transport.receive(self.node, timeout)
+        self.received += len(urls)
+        return urls
+
+    def idle(self) -> bool:
+        """
+        Report that this node has run out of work.
+
+        Returns:
+            True if the whole crawl is finished
+        """
+        self.flush()
+        self.transport.set_idle(self.node)
+        return self.transport.finished()
+
+
+def node_config(config: Dict[str, Any], node: str) -> Dict[str, Any]:
+    """
+    Return the orchestrator configuration of one node.
+
+    Incremental state is kept per node (the state file name gets the node
+    name as a suffix); since hosts stay on their node, each node finds its
+    hosts' state again on the next run. Profiles go to a subdirectory per node.
+
+    Args:
+        config: Orchestrator configuration of the whole crawl
+        node: Node name
+
+    Returns:
+        Configuration for the node's orchestrator
+    """
+    config = {key: value for key, value in config.items() if key != 'crawl_nodes'}
+    if config.get('state_file'):
+        config['state_file'] = f"{config['state_file']}.{node}"
+    if config.get('profile_dir'):
+        config['profile_dir'] = os.path.join(config['profile_dir'], node)
+    return config
+
+
+def crawl_node(node: str, ring: HashRing, transport: Transport, start_url: str,
+               requirement: Optional[str] = None, config: Dict[str, Any] = None) -> MultiPageResult:
+    """
+    Run one node of a partitioned crawl and analyze its pages.
+
+    Every node is given the same start URL and settings; each crawls only
+    the hosts it owns. max_pages and time_budget apply to each node.
+
+    Args:
+        node: This node's name
+        ring: HashRing shared by all nodes
+        transport: Transport shared by all nodes
+        start_url: The URL the crawl starts from
+        requirement: Optional keyword/phrase to search for
+        config: Orchestrator configuration of the whole crawl
+
+    Returns:
+        The node's MultiPageResult (possibly without pages)
+    """
+    from .orchestrator import AgentOrchestrator
+
+    orchestrator = AgentOrchestrator(node_config(config or {}, node))
+    scraper = orchestrator.scraper_agent
+    partition = CrawlPartition(node, ring, transport)
+    scraper.partition = partition
+    try:
+        result = orchestrator.run_crawl(start_url, requirement)
+    finally:
+        scraper.partition = None
+        orchestrator.close()
+    if result is None:
+        result = MultiPageResult(
+            base_url=start_url,
+            requirement=requirement,
+            total_pages_crawled=len(scraper.visited_urls),
+            skipped_pages=dict(scraper.skipped_pages),
+            crawl_stats=dict(scraper.crawl_stats),
+            page_changes=dict(scraper.page_changes)
+        )
+    result.crawl_stats['partition'] = {'node': node, 'forwarded': partition.forwarded,
+                                       'received': partition.received}
+    return result
+
+
+def merge_results(results: List[MultiPageResult]) -> MultiPageResult:
+    """
+    Combine the results of every node into one crawl result.
+
+    Pages are concatenated (sorted by relevance when there is a
+    requirement), numeric crawl counters are summed and per-host counters
+    merged; each node's own statistics are kept under crawl_stats['nodes'].
+
+    Args:
+        results: One MultiPageResult per node
+
+    Returns:
+        MultiPageResult of the whole crawl
+    """
+    if not results:
+        raise ValueError("No node results to merge")
+    first = results[0]
+    merged = MultiPageResult(base_url=first.base_url, requirement=first.requirement,
+                             total_pages_crawled=0)
+    stats: Dict[str, Any] = {'nodes': {}}
+    for result in results:
+        merged.total_pages_crawled += result.total_pages_crawled
+        merged.matching_pages.extend(result.matching_pages)
+        merged.skipped_pages.update(result.skipped_pages)
+        merged.page_changes.update(result.page_changes)
+        node = result.crawl_stats.get('partition', {}).get('node', str(len(stats['nodes'])))
+        stats['nodes'][node] = result.crawl_stats
+        for key, value in result.crawl_stats.items():
+            if isinstance(value, bool):
+                stats[key] = stats.get(key, False) or value
+            elif isinstance(value, (int, float)):
+                stats[key] = stats.get(key, 0) + value
+            elif key in ('pages_per_host', 'circuit_breakers', 'concurrency') and isinstance(value, dict):
+                # Hosts are disjoint across nodes, so per-host entries never collide
+                stats.setdefault(key, {}).update(value)
+    merged.crawl_stats = stats
+    if merged.requirement:
+        merged.matching_pages.sort(key=lambda page: page.analysis.relevance_score, reverse=True)
+    return merged
+
+
+def _node_process(node: str, ring: HashRing, transport: Transport, start_url: str,
+                  requirement: Optional[str], config: Dict[str, Any], results: Any, quiet: bool):
+    """Process target of run_partitioned_crawl: crawl one node and report its result."""
+    if quiet:
+        import logging
+        logging.disable(logging.INFO)
+    try:
+        results.put((node, crawl_node(node, ring, transport, start_url, requirement, config), None))
+    except Exception as e:
+        transport.retire(node)
+        results.put((node, None, str(e)))
+
+
+def run_partitioned_crawl(start_url: str, requirement: Optional[str] = None,
+                          config: Dict[str, Any] = None, nodes: Optional[int] = None,
+                          quiet: bool = False) -> MultiPageResult:
+    """
+    Crawl with one process per node on this machine and merge the results.
+
+    Args:
+        start_url: The URL to start crawling from
+        requirement: Optional keyword/phrase to search for
+        config: Orchestrator configuration; scraper settings apply to every node
+        nodes: Number of node processes (default: number of CPUs)
+        quiet: Only log errors in the node processes
+
+    Returns:
+        Merged MultiPageResult
+
+    Raises:
+        RuntimeError: If a node failed
+    """
+    nodes = max(1, nodes or os.cpu_count() or 1)
+    names = [f"node-{i}" for i in range(nodes)]
+    context = multiprocessing.get_context()
+    ring = HashRing(names)
+    transport = LocalTransport(names, context)
+    results_queue = context.Queue()
+    processes = [
+        context.Process(target=_node_process, name=f"CrawlNode-{name}", daemon=True,
+                        args=(name, ring, transport, start_url, requirement, config or {},
+                              results_queue, quiet))
+        for name in names
+    ]
+    for process in processes:
+        process.start()
+
+    # Collect before joining: a process can't exit until its result has been read
+    results, errors = [], []
+    pending = dict(zip(names, processes))
+    while pending:
+        try:
+            node, result, error = results_queue.get(timeout=1.0)
+        except queue.Empty:
+            for node, process in list(pending.items()):
+                if not process.is_alive() and results_queue.empty():
+                    # Died without reporting (killed, out of memory, ...)
+                    transport.retire(node)
+                    errors.append(f"{node}: exited with code {process.exitcode}")
+                    del pending[node]
+            continue
+        del pending[node]
+        if error is not None:
+            errors.append(f"{node}: {error}")
+        else:
+            results.append(result)
+    for process in processes:
+        process.join()
+    if errors:
+        raise RuntimeError(f"Partitioned crawl failed on {'; '.join(errors)}")
+    results.sort(key=lambda result: result.crawl_stats['partition']['node'])
+    return merge_results(results)
@@ -1,11 +1,18 @@
 """
 Presenter Agent - responsible for formatting and presenting results.
 """
-from typing import Optional
+from typing import Callable, Dict, Iterable, List, Optional, TextIO
 from datetime import datetime
+from types import SimpleNamespace
+import html
+import io
+import json
+import string
 
 from .base_agent import BaseAgent
-from .models import ExtractedData, AnalysisResult, PresentationResult, MultiPageResult
+from .exporters import page_result_to_record, write_jsonl
+from .models import ExtractedData, AnalysisResult, PresentationResult, PageResult, MultiPageResult
+from .report_templates import BLOCK_TEMPLATES, LIST_ITEM_TEMPLATES, STATIC_FRAGMENTS
 
 
 class PresenterAgent(BaseAgent):
@@ -14,7 +21,60 @@ class PresenterAgent(BaseAgent):
     def __init__(self, config: dict = None):
         """Initialize the presenter agent."""
         super().__init__("PresenterAgent", config)
-        self.output_format = self.config.get('output_format', 'text')  # text, markdown, html
+        self.output_format = self.config.get('output_format', 'text')  # text, markdown, html, jsonl
+        self._templates = self._build_templates()
+
+    @staticmethod
+    def _build_templates() -> Dict[str, SimpleNamespace]:
+        """
+        Build the report renderers once per agent.
+
+        Static fragments are used as-is and each block template is rendered
+        by its bound str.format method, which parses the template in C and
+        ignores extra keywords. One-field item templates also get a list
+        renderer that formats a whole list with a single join.
+
+        Returns:
+            Mapping of output format to a namespace of fragments and renderers
+        """
+        renderers = {}
+        for output_format, fragments in STATIC_FRAGMENTS.items():
+            # Text and markdown lists simply end with a blank line
+            namespace = SimpleNamespace(**{'list_footer': "", 'multi_list_footer': "", **fragments})
+            for name, template in BLOCK_TEMPLATES[output_format].items():
+                setattr(namespace, name, template.format)
+                if name in LIST_ITEM_TEMPLATES:
+                    setattr(namespace, name + '_list', PresenterAgent._compile_list_template(template))
+            renderers[output_format] = namespace
+        return renderers
+
+    @staticmethod
+    def _compile_list_template(template: str) -> Callable[[Iterable[str]], str]:
+        """
+        Turn a one-field item template into a function rendering a whole list.
+
+        The list is rendered with a single str.join, one line per item.
+
+        Args:
+            template: Template with exactly one {field}
+
+        Returns:
+            Function taking an iterable of values
+        """
+        (prefix, _, _, _), (suffix, _, _, _) = list(string.Formatter().parse(template + '{}'))[:2]
+        joiner = suffix + "\n" + prefix
+
+        def render(values: Iterable[str]) -> str:
+            return prefix + joiner.join(values) + suffix
+
+        return render
+
+    @staticmethod
+    def _escaper(output_format: str) -> Callable[[str], str]:
+        """Return the function that makes values safe for a format."""
+        if output_format == 'html':
+            return html.escape
+        return str
 
     def execute(self, extracted_data: ExtractedData, analysis: AnalysisResult) -> PresentationResult:
         """
@@ -33,6 +93,11 @@ class PresenterAgent(BaseAgent):
             formatted_text = self._format_as_markdown(extracted_data, analysis)
         elif self.output_format == 'html':
             formatted_text = self._format_as_html(extracted_data, analysis)
+        elif self.output_format == 'jsonl':
+            formatted_text = json.dumps(
+                page_result_to_record(PageResult(extracted_data=extracted_data, analysis=analysis)),
+                ensure_ascii=False
+            )
         else:
             formatted_text = self._format_as_text(extracted_data, analysis)
 
@@ -59,6 +124,8 @@ class PresenterAgent(BaseAgent):
             formatted_text = self._format_multi_as_markdown(multi_result)
         elif self.output_format == 'html':
             formatted_text = self._format_multi_as_html(multi_result)
+        elif self.output_format == 'jsonl':
+            formatted_text = self._render_multi(multi_result, 'jsonl')
         else:
             formatted_text = self._format_multi_as_text(multi_result)
 
@@ -69,6 +136,40 @@ class PresenterAgent(BaseAgent):
             formatted_text=formatted_text
         )
 
+    def _transfer_summary(self, multi_result: MultiPageResult) -> Optional[str]:
+        """
+        Describe wire versus decoded bytes for a crawl.
+
+        Args:
+            multi_result: MultiPageResult object
+
+        Returns:
+            Summary string, or None if nothing was downloaded
+        """
+        wire = multi_result.crawl_stats.get('wire_bytes', 0)
+        decoded = multi_result.crawl_stats.get('decoded_bytes', 0)
+        if not decoded:
+            return None
+        saved = 100.0 * (decoded - wire) / decoded
+        return f"{wire / 1024:.1f} KiB on the wire, {decoded / 1024:.1f} KiB decoded ({saved:.0f}% saved)"
+
+    def _change_summary(self, multi_result: MultiPageResult) -> Optional[str]:
+        """
+        Count new, changed and unchanged pages of an incremental crawl.
+
+        Args:
+            multi_result: MultiPageResult object
+
+        Returns:
+            Summary string, or None if the crawl was not incremental
+        """
+        if not multi_result.page_changes:
+            return None
+        counts = {'new': 0, 'changed': 0, 'unchanged': 0}
+        for status in multi_result.page_changes.values():
+            counts[status] = counts.get(status, 0) + 1
+        return ", ".join(f"{count} {status}" for status, count in counts.items())
+
     def _format_as_text(self, data: ExtractedData, analysis: AnalysisResult) -> str:
         """
         Format results as plain text.
@@ -80,80 +181,7 @@ class PresenterAgent(BaseAgent):
         Returns:
             Formatted text string
         """
-        lines = []
-        lines.append("=" * 80)
-        lines.append("WEB SCRAPER AGENT - ANALYSIS REPORT")
-        lines.append("=" * 80)
-        lines.append("")
-
-        # Basic Information
-        lines.append("BASIC INFORMATION")
-        lines.append("-" * 80)
-        lines.append(f"URL:           {analysis.url}")
-        lines.append(f"Title:         {data.title}")
-        lines.append(f"Content Type:  {analysis.content_type}")
-        lines.append(f"Word Count:    {analysis.word_count}")
-        lines.append(f"Importance:    {analysis.importance_score:.2f}/1.00")
-        lines.append(f"Analysis Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append("")
-
-        # Summary
-        lines.append("SUMMARY")
-        lines.append("-" * 80)
-        lines.append(analysis.summary)
-        lines.append("")
-
-        # Key Points
-        if analysis.key_points:
-            lines.append("KEY POINTS")
-            lines.append("-" * 80)
-            for point in analysis.key_points:
-                lines.append(f"  {point}")
-            lines.append("")
-
-        # Topics
-        if analysis.topics:
-            lines.append("IDENTIFIED TOPICS")
-            lines.append("-" * 80)
-            lines.append(f"  {', '.join(analysis.topics)}")
-            lines.append("")
-
-        # Page Structure
-        lines.append("PAGE STRUCTURE")
-        lines.append("-" * 80)
-        lines.append(f"  Headings:   {len(data.headings)}")
-        lines.append(f"  Paragraphs: {len(data.paragraphs)}")
-        lines.append(f"  Links:      {len(data.links)}")
-        lines.append(f"  Images:     {len(data.images)}")
-        lines.append("")
-
-        # Sample Links (top 5)
-        if data.links:
-            lines.append("SAMPLE LINKS (Top 5)")
-            lines.append("-" * 80)
-            for i, link in enumerate(data.links[:5], 1):
-                text = link['text'][:50] if link['text'] else 'No text'
-                lines.append(f"  {i}. {text}")
-                lines.append(f"     URL: {link['url']}")
-            lines.append("")
-
-        # Metadata
-        if data.metadata:
-            lines.append("METADATA")
-            lines.append("-" * 80)
-            for key, value in list(data.metadata.items())[:10]:
-                # Truncate long values
-                value_str = str(value)[:100]
-                if len(str(value)) > 100:
-                    value_str += "..."
-                lines.append(f"  {key}: {value_str}")
-            lines.append("")
-
-        lines.append("=" * 80)
-        lines.append("END OF REPORT")
-        lines.append("=" * 80)
-
-        return "\n".join(lines)
+        return self._render_single(data, analysis, 'text')
 
     def _format_as_markdown(self, data: ExtractedData, analysis: AnalysisResult) -> str:
         """
@@ -166,75 +194,7 @@ class PresenterAgent(BaseAgent):
         Returns:
             Formatted markdown string
         """
-        lines = []
-        lines.append("# Web Scraper Agent - Analysis Report")
-        lines.append("")
-
-        # Basic Information
-        lines.append("## Basic Information")
-        lines.append("")
-        lines.append(f"- **URL:** {analysis.url}")
-        lines.append(f"- **Title:** {data.title}")
-        lines.append(f"- **Content Type:** {analysis.content_type}")
-        lines.append(f"- **Word Count:** {analysis.word_count}")
-        lines.append(f"- **Importance Score:** {analysis.importance_score:.2f}/1.00")
-        lines.append(f"- **Analysis Time:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append("")
-
-        # Summary
-        lines.append("## Summary")
-        lines.append("")
-        lines.append(analysis.summary)
-        lines.append("")
-
-        # Key Points
-        if analysis.key_points:
-            lines.append("## Key Points")
-            lines.append("")
-            for point in analysis.key_points:
-                lines.append(f"- {point}")
-            lines.append("")
-
-        # Topics
-        if analysis.topics:
-            lines.append("## Identified Topics")
-            lines.append("")
-            lines.append(f"`{' | '.join(analysis.topics)}`")
-            lines.append("")
-
-        # Page Structure
-        lines.append("## Page Structure")
-        lines.append("")
-        lines.append(f"- **Headings:** {len(data.headings)}")
-        lines.append(f"- **Paragraphs:** {len(data.paragraphs)}")
-        lines.append(f"- **Links:** {len(data.links)}")
-        lines.append(f"- **Images:** {len(data.images)}")
-        lines.append("")
-
-        # Sample Links
-        if data.links:
-            lines.append("## Sample Links (Top 5)")
-            lines.append("")
-            for i, link in enumerate(data.links[:5], 1):
-                text = link['text'][:50] if link['text'] else 'No text'
-                lines.append(f"{i}. [{text}]({link['url']})")
-            lines.append("")
-
-        # Metadata
-        if data.metadata:
-            lines.append("## Metadata")
-            lines.append("")
-            for key, value in list(data.metadata.items())[:10]:
-                value_str = str(value)[:100]
-                if len(str(value)) > 100:
-                    value_str += "..."
-                lines.append(f"- **{key}:** {value_str}")
-            lines.append("")
-
-        lines.append("---")
-        lines.append("*End of Report*")
-
-        return "\n".join(lines)
+        return self._render_single(data, analysis, 'markdown')
 
     def _format_as_html(self, data: ExtractedData, analysis: AnalysisResult) -> str:
         """
@@ -247,64 +207,84 @@ class PresenterAgent(BaseAgent):
         Returns:
             Formatted HTML string
         """
-        html = []
-        html.append("<!DOCTYPE html>")
-        html.append("<html>")
-        html.append("<head>")
-        html.append("    <meta charset='UTF-8'>")
-        html.append("    <title>Web Scraper Analysis Report</title>")
-        html.append("    <style>")
-        html.append("        body { font-family: Arial, sans-serif; margin: 20px; line-height: 1.6; }")
-        html.append("        h1 { color: #2c3e50; border-bottom: 3px solid #3498db; }")
-        html.append("        h2 { color: #34495e; margin-top: 30px; border-bottom: 1px solid #bdc3c7; }")
-        html.append("        .info-grid { display: grid; grid-template-columns: 200px 1fr; gap: 10px; }")
-        html.append("        .info-label { font-weight: bold; color: #7f8c8d; }")
-        html.append("        .topic-tag { display: inline-block; background: #3498db; color: white; ")
-        html.append("                     padding: 5px 10px; margin: 5px; border-radius: 3px; }")
-        html.append("        ul { list-style-type: none; padding-left: 0; }")
-        html.append("        li { margin: 10px 0; padding-left: 20px; position: relative; }")
-        html.append("        li:before { content: '▸'; position: absolute; left: 0; color: #3498db; }")
-        html.append("    </style>")
-        html.append("</head>")
-        html.append("<body>")
-        html.append("    <h1>Web Scraper Agent - Analysis Report</h1>")
-
-        # Basic Information
-        html.append("    <h2>Basic Information</h2>")
-        html.append("    <div class='info-grid'>")
-        html.append(f"        <div class='info-label'>URL:</div><div>{analysis.url}</div>")
-        html.append(f"        <div class='info-label'>Title:</div><div>{data.title}</div>")
-        html.append(f"        <div class='info-label'>Content Type:</div><div>{analysis.content_type}</div>")
-        html.append(f"        <div class='info-label'>Word Count:</div><div>{analysis.word_count}</div>")
-        html.append(f"        <div class='info-label'>Importance:</div><div>{analysis.importance_score:.2f}/1.00</div>")
-        html.append(f"        <div class='info-label'>Analysis Time:</div>")
-        html.append(f"        <div>{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</div>")
-        html.append("    </div>")
-
-        # Summary
-        html.append("    <h2>Summary</h2>")
-        html.append(f"    <p>{analysis.summary.replace(chr(10), '<br>')}</p>")
+        return self._render_single(data, analysis, 'html')
+
+    def _render_single(self, data: ExtractedData, analysis: AnalysisResult, output_format: str) -> str:
+        """
+        Render a single-page report from the report templates.
+
+        Args:
+            data: ExtractedData object
+            analysis: AnalysisResult object
+            output_format: 'text', 'markdown' or 'html'
+
+        Returns:
+            Formatted report string
+        """
+        t = self._templates[output_format]
+        esc = self._escaper(output_format)
+        parts = [t.header]
+
+        # Basic Information and Summary
+        summary = esc(analysis.summary)
+        if output_format == 'html':
+            summary = summary.replace(chr(10), '<br>')
+        parts.append(t.basic(
+            url=esc(analysis.url),
+            title=esc(data.title),
+            content_type=esc(analysis.content_type),
+            word_count=analysis.word_count,
+            importance_score=analysis.importance_score,
+            analysis_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            summary=summary
+        ))
 
         # Key Points
         if analysis.key_points:
-            html.append("    <h2>Key Points</h2>")
-            html.append("    <ul>")
-            for point in analysis.key_points:
-                html.append(f"        <li>{point}</li>")
-            html.append("    </ul>")
+            parts.append(t.key_points_header)
+            parts.append(t.key_point_list(map(esc, analysis.key_points)))
+            parts.append(t.list_footer)
 
         # Topics
         if analysis.topics:
-            html.append("    <h2>Identified Topics</h2>")
-            html.append("    <div>")
-            for topic in analysis.topics:
-                html.append(f"        <span class='topic-tag'>{topic}</span>")
-            html.append("    </div>")
-
-        html.append("</body>")
-        html.append("</html>")
-
-        return "\n".join(html)
+            if output_format == 'html':
+                parts.append(t.topics_header)
+                parts.append(t.topic_list(map(esc, analysis.topics)))
+                parts.append(t.topics_footer)
+            else:
+                separator = ', ' if output_format == 'text' else ' | '
+                parts.append(t.topics(topics=separator.join(analysis.topics)))
+
+        if output_format != 'html':
+            # Page Structure
+            parts.append(t.structure(
+                headings=len(data.headings),
+                paragraphs=len(data.paragraphs),
+                links=len(data.links),
+                images=len(data.images)
+            ))
+
+            # Sample Links (top 5)
+            if data.links:
+                parts.append(t.links_header)
+                for i, link in enumerate(data.links[:5], 1):
+                    text = link.text[:50] if link.text else 'No text'
+                    parts.append(t.link(index=i, text=text, url=link.url))
+                parts.append(t.list_footer)
+
+            # Metadata
+            if data.metadata:
+                parts.append(t.metadata_header)
+                for key, value in list(data.metadata.items())[:10]:
+                    # Truncate long values
+                    value_str = str(value)[:100]
+                    if len(str(value)) > 100:
+                        value_str += "..."
+                    parts.append(t.metadata_item(key=key, value=value_str))
+                parts.append(t.list_footer)
+
+        parts.append(t.footer)
+        return "\n".join(parts)
 
     def _format_multi_as_text(self, multi_result: MultiPageResult) -> str:
         """
@@ -316,61 +296,7 @@ class PresenterAgent(BaseAgent):
         Returns:
             Formatted text string
         """
-        lines = []
-        lines.append("=" * 80)
-        lines.append("WEB SCRAPER AGENT - MULTI-PAGE CRAWL REPORT")
-        lines.append("=" * 80)
-        lines.append("")
-
-        # Overview
-        lines.append("CRAWL OVERVIEW")
-        lines.append("-" * 80)
-        lines.append(f"Base URL:          {multi_result.base_url}")
-        if multi_result.requirement:
-            lines.append(f"Search Term:       '{multi_result.requirement}'")
-        lines.append(f"Pages Crawled:     {multi_result.total_pages_crawled}")
-        lines.append(f"Matching Pages:    {len(multi_result.matching_pages)}")
-        lines.append(f"Crawl Time:        {multi_result.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append("")
-
-        # Results summary
-        lines.append("MATCHING PAGES (Sorted by Relevance)")
-        lines.append("=" * 80)
-        lines.append("")
-
-        for i, page_result in enumerate(multi_result.matching_pages, 1):
-            data = page_result.extracted_data
-            analysis = page_result.analysis
-
-            lines.append(f"[{i}] {data.title or 'No Title'}")
-            lines.append("-" * 80)
-            lines.append(f"URL:            {data.url}")
-            lines.append(f"Content Type:   {analysis.content_type}")
-            lines.append(f"Word Count:     {analysis.word_count}")
-            if multi_result.requirement:
-                lines.append(f"Relevance:      {analysis.relevance_score:.2f}/1.00")
-            lines.append(f"Importance:     {analysis.importance_score:.2f}/1.00")
-            lines.append("")
-
-            # Key points for this page
-            if analysis.key_points:
-                lines.append("Key Points:")
-                for point in analysis.key_points[:5]:
-                    lines.append(f"  • {point}")
-                lines.append("")
-
-            # Topics
-            if analysis.topics:
-                lines.append(f"Topics: {', '.join(analysis.topics[:5])}")
-                lines.append("")
-
-            lines.append("")
-
-        lines.append("=" * 80)
-        lines.append("END OF MULTI-PAGE REPORT")
-        lines.append("=" * 80)
-
-        return "\n".join(lines)
+        return self._render_multi(multi_result, 'text')
 
     def _format_multi_as_markdown(self, multi_result: MultiPageResult) -> str:
         """
@@ -382,58 +308,7 @@ class PresenterAgent(BaseAgent):
         Returns:
             Formatted markdown string
         """
-        lines = []
-        lines.append("# Web Scraper Agent - Multi-Page Crawl Report")
-        lines.append("")
-
-        # Overview
-        lines.append("## Crawl Overview")
-        lines.append("")
-        lines.append(f"- **Base URL:** {multi_result.base_url}")
-        if multi_result.requirement:
-            lines.append(f"- **Search Term:** `{multi_result.requirement}`")
-        lines.append(f"- **Pages Crawled:** {multi_result.total_pages_crawled}")
-        lines.append(f"- **Matching Pages:** {len(multi_result.matching_pages)}")
-        lines.append(f"- **Crawl Time:** {multi_result.timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append("")
-
-        # Table of contents
-        lines.append("## Matching Pages (Sorted by Relevance)")
-        lines.append("")
-
-        for i, page_result in enumerate(multi_result.matching_pages, 1):
-            data = page_result.extracted_data
-            analysis = page_result.analysis
-
-            lines.append(f"### {i}. {data.title or 'No Title'}")
-            lines.append("")
-            lines.append(f"- **URL:** [{data.url}]({data.url})")
-            lines.append(f"- **Content Type:** {analysis.content_type}")
-            lines.append(f"- **Word Count:** {analysis.word_count}")
-            if multi_result.requirement:
-                lines.append(f"- **Relevance Score:** {analysis.relevance_score:.2f}/1.00")
-            lines.append(f"- **Importance Score:** {analysis.importance_score:.2f}/1.00")
-            lines.append("")
-
-            # Key points
-            if analysis.key_points:
-                lines.append("**Key Points:**")
-                lines.append("")
-                for point in analysis.key_points[:5]:
-                    lines.append(f"- {point}")
-                lines.append("")
-
-            # Topics
-            if analysis.topics:
-                lines.append(f"**Topics:** `{' | '.join(analysis.topics[:5])}`")
-                lines.append("")
-
-            lines.append("---")
-            lines.append("")
-
-        lines.append("*End of Multi-Page Report*")
-
-        return "\n".join(lines)
+        return self._render_multi(multi_result, 'markdown')
 
     def _format_multi_as_html(self, multi_result: MultiPageResult) -> str:
         """
@@ -445,95 +320,129 @@ class PresenterAgent(BaseAgent):
         Returns:
             Formatted HTML string
         """
-        html = []
-        html.append("<!DOCTYPE html>")
-        html.append("<html>")
-        html.append("<head>")
-        html.append("    <meta charset='UTF-8'>")
-        html.append("    <title>Web Scraper Multi-Page Crawl Report</title>")
-        html.append("    <style>")
-        html.append("        body { font-family: Arial, sans-serif; margin: 20px; line-height: 1.6; }")
-        html.append("        h1 { color: #2c3e50; border-bottom: 3px solid #3498db; }")
-        html.append("        h2 { color: #34495e; margin-top: 30px; border-bottom: 1px solid #bdc3c7; }")
-        html.append("        .overview { background: #ecf0f1; padding: 15px; border-radius: 5px; margin: 20px 0; }")
-        html.append("        .page-result { border: 1px solid #bdc3c7; padding: 20px; margin: 20px 0; ")
-        html.append("                       border-radius: 5px; background: #fff; }")
-        html.append("        .page-result h3 { color: #2980b9; margin-top: 0; }")
-        html.append("        .info-grid { display: grid; grid-template-columns: 150px 1fr; gap: 10px; margin: 15px 0; }")
-        html.append("        .info-label { font-weight: bold; color: #7f8c8d; }")
-        html.append("        .topic-tag { display: inline-block; background: #3498db; color: white; ")
-        html.append("                     padding: 3px 8px; margin: 3px; border-radius: 3px; font-size: 0.9em; }")
-        html.append("        .relevance-high { color: #27ae60; font-weight: bold; }")
-        html.append("        .relevance-medium { color: #f39c12; font-weight: bold; }")
-        html.append("        .relevance-low { color: #95a5a6; font-weight: bold; }")
-        html.append("        ul { margin: 10px 0; padding-left: 20px; }")
-        html.append("        li { margin: 5px 0; }")
-        html.append("    </style>")
-        html.append("</head>")
-        html.append("<body>")
-        html.append("    <h1>Web Scraper Agent - Multi-Page Crawl Report</h1>")
+        return self._render_multi(multi_result, 'html')
+
+    def _render_multi(self, multi_result: MultiPageResult, output_format: str) -> str:
+        """Render a multi-page report into a string."""
+        buffer = io.StringIO()
+        self.write_multi(multi_result, buffer, output_format)
+        return buffer.getvalue()
+
+    def write_multi(self, multi_result: MultiPageResult, sink: TextIO,
+                    output_format: Optional[str] = None):
+        """
+        Write a multi-page report incrementally to a file-like sink.
+
+        The header is written first, then one block per page, then the
+        footer, so memory use does not grow with the size of the report.
+
+        Args:
+            multi_result: MultiPageResult object containing all page results
+            sink: Text stream to write to (anything with a write() method)
+            output_format: Output format; defaults to the configured format
+        """
+        output_format = output_format or self.output_format
+        if output_format == 'jsonl':
+            write_jsonl(multi_result.matching_pages, sink)
+            return
+        if output_format not in self._templates:
+            output_format = 'text'
+
+        sink.write("\n".join(self._multi_header(multi_result, output_format)))
+        for i, page_result in enumerate(multi_result.matching_pages, 1):
+            sink.write("\n")
+            sink.write("\n".join(self._multi_page(i, page_result, multi_result, output_format)))
+        sink.write("\n")
+        sink.write("\n".join(self._multi_footer(multi_result, output_format)))
+
+    def _multi_header(self, multi_result: MultiPageResult, output_format: str) -> List[str]:
+        """Build the header fragments of a multi-page report."""
+        t = self._templates[output_format]
+        esc = self._escaper(output_format)
+        parts = [t.multi_header]
 
         # Overview
-        html.append("    <div class='overview'>")
-        html.append("        <h2>Crawl Overview</h2>")
-        html.append("        <div class='info-grid'>")
-        html.append(f"            <div class='info-label'>Base URL:</div><div>{multi_result.base_url}</div>")
+        fields = [('Base URL:', esc(multi_result.base_url))]
+        if multi_result.requirement:
+            requirement = esc(multi_result.requirement)
+            if output_format == 'html':
+                requirement = f"<code>{requirement}</code>"
+            elif output_format == 'markdown':
+                requirement = f"`{requirement}`"
+            else:
+                requirement = f"'{requirement}'"
+            fields.append(('Search Term:', requirement))
+        fields.append(('Pages Crawled:', multi_result.total_pages_crawled))
+        fields.append(('Matching Pages:', len(multi_result.matching_pages)))
+        if multi_result.skipped_pages:
+            fields.append(('Skipped Pages:', len(multi_result.skipped_pages)))
+        transfer = self._transfer_summary(multi_result)
+        if transfer:
+            fields.append(('Transferred:', transfer))
+        changes = self._change_summary(multi_result)
+        if changes:
+            fields.append(('Changes:', changes))
+        parts.extend(t.multi_overview_field(label=label, value=value) for label, value in fields)
+
+        crawl_time = multi_result.timestamp.strftime('%Y-%m-%d %H:%M:%S')
+        if output_format == 'html':
+            parts.append(t.multi_overview_time(value=crawl_time))
+            parts.append(t.multi_overview_footer)
+        else:
+            parts.append(t.multi_overview_field(label='Crawl Time:', value=crawl_time))
+            parts.append(t.multi_results_header)
+        return parts
+
+    def _multi_page(self, i: int, page_result: PageResult, multi_result: MultiPageResult,
+                    output_format: str) -> List[str]:
+        """Build the fragments for one page of a multi-page report."""
+        t = self._templates[output_format]
+        esc = self._escaper(output_format)
+        data = page_result.extracted_data
+        analysis = page_result.analysis
+
+        parts = [t.multi_page(
+            index=i,
+            title=esc(data.title or 'No Title'),
+            url=esc(data.url),
+            content_type=esc(analysis.content_type),
+            word_count=analysis.word_count
+        )]
         if multi_result.requirement:
-            html.append(f"            <div class='info-label'>Search Term:</div><div><code>{multi_result.requirement}</code></div>")
-        html.append(f"            <div class='info-label'>Pages Crawled:</div><div>{multi_result.total_pages_crawled}</div>")
-        html.append(f"            <div class='info-label'>Matching Pages:</div><div>{len(multi_result.matching_pages)}</div>")
-        html.append(f"            <div class='info-label'>Crawl Time:</div>")
-        html.append(f"            <div>{multi_result.timestamp.strftime('%Y-%m-%d %H:%M:%S')}</div>")
-        html.append("        </div>")
-        html.append("    </div>")
+            parts.append(t.multi_relevance(
+                relevance_score=analysis.relevance_score,
+                relevance_class=self._relevance_class(analysis.relevance_score)
+            ))
+        parts.append(t.multi_importance(importance_score=analysis.importance_score))
 
-        # Results
-        html.append("    <h2>Matching Pages (Sorted by Relevance)</h2>")
+        # Key points for this page
+        if analysis.key_points:
+            parts.append(t.multi_key_points_header)
+            parts.append(t.multi_key_point_list(map(esc, analysis.key_points[:5])))
+            parts.append(t.multi_list_footer)
 
-        for i, page_result in enumerate(multi_result.matching_pages, 1):
-            data = page_result.extracted_data
-            analysis = page_result.analysis
-
-            # Determine relevance class
-            relevance_class = "relevance-low"
-            if multi_result.requirement:
-                if analysis.relevance_score >= 0.7:
-                    relevance_class = "relevance-high"
-                elif analysis.relevance_score >= 0.4:
-                    relevance_class = "relevance-medium"
-
-            html.append("    <div class='page-result'>")
-            html.append(f"        <h3>{i}. {data.title or 'No Title'}</h3>")
-            html.append("        <div class='info-grid'>")
-            html.append(f"            <div class='info-label'>URL:</div>")
-            html.append(f"            <div><a href='{data.url}' target='_blank'>{data.url}</a></div>")
-            html.append(f"            <div class='info-label'>Content Type:</div><div>{analysis.content_type}</div>")
-            html.append(f"            <div class='info-label'>Word Count:</div><div>{analysis.word_count}</div>")
-            if multi_result.requirement:
-                html.append(f"            <div class='info-label'>Relevance:</div>")
-                html.append(f"            <div class='{relevance_class}'>{analysis.relevance_score:.2f}/1.00</div>")
-            html.append(f"            <div class='info-label'>Importance:</div><div>{analysis.importance_score:.2f}/1.00</div>")
-            html.append("        </div>")
-
-            # Key points
-            if analysis.key_points:
-                html.append("        <h4>Key Points</h4>")
-                html.append("        <ul>")
-                for point in analysis.key_points[:5]:
-                    html.append(f"            <li>{point}</li>")
-                html.append("        </ul>")
-
-            # Topics
-            if analysis.topics:
-                html.append("        <h4>Topics</h4>")
-                html.append("        <div>")
-                for topic in analysis.topics[:5]:
-                    html.append(f"            <span class='topic-tag'>{topic}</span>")
-                html.append("        </div>")
-
-            html.append("    </div>")
-
-        html.append("</body>")
-        html.append("</html>")
-
-        return "\n".join(html)
+        # Topics
+        if analysis.topics:
+            if output_format == 'html':
+                parts.append(t.multi_topics_header)
+                parts.append(t.multi_topic_list(map(esc, analysis.topics[:5])))
+                parts.append(t.multi_topics_footer)
+            else:
+                separator = ', ' if output_format == 'text' else ' | '
+                parts.append(t.multi_topics(topics=separator.join(analysis.topics[:5])))
+
+        parts.append(t.multi_page_footer)
+        return parts
+
+    def _multi_footer(self, multi_result: MultiPageResult, output_format: str) -> List[str]:
+        """Build the footer fragments of a multi-page report."""
+        return [self._templates[output_format].multi_footer]
+
+    @staticmethod
+    def _relevance_class(relevance_score: float) -> str:
+        """Map a relevance score to the CSS class used in HTML reports."""
+        if relevance_score >= 0.7:
+            return "relevance-high"
+        if relevance_score >= 0.4:
+            return "relevance-medium"
+        return "relevance-low"
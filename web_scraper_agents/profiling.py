@@ -0,0 +1,264 @@
+"""
+Per-page profiling - opt-in cProfile and tracemalloc capture for slow or large pages.
+
+PageProfiler times every extraction, analysis and report formatting
+call. Calls that take longer than min_seconds have their cProfile stats
+dumped to a `.prof` file; with memory profiling on, calls whose peak
+allocation exceeds min_memory have a tracemalloc snapshot dumped too. A
+summary of the slowest pages, with the heaviest functions of their
+profiles, is written when the run ends.
+
+Dumps can be inspected with the standard tools:
+
+    python -m pstats profiles/0001-extract-www.example.com_slow-page.prof
+    snapshot = tracemalloc.Snapshot.load('profiles/0002-analyze-....snapshot')
+"""
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+import heapq
+import io
+import itertools
+import os
+import re
+import threading
+import time
+
+
+# Stages that are profiled
+STAGES = ('extract', 'analyze', 'present')
+
+SUMMARY_FILE = 'profile_summary.txt'
+
+
+@dataclass(slots=True)
+class ProfileRecord:
+    """Cost of one profiled call."""
+    stage: str
+    url: str
+    seconds: float
+    peak_bytes: int = 0  # Peak traced allocation during the call (memory profiling only)
+    files: List[str] = field(default_factory=list)  # Dumped .prof / .snapshot files
+
+
+def profiled(profiler: Optional['PageProfiler'], stage: str, url: str):
+    """
+    Return a context manager that profiles a block, or does nothing without a profiler.
+
+    Args:
+        profiler: PageProfiler, or None when profiling is off
+        stage: 'extract', 'analyze' or 'present'
+        url: Page (or report) the block works on
+
+    Returns:
+        Context manager
+    """
+    return profiler.profile(stage, url) if profiler is not None else nullcontext()
+
+
+class PageProfiler:
+    """
+    Profiles pipeline stages per page and keeps dumps of the expensive ones.
+
+    Timings are kept for the slowest pages only, so memory use does not
+    grow with the size of a crawl. The class is thread-safe; note that
+    tracemalloc peaks are process-wide, so with several crawl workers a
+    page's peak includes allocations of pages extracted at the same time
+    (use one worker for exact figures). On Python 3.12+ only one cProfile
+    profiler can run at a time, so concurrent extractions are timed but
+    not all of them are profiled.
+    """
+
+    def __init__(self, output_dir: str, cpu: bool = True, memory: bool = False,
+                 min_seconds: float = 0.5, min_memory: int = 16 * 1024 * 1024,
+                 max_dumps: int = 50, top: int = 20):
+        """
+        Initialize the profiler.
+
+        Args:
+            output_dir: Directory for the dumps and the summary (created if missing)
+            cpu: Run calls under cProfile and dump the slow ones
+            memory: Trace allocations with tracemalloc and dump snapshots of large calls
+            min_seconds: Calls at least this slow have their profile dumped
+            min_memory: Calls whose peak allocation reaches this many bytes get a snapshot
+            max_dumps: Most files dumped in one run
+            top: Slowest calls kept for the summary
+        """
+        self.output_dir = output_dir
+        self.cpu = cpu
+        self.memory = memory
+        self.min_seconds = min_seconds
+        self.min_memory = min_memory
+        self.max_dumps = max_dumps
+        self.top = top
+        os.makedirs(output_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+        self._slowest: List[tuple] = []  # Min-heap of (seconds, sequence, ProfileRecord)
+        self._totals: Dict[str, List[float]] = {}  # stage -> [calls, seconds, largest peak]
+        self.dumped: List[ProfileRecord] = []
+        self._dumps = 0
+        self._started_tracing = False
+        if memory:
+            self._start_tracing()
+
+    def _start_tracing(self):
+        """Start tracing allocations, unless something already is."""
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    @contextmanager
+    def profile(self, stage: str, url: str) -> Iterator[None]:
+        """
+        Time a block, under cProfile and/or tracemalloc if enabled.
+
+        Args:
+            stage: 'extract', 'analyze' or 'present'
+            url: Page (or report) the block works on
+        """
+        profile = None
+        if self.cpu:
+            import cProfile
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                profile = None  # Another profiler is active (Python 3.12+)
+        base = 0
+        if self.memory:
+            import tracemalloc
+            self._start_tracing()  # Again, after close()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+            peak = 0
+            if self.memory:
+                peak = max(0, tracemalloc.get_traced_memory()[1] - base)
+            self._record(ProfileRecord(stage=stage, url=url, seconds=seconds, peak_bytes=peak), profile)
+
+    def _record(self, record: ProfileRecord, profile):
+        """Dump the profile and snapshot of an expensive call, and keep its timing."""
+        slow = profile is not None and record.seconds >= self.min_seconds
+        large = self.memory and record.peak_bytes >= self.min_memory
+        with self._lock:
+            sequence = next(self._sequence)
+            totals = self._totals.setdefault(record.stage, [0, 0.0, 0])
+            totals[0] += 1
+            totals[1] += record.seconds
+            totals[2] = max(totals[2], record.peak_bytes)
+            dump = (slow or large) and self._dumps < self.max_dumps
+            if dump:
+                self._dumps += 1
+
+        if dump:
+            name = os.path.join(self.output_dir, f"{sequence:04d}-{record.stage}-{self._slug(record.url)}")
+            if slow:
+                profile.dump_stats(f"{name}.prof")
+                record.files.append(f"{name}.prof")
+            if large:
+                import tracemalloc
+                tracemalloc.take_snapshot().dump(f"{name}.snapshot")
+                record.files.append(f"{name}.snapshot")
+
+        with self._lock:
+            if dump:
+                self.dumped.append(record)
+            entry = (record.seconds, sequence, record)
+            if len(self._slowest) < self.top:
+                heapq.heappush(self._slowest, entry)
+            elif entry > self._slowest[0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    @staticmethod
+    def _slug(url: str) -> str:
+        """File-name-safe form of a URL."""
+        return re.sub(r'[^A-Za-z0-9.-]+', '_', url.split('://', 1)[-1]).strip('_')[:80] or 'page'
+
+    def slowest(self) -> List[ProfileRecord]:
+        """
+        Return the slowest calls seen so far.
+
+        Returns:
+            Up to `top` ProfileRecords, slowest first
+        """
+        with self._lock:
+            return [record for _, _, record in sorted(self._slowest, reverse=True)]
+
+    def summary(self, functions: int = 8) -> str:
+        """
+        Format a summary of the run.
+
+        Args:
+            functions: Heaviest functions listed for each of the three slowest dumped profiles
+
+        Returns:
+            Plain-text report: totals per stage, the slowest calls, and the
+            heaviest functions of the slowest profiles
+        """
+        import pstats
+
+        lines = ["PROFILE SUMMARY", "=" * 80]
+        with self._lock:
+            totals = {stage: list(values) for stage, values in self._totals.items()}
+        for stage in sorted(totals, key=lambda name: STAGES.index(name) if name in STAGES else len(STAGES)):
+            calls, seconds, peak = totals[stage]
+            line = f"{stage:<8} {int(calls):6d} calls  {seconds:9.3f} s total  {seconds / calls * 1000:8.1f} ms avg"
+            if self.memory:
+                line += f"  {peak / (1024 * 1024):7.1f} MiB largest peak"
+            lines.append(line)
+
+        lines.extend(["", f"SLOWEST CALLS (profiles dumped at >= {self.min_seconds} s)", "-" * 80])
+        for record in self.slowest():
+            line = f"{record.seconds * 1000:9.1f} ms  {record.stage:<8} {record.url}"
+            if self.memory:
+                line += f"  ({record.peak_bytes / (1024 * 1024):.1f} MiB peak)"
+            lines.append(line)
+            lines.extend(f"{'':14}{path}" for path in record.files)
+
+        profiles = [record for record in sorted(self.dumped, key=lambda r: r.seconds, reverse=True)
+                    if any(path.endswith('.prof') for path in record.files)][:3]
+        for record in profiles:
+            path = next(path for path in record.files if path.endswith('.prof'))
+            stream = io.StringIO()
+            pstats.Stats(path, stream=stream).sort_stats('cumulative').print_stats(functions)
+            lines.extend(["", f"{record.stage} {record.url} ({record.seconds * 1000:.1f} ms)", "-" * 80])
+            # Skip pstats' header lines up to the column titles
+            body = stream.getvalue().splitlines()
+            start = next((i for i, line in enumerate(body) if line.lstrip().startswith('ncalls')), 0)
+            lines.extend(line for line in body[start:] if line.strip())
+        return "\n".join(lines) + "\n"
+
+    def write_summary(self) -> str:
+        """
+        Write the summary to the output directory.
+
+        Returns:
+            Path of the summary file
+        """
+        path = os.path.join(self.output_dir, SUMMARY_FILE)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.summary())
+        return path
+
+    def close(self) -> str:
+        """
+        Write the summary and stop tracing allocations if this profiler started it.
+
+        Returns:
+            Path of the summary file
+        """
+        path = self.write_summary()
+        if self._started_tracing:
+            import tracemalloc
+            tracemalloc.stop()
+            self._started_tracing = False
+        return path
@@ -0,0 +1,256 @@
+"""
+Report templates for the presenter agent.
+
+STATIC_FRAGMENTS holds boilerplate that never changes (banners, CSS, footers).
+BLOCK_TEMPLATES holds str.format templates for the per-report and per-page
+blocks; PresenterAgent compiles them once into bound renderers. Every
+fragment is a group of whole lines, and reports join fragments with newlines.
+"""
+
+
+def _lines(*lines: str) -> str:
+    """Join lines into a single fragment."""
+    return "\n".join(lines)
+
+
+_RULE = "=" * 80
+_THIN_RULE = "-" * 80
+
+_SINGLE_CSS = _lines(
+    "    <style>",
+    "        body { font-family: Arial, sans-serif; margin: 20px; line-height: 1.6; }",
+    "        h1 { color: #2c3e50; border-bottom: 3px solid #3498db; }",
+    "        h2 { color: #34495e; margin-top: 30px; border-bottom: 1px solid #bdc3c7; }",
+    "        .info-grid { display: grid; grid-template-columns: 200px 1fr; gap: 10px; }",
+    "        .info-label { font-weight: bold; color: #7f8c8d; }",
+    "        .topic-tag { display: inline-block; background: #3498db; color: white; ",
+    "                     padding: 5px 10px; margin: 5px; border-radius: 3px; }",
+    "        ul { list-style-type: none; padding-left: 0; }",
+    "        li { margin: 10px 0; padding-left: 20px; position: relative; }",
+    "        li:before { content: '▸'; position: absolute; left: 0; color: #3498db; }",
+    "    </style>",
+)
+
+_MULTI_CSS = _lines(
+    "    <style>",
+    "        body { font-family: Arial, sans-serif; margin: 20px; line-height: 1.6; }",
+    "        h1 { color: #2c3e50; border-bottom: 3px solid #3498db; }",
+    "        h2 { color: #34495e; margin-top: 30px; border-bottom: 1px solid #bdc3c7; }",
+    "        .overview { background: #ecf0f1; padding: 15px; border-radius: 5px; margin: 20px 0; }",
+    "        .page-result { border: 1px solid #bdc3c7; padding: 20px; margin: 20px 0; ",
+    "                       border-radius: 5px; background: #fff; }",
+    "        .page-result h3 { color: #2980b9; margin-top: 0; }",
+    "        .info-grid { display: grid; grid-template-columns: 150px 1fr; gap: 10px; margin: 15px 0; }",
+    "        .info-label { font-weight: bold; color: #7f8c8d; }",
+    "        .topic-tag { display: inline-block; background: #3498db; color: white; ",
+    "                     padding: 3px 8px; margin: 3px; border-radius: 3px; font-size: 0.9em; }",
+    "        .relevance-high { color: #27ae60; font-weight: bold; }",
+    "        .relevance-medium { color: #f39c12; font-weight: bold; }",
+    "        .relevance-low { color: #95a5a6; font-weight: bold; }",
+    "        ul { margin: 10px 0; padding-left: 20px; }",
+    "        li { margin: 5px 0; }",
+    "    </style>",
+)
+
+
+STATIC_FRAGMENTS = {
+    'text': {
+        'header': _lines(_RULE, "WEB SCRAPER AGENT - ANALYSIS REPORT", _RULE, "",
+                         "BASIC INFORMATION", _THIN_RULE),
+        'key_points_header': _lines("KEY POINTS", _THIN_RULE),
+        'links_header': _lines("SAMPLE LINKS (Top 5)", _THIN_RULE),
+        'metadata_header': _lines("METADATA", _THIN_RULE),
+        'footer': _lines(_RULE, "END OF REPORT", _RULE),
+        'multi_header': _lines(_RULE, "WEB SCRAPER AGENT - MULTI-PAGE CRAWL REPORT", _RULE, "",
+                               "CRAWL OVERVIEW", _THIN_RULE),
+        'multi_results_header': _lines("", "MATCHING PAGES (Sorted by Relevance)", _RULE, ""),
+        'multi_key_points_header': "Key Points:",
+        'multi_page_footer': "",
+        'multi_footer': _lines(_RULE, "END OF MULTI-PAGE REPORT", _RULE),
+    },
+    'markdown': {
+        'header': _lines("# Web Scraper Agent - Analysis Report", "", "## Basic Information", ""),
+        'key_points_header': _lines("## Key Points", ""),
+        'links_header': _lines("## Sample Links (Top 5)", ""),
+        'metadata_header': _lines("## Metadata", ""),
+        'footer': _lines("---", "*End of Report*"),
+        'multi_header': _lines("# Web Scraper Agent - Multi-Page Crawl Report", "",
+                               "## Crawl Overview", ""),
+        'multi_results_header': _lines("", "## Matching Pages (Sorted by Relevance)", ""),
+        'multi_key_points_header': _lines("**Key Points:**", ""),
+        'multi_page_footer': _lines("---", ""),
+        'multi_footer': "*End of Multi-Page Report*",
+    },
+    'html': {
+        'header': _lines(
+            "<!DOCTYPE html>",
+            "<html>",
+            "<head>",
+            "    <meta charset='UTF-8'>",
+            "    <title>Web Scraper Analysis Report</title>",
+            _SINGLE_CSS,
+            "</head>",
+            "<body>",
+            "    <h1>Web Scraper Agent - Analysis Report</h1>",
+            "    <h2>Basic Information</h2>",
+            "    <div class='info-grid'>",
+        ),
+        'key_points_header': _lines("    <h2>Key Points</h2>", "    <ul>"),
+        'list_footer': "    </ul>",
+        'topics_header': _lines("    <h2>Identified Topics</h2>", "    <div>"),
+        'topics_footer': "    </div>",
+        'footer': _lines("</body>", "</html>"),
+        'multi_header': _lines(
+            "<!DOCTYPE html>",
+            "<html>",
+            "<head>",
+            "    <meta charset='UTF-8'>",
+            "    <title>Web Scraper Multi-Page Crawl Report</title>",
+            _MULTI_CSS,
+            "</head>",
+            "<body>",
+            "    <h1>Web Scraper Agent - Multi-Page Crawl Report</h1>",
+            "    <div class='overview'>",
+            "        <h2>Crawl Overview</h2>",
+            "        <div class='info-grid'>",
+        ),
+        'multi_overview_footer': _lines(
+            "        </div>",
+            "    </div>",
+            "    <h2>Matching Pages (Sorted by Relevance)</h2>",
+        ),
+        'multi_key_points_header': _lines("        <h4>Key Points</h4>", "        <ul>"),
+        'multi_list_footer': "        </ul>",
+        'multi_topics_header': _lines("        <h4>Topics</h4>", "        <div>"),
+        'multi_topics_footer': "        </div>",
+        'multi_page_footer': "    </div>",
+        'multi_footer': _lines("</body>", "</html>"),
+    },
+}
+
+
+# One-field templates for list items; these also get a <name>_list renderer
+LIST_ITEM_TEMPLATES = {'key_point', 'topic', 'multi_key_point', 'multi_topic'}
+
+BLOCK_TEMPLATES = {
+    'text': {
+        'basic': _lines(
+            "URL:           {url}",
+            "Title:         {title}",
+            "Content Type:  {content_type}",
+            "Word Count:    {word_count}",
+            "Importance:    {importance_score:.2f}/1.00",
+            "Analysis Time: {analysis_time}",
+            "",
+            "SUMMARY",
+            _THIN_RULE,
+            "{summary}",
+            "",
+        ),
+        'key_point': "  {point}",
+        'topics': _lines("IDENTIFIED TOPICS", _THIN_RULE, "  {topics}", ""),
+        'structure': _lines(
+            "PAGE STRUCTURE",
+            _THIN_RULE,
+            "  Headings:   {headings}",
+            "  Paragraphs: {paragraphs}",
+            "  Links:      {links}",
+            "  Images:     {images}",
+            "",
+        ),
+        'link': _lines("  {index}. {text}", "     URL: {url}"),
+        'metadata_item': "  {key}: {value}",
+        'multi_overview_field': "{label:<19}{value}",
+        'multi_page': _lines(
+            "[{index}] {title}",
+            _THIN_RULE,
+            "URL:            {url}",
+            "Content Type:   {content_type}",
+            "Word Count:     {word_count}",
+        ),
+        'multi_relevance': "Relevance:      {relevance_score:.2f}/1.00",
+        'multi_importance': _lines("Importance:     {importance_score:.2f}/1.00", ""),
+        'multi_key_point': "  • {point}",
+        'multi_topics': _lines("Topics: {topics}", ""),
+    },
+    'markdown': {
+        'basic': _lines(
+            "- **URL:** {url}",
+            "- **Title:** {title}",
+            "- **Content Type:** {content_type}",
+            "- **Word Count:** {word_count}",
+            "- **Importance Score:** {importance_score:.2f}/1.00",
+            "- **Analysis Time:** {analysis_time}",
+            "",
+            "## Summary",
+            "",
+            "{summary}",
+            "",
+        ),
+        'key_point': "- {point}",
+        'topics': _lines("## Identified Topics", "", "`{topics}`", ""),
+        'structure': _lines(
+            "## Page Structure",
+            "",
+            "- **Headings:** {headings}",
+            "- **Paragraphs:** {paragraphs}",
+            "- **Links:** {links}",
+            "- **Images:** {images}",
+            "",
+        ),
+        'link': "{index}. [{text}]({url})",
+        'metadata_item': "- **{key}:** {value}",
+        'multi_overview_field': "- **{label}** {value}",
+        'multi_page': _lines(
+            "### {index}. {title}",
+            "",
+            "- **URL:** [{url}]({url})",
+            "- **Content Type:** {content_type}",
+            "- **Word Count:** {word_count}",
+        ),
+        'multi_relevance': "- **Relevance Score:** {relevance_score:.2f}/1.00",
+        'multi_importance': _lines("- **Importance Score:** {importance_score:.2f}/1.00", ""),
+        'multi_key_point': "- {point}",
+        'multi_topics': _lines("**Topics:** `{topics}`", ""),
+    },
+    'html': {
+        'basic': _lines(
+            "        <div class='info-label'>URL:</div><div>{url}</div>",
+            "        <div class='info-label'>Title:</div><div>{title}</div>",
+            "        <div class='info-label'>Content Type:</div><div>{content_type}</div>",
+            "        <div class='info-label'>Word Count:</div><div>{word_count}</div>",
+            "        <div class='info-label'>Importance:</div><div>{importance_score:.2f}/1.00</div>",
+            "        <div class='info-label'>Analysis Time:</div>",
+            "        <div>{analysis_time}</div>",
+            "    </div>",
+            "    <h2>Summary</h2>",
+            "    <p>{summary}</p>",
+        ),
+        'key_point': "        <li>{point}</li>",
+        'topic': "        <span class='topic-tag'>{topic}</span>",
+        'multi_overview_field': "            <div class='info-label'>{label}</div><div>{value}</div>",
+        'multi_overview_time': _lines(
+            "            <div class='info-label'>Crawl Time:</div>",
+            "            <div>{value}</div>",
+        ),
+        'multi_page': _lines(
+            "    <div class='page-result'>",
+            "        <h3>{index}. {title}</h3>",
+            "        <div class='info-grid'>",
+            "            <div class='info-label'>URL:</div>",
+            "            <div><a href='{url}' target='_blank'>{url}</a></div>",
+            "            <div class='info-label'>Content Type:</div><div>{content_type}</div>",
+            "            <div class='info-label'>Word Count:</div><div>{word_count}</div>",
+        ),
+        'multi_relevance': _lines(
+            "            <div class='info-label'>Relevance:</div>",
+            "            <div class='{relevance_class}'>{relevance_score:.2f}/1.00</div>",
+        ),
+        'multi_importance': _lines(
+            "            <div class='info-label'>Importance:</div><div>{importance_score:.2f}/1.00</div>",
+            "        </div>",
+        ),
+        'multi_key_point': "            <li>{point}</li>",
+        'multi_topic': "            <span class='topic-tag'>{topic}</span>",
+    },
+}
@@ -0,0 +1,248 @@
+"""
+Fetch resilience - retries with jittered exponential backoff and per-host circuit breakers.
+
+Transient failures (timeouts, dropped connections, 502/503/504 and 429
+responses) are retried after a random delay drawn from an exponentially
+growing window ("full jitter"), so that workers retrying the same host do
+not hit it in lockstep. A host that keeps failing trips its circuit
+breaker: further requests to it fail immediately until a cool-down has
+passed, after which a single probe request decides whether it is back.
+"""
+from typing import Any, Dict, Optional
+import random
+import threading
+import time
+
+import requests
+
+
+# Responses worth retrying: the server is overloaded or a gateway failed
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# Responses that count against a host's circuit breaker. 429 and 503 mean
+# the host is alive but busy; those are handled by backoff instead.
+FAILURE_STATUSES = (500, 502, 504)
+
+# Circuit breaker states
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """A page, or the whole crawl, ran out of time while its body was streaming."""
+
+
+class RetryPolicy:
+    """How often and how long to wait before retrying a failed GET."""
+
+    def __init__(self, max_retries: int = 2, backoff: float = 0.5, max_backoff: float = 10.0,
+                 statuses: tuple = RETRY_STATUSES, seed: Optional[int] = None):
+        """
+        Initialize the policy.
+
+        Args:
+            max_retries: Retries after the first attempt (0 disables retrying)
+            backoff: Upper bound of the first delay in seconds; doubles per retry
+            max_backoff: Longest delay in seconds, including Retry-After waits
+            statuses: HTTP status codes that are retried
+            seed: Optional seed for the jitter, for reproducible runs
+        """
+        self.max_retries = max(0, max_retries)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = tuple(statuses)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def should_retry(self, attempt: int, status: int = 0) -> bool:
+        """
+        Check whether a failed attempt is retried.
+
+        Args:
+            attempt: Number of the failed attempt, starting at 0
+            status: HTTP status code, or 0 for timeouts and connection failures
+
+        Returns:
+            True if another attempt should be made
+        """
+        if attempt >= self.max_retries:
+            return False
+        return status == 0 or status in self.statuses
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Return how long to wait before retrying.
+
+        Args:
+            attempt: Number of the failed attempt, starting at 0
+            retry_after: Seconds the server asked to wait, if it sent Retry-After
+
+        Returns:
+            Seconds to sleep, or None if the server asked for a longer wait
+            than max_backoff (the request should not be retried then)
+        """
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_backoff else None
+        window = min(self.max_backoff, self.backoff * (2 ** attempt))
+        with self._lock:
+            return self._random.uniform(0, window)
+
+
+class _Breaker:
+    """Circuit breaker state of one host."""
+
+    __slots__ = ('state', 'failures', 'opened_at', 'probing', 'trips', 'rejected')
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0           # Consecutive failures
+        self.opened_at = 0.0
+        self.probing = False        # A half-open probe request is in flight
+        self.trips = 0
+        self.rejected = 0
+
+
+class CircuitBreakers:
+    """
+    One circuit breaker per host.
+
+    A breaker opens after `threshold` consecutive failures. While open,
+    allow() refuses requests to the host. After `reset_timeout` seconds
+    one probe request is let through (half-open): success closes the
+    breaker, failure opens it for another `reset_timeout`, and a request
+    without a verdict (release()) lets the next one probe. The class is
+    thread-safe.
+    """
+
+    def __init__(self, threshold: int = 5, reset_timeout: float = 60.0):
+        """
+        Initialize the breakers.
+
+        Args:
+            threshold: Consecutive failures that open a host's breaker (0 disables breaking)
+            reset_timeout: Seconds an open breaker waits before a probe request
+        """
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._hosts: Dict[str, _Breaker] = {}
+        self._lock = threading.Lock()
+
+    def _breaker(self, host: str) -> _Breaker:
+        """Return the breaker of a host, creating it on first use (lock held)."""
+        breaker = self._hosts.get(host)
+        if breaker is None:
+            breaker = _Breaker()
+            self._hosts[host] = breaker
+        return breaker
+
+    def allow(self, host: str) -> bool:
+        """
+        Check whether a request to a host may be made.
+
+        Args:
+            host: Host (netloc)
+
+        Returns:
+            False if the host's breaker is open (or a probe is already in flight)
+        """
+        if self.threshold <= 0:
+            return True
+        with self._lock:
+            breaker = self._breaker(host)
+            if breaker.state == CLOSED:
+                return True
+            if breaker.state == OPEN and time.monotonic() - breaker.opened_at >= self.reset_timeout:
+                breaker.state = HALF_OPEN
+            if breaker.state == HALF_OPEN and not breaker.probing:
+                breaker.probing = True
+                return True
+            breaker.rejected += 1
+            return False
+
+    def is_open(self, host: str) -> bool:
+        """
+        Check whether a host's breaker is open and still cooling down.
+
+        Args:
+            host: Host (netloc)
+
+        Returns:
+            True if requests to the host are currently refused
+        """
+        with self._lock:
+            breaker = self._hosts.get(host)
+            return (breaker is not None and breaker.state == OPEN
+                    and time.monotonic() - breaker.opened_at < self.reset_timeout)
+
+    def record_success(self, host: str):
+        """
+        Record a request that reached a responsive host.
+
+        Args:
+            host: Host (netloc)
+        """
+        with self._lock:
+            breaker = self._breaker(host)
+            breaker.failures = 0
+            breaker.probing = False
+            breaker.state = CLOSED
+
+    def release(self, host: str):
+        """
+        End a request that says nothing about the host's health.
+
+        Requests that fail before reaching the host (an invalid URL, too
+        many redirects, an error while handling the response) must still
+        end a half-open probe, or the host would stay blocked for the rest
+        of the crawl; the next request is then let through as the probe.
+
+        Args:
+            host: Host (netloc)
+        """
+        with self._lock:
+            breaker = self._hosts.get(host)
+            if breaker is not None:
+                breaker.probing = False
+
+    def record_failure(self, host: str) -> bool:
+        """
+        Record a failed request.
+
+        Args:
+            host: Host (netloc)
+
+        Returns:
+            True if this failure opened the host's breaker
+        """
+        if self.threshold <= 0:
+            return False
+        with self._lock:
+            breaker = self._breaker(host)
+            breaker.failures += 1
+            if breaker.state == HALF_OPEN or (breaker.state == CLOSED and breaker.failures >= self.threshold):
+                breaker.state = OPEN
+                breaker.opened_at = time.monotonic()
+                breaker.probing = False
+                breaker.trips += 1
+                return True
+            return False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the state of every breaker that has seen a failure.
+
+        Returns:
+            Dictionary of host -> {'state', 'failures', 'trips', 'rejected'}
+        """
+        with self._lock:
+            return {
+                host: {
+                    'state': breaker.state,
+                    'failures': breaker.failures,
+                    'trips': breaker.trips,
+                    'rejected': breaker.rejected,
+                }
+                for host, breaker in self._hosts.items()
+                if breaker.failures or breaker.trips
+            }
@@ -0,0 +1,261 @@
+"""
+robots.txt support - parsing, compiled path matching and a per-host cache.
+
+Rules follow RFC 9309: the group for the most specific matching user agent
+applies (falling back to '*'), the longest matching rule wins, and Allow
+wins a tie. Rules are compiled once per host: plain prefixes are matched
+with str.startswith and only rules with wildcards become regexes.
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import re
+import threading
+import time
+
+
+# Maximum robots.txt size that is parsed (RFC 9309 requires at least 500 KiB)
+MAX_ROBOTS_BYTES = 500 * 1024
+
+# How long a fetched robots.txt is trusted, in seconds
+DEFAULT_ROBOTS_TTL = 24 * 60 * 60
+
+# How long a failed fetch (5xx or network error) disallows a host before it is retried
+DEFAULT_ROBOTS_FAILURE_TTL = 5 * 60
+
+# Product token matched against robots.txt groups when the User-Agent has none of its own
+ROBOTS_PRODUCT_TOKEN = 'WebScraperAgent'
+
+# RFC 9309 product tokens are letters, underscores and hyphens
+_PRODUCT_TOKEN = re.compile(r'[A-Za-z_-]+')
+
+
+def product_token(user_agent: Optional[str]) -> str:
+    """
+    Derive the robots.txt product token from a User-Agent header value.
+
+    Browser-style strings ("Mozilla/5.0 (...)") name no crawler, so they
+    get ROBOTS_PRODUCT_TOKEN instead of matching groups meant for browsers.
+
+    Args:
+        user_agent: User-Agent header value, e.g. 'MyBot/1.0 (+https://example.com/bot)'
+
+    Returns:
+        Product token, e.g. 'MyBot'
+    """
+    token = (user_agent or '').split('/', 1)[0].strip()
+    if token.lower() == 'mozilla' or not _PRODUCT_TOKEN.fullmatch(token):
+        return ROBOTS_PRODUCT_TOKEN
+    return token
+
+
+class _Rule:
+    """One compiled Allow/Disallow rule."""
+
+    __slots__ = ('allow', 'length', 'prefix', 'regex')
+
+    def __init__(self, pattern: str, allow: bool):
+        self.allow = allow
+        self.length = len(pattern)
+        if '*' in pattern or pattern.endswith('$'):
+            anchored = pattern.endswith('$')
+            body = pattern[:-1] if anchored else pattern
+            regex = '.*'.join(re.escape(part) for part in body.split('*'))
+            self.regex = re.compile(regex + ('$' if anchored else ''))
+            self.prefix = None
+        else:
+            self.regex = None
+            self.prefix = pattern
+
+    def matches(self, path: str) -> bool:
+        """Check whether the rule applies to a path (with query)."""
+        if self.prefix is not None:
+            return path.startswith(self.prefix)
+        return self.regex.match(path) is not None
+
+
+class RobotsPolicy:
+    """The compiled robots.txt rules that apply to one user agent on one host."""
+
+    def __init__(self, rules: List[Tuple[str, bool]] = None, crawl_delay: Optional[float] = None,
+                 sitemaps: List[str] = None):
+        """
+        Compile a policy.
+
+        Args:
+            rules: (path pattern, allow) pairs
+            crawl_delay: Crawl-delay in seconds, if the group sets one
+            sitemaps: Sitemap URLs listed in the file
+        """
+        compiled = [_Rule(pattern, allow) for pattern, allow in rules or [] if pattern]
+        # Longest rule first; Allow before Disallow at equal length
+        compiled.sort(key=lambda rule: (-rule.length, not rule.allow))
+        self._rules = compiled
+        self.crawl_delay = crawl_delay
+        self.sitemaps = sitemaps or []
+
+    @classmethod
+    def allow_all(cls) -> 'RobotsPolicy':
+        """Policy for hosts without a robots.txt."""
+        return cls()
+
+    @classmethod
+    def disallow_all(cls) -> 'RobotsPolicy':
+        """Policy for hosts whose robots.txt could not be fetched."""
+        return cls([('/', False)])
+
+    @classmethod
+    def parse(cls, text: str, user_agent: str) -> 'RobotsPolicy':
+        """
+        Parse a robots.txt file for a user agent.
+
+        Args:
+            text: Contents of robots.txt
+            user_agent: Product token of the crawler (e.g. 'WebScraperAgent')
+
+        Returns:
+            RobotsPolicy object
+        """
+        agent = user_agent.lower()
+        groups: Dict[str, List[Tuple[str, bool]]] = {}
+        delays: Dict[str, float] = {}
+        sitemaps = []
+        current_agents: List[str] = []
+        in_rules = False
+
+        for line in text.splitlines():
+            line = line.split('#', 1)[0].strip()
+            if ':' not in line:
+                continue
+            field, value = line.split(':', 1)
+            field = field.strip().lower()
+            value = value.strip()
+
+            if field == 'user-agent':
+                if in_rules:
+                    current_agents = []
+                    in_rules = False
+                current_agents.append(value.lower())
+            elif field in ('allow', 'disallow'):
+                in_rules = True
+                for name in current_agents:
+                    groups.setdefault(name, []).append((value, field == 'allow'))
+            elif field == 'crawl-delay':
+                in_rules = True
+                try:
+                    delay = float(value)
+                except ValueError:
+                    continue
+                for name in current_agents:
+                    delays[name] = delay
+            elif field == 'sitemap':
+                if value:
+                    sitemaps.append(value)
+
+        # Most specific group: the longest agent name that the token starts with
+        matching = [name for name in groups.keys() | delays.keys()
+                    if name != '*' and agent.startswith(name)]
+        name = max(matching, key=len) if matching else '*'
+        return cls(groups.get(name, []), delays.get(name), sitemaps)
+
+    def allowed(self, path: str) -> bool:
+        """
+        Check whether a path may be fetched.
+
+        Args:
+            path: URL path, including any query string
+
+        Returns:
+            True if the path is allowed
+        """
+        if path == '/robots.txt':
+            return True
+        for rule in self._rules:
+            if rule.matches(path):
+                return rule.allow
+        return True
+
+
+class RobotsCache:
+    """
+    Per-host cache of robots.txt policies.
+
+    Each host's robots.txt is fetched once and then trusted for ttl seconds;
+    a failed fetch disallows the host for failure_ttl seconds only, so a
+    passing outage does not shut it out for a day. The cache is
+    thread-safe; concurrent lookups for a host wait for a single fetch.
+    """
+
+    def __init__(self, user_agent: str, fetch: Callable[[str], Tuple[int, str]],
+                 ttl: float = DEFAULT_ROBOTS_TTL, failure_ttl: float = DEFAULT_ROBOTS_FAILURE_TTL):
+        """
+        Initialize the cache.
+
+        Args:
+            user_agent: Product token of the crawler
+            fetch: Callable taking a robots.txt URL and returning (status code, text);
+                it raises on network errors
+            ttl: Seconds a fetched policy stays valid
+            failure_ttl: Seconds the disallow-all policy of a failed fetch stays valid
+        """
+        self.user_agent = user_agent
+        self.fetch = fetch
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self._policies: Dict[str, Tuple[float, RobotsPolicy]] = {}  # origin -> (expiry, policy)
+        self._locks: Dict[str, threading.Lock] = {}
+
+    def policy(self, url: str) -> RobotsPolicy:
+        """
+        Return the policy for the host of a URL, fetching robots.txt if needed.
+
+        A missing robots.txt (4xx) allows everything; a server error or
+        unreachable host disallows everything, as RFC 9309 requires.
+
+        Args:
+            url: Any URL on the host
+
+        Returns:
+            RobotsPolicy object
+        """
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        cached = self._policies.get(origin)
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
+
+        with self._locks.setdefault(origin, threading.Lock()):
+            cached = self._policies.get(origin)
+            now = time.monotonic()
+            if cached and now < cached[0]:
+                return cached[1]
+            policy, ttl = self._fetch_policy(origin)
+            self._policies[origin] = (now + ttl, policy)
+            return policy
+
+    def _fetch_policy(self, origin: str) -> Tuple[RobotsPolicy, float]:
+        """Fetch and compile the robots.txt of an origin; return it with its TTL."""
+        try:
+            status, text = self.fetch(origin + '/robots.txt')
+        except Exception:
+            return RobotsPolicy.disallow_all(), self.failure_ttl
+        if 200 <= status < 300:
+            return RobotsPolicy.parse(text[:MAX_ROBOTS_BYTES], self.user_agent), self.ttl
+        if 400 <= status < 500:
+            return RobotsPolicy.allow_all(), self.ttl
+        return RobotsPolicy.disallow_all(), self.failure_ttl
+
+    def allowed(self, url: str) -> bool:
+        """
+        Check whether a URL may be fetched.
+
+        Args:
+            url: Absolute URL
+
+        Returns:
+            True if robots.txt allows the URL
+        """
+        parsed = urlparse(url)
+        path = parsed.path or '/'
+        if parsed.query:
+            path += '?' + parsed.query
+        return self.policy(url).allowed(path)
@@ -1,14 +1,75 @@
 """
 Web Scraper Agent - responsible for fetching and extracting web content.
 """
-from typing import Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from http.cookiejar import DefaultCookiePolicy
+from typing import TYPE_CHECKING, Optional, Tuple
+import fnmatch
+import hashlib
+import os
+import re
 import requests
+import requests.adapters
+import threading
 import time
-from bs4 import BeautifulSoup
+import urllib3
 from urllib.parse import urljoin, urlparse
 
 from .base_agent import BaseAgent
-from .models import WebPage, ExtractedData
+from .concurrency import AIMDController, parse_retry_after
+from .content_coding import accept_encoding_header, make_decoder
+from .content_density import content_elements, content_text, find_main_content, outermost
+from .crawl_state import CrawlStateStore, fingerprint
+from .dns_cache import DEFAULT_DNS_TTL, DNSCache, DNSCachingAdapter, warm_connection
+from .encoding import detect_encoding
+from .frontier import HostFrontier
+from .models import WebPage, ExtractedData, Heading, Link, Image, PageState
+from .profiling import PageProfiler, profiled
+from .resilience import FAILURE_STATUSES, RETRY_STATUSES, CircuitBreakers, DeadlineExceeded, RetryPolicy
+from .robots import DEFAULT_ROBOTS_FAILURE_TTL, DEFAULT_ROBOTS_TTL, MAX_ROBOTS_BYTES, RobotsCache, product_token
+from .sitemaps import MAX_SITEMAP_URLS, read_sitemaps
+from .structured_data import MAX_JSON_LD_SIZE, extract_structured_data
+
+if TYPE_CHECKING:
+    # bs4 is imported on the first parse, so pages that are never parsed don't pay for it
+    from bs4 import BeautifulSoup
+    from .partition import CrawlPartition
+
+
+# Reason recorded for pages cut off when a crawl's time budget runs out
+BUDGET_EXHAUSTED = "Crawl time budget exhausted"
+
+# ExtractedData fields that a field selection can name
+EXTRACTABLE_FIELDS = ('title', 'headings', 'paragraphs', 'links', 'images', 'metadata',
+                      'structured_data', 'main_content')
+
+# Links and images kept per page
+MAX_LINKS = 50
+MAX_IMAGES = 20
+
+# Fields a crawl requirement is matched against
+MATCH_FIELDS = ('title', 'headings', 'paragraphs', 'main_content')
+
+
+def select_fields(fields) -> Optional[frozenset]:
+    """
+    Validate a selection of ExtractedData fields.
+
+    Args:
+        fields: Iterable of field names, or None for all fields
+
+    Returns:
+        Frozenset of field names, or None for all fields
+    """
+    if fields is None:
+        return None
+    selected = frozenset(fields)
+    unknown = selected.difference(EXTRACTABLE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown ExtractedData fields: {', '.join(sorted(unknown))} "
+                         f"(expected some of {', '.join(EXTRACTABLE_FIELDS)})")
+    return selected
 
 
 class WebScraperAgent(BaseAgent):
@@ -18,212 +79,1084 @@ class WebScraperAgent(BaseAgent):
         """Initialize the web scraper agent."""
         super().__init__("WebScraperAgent", config)
         self.timeout = self.config.get('timeout', 30)
+        # Seconds to establish a connection and to wait for each read; 'timeout' sets both
+        self.connect_timeout = self.config.get('connect_timeout', self.timeout)
+        self.read_timeout = self.config.get('read_timeout', self.timeout)
+        # Total seconds one page may take, retries and body streaming included (None = no limit)
+        self.page_timeout = self.config.get('page_timeout', 60)
+        # Wall-clock seconds a crawl may run before it stops with partial results (None = no limit)
+        self.time_budget = self.config.get('time_budget')
+        self._crawl_deadline: Optional[float] = None
         self.user_agent = self.config.get(
             'user_agent',
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         )
         self.max_depth = self.config.get('max_depth', 2)
         self.max_pages = self.config.get('max_pages', 50)
+        self.crawl_delay = self.config.get('crawl_delay', 0.5)  # Seconds between crawl requests
         self.visited_urls = set()
         self.base_domain = None
 
-    def execute(self, url: str) -> ExtractedData:
+        # Download limits
+        self.max_response_bytes = self.config.get('max_response_bytes', 5 * 1024 * 1024)
+        self.oversize_policy = self.config.get('oversize_policy', 'truncate')  # truncate, skip
+        self.allowed_content_types = tuple(self.config.get(
+            'allowed_content_types', ('text/html', 'application/xhtml+xml')
+        ))
+        self.chunk_size = self.config.get('chunk_size', 64 * 1024)
+        self.html_parser = self.config.get('html_parser', 'html.parser')  # html.parser, lxml
+        # How main content is found without <main>/<article>: 'density' or the whole 'body'
+        self.content_extraction = self.config.get('content_extraction', 'density')
+        self.max_json_ld_size = self.config.get('max_json_ld_size', MAX_JSON_LD_SIZE)  # Characters per page
+        # ExtractedData fields callers need; the rest are left empty (None extracts all)
+        self.extract_fields = select_fields(self.config.get('extract_fields'))
+        self.skipped_pages = {}  # URL -> reason the body was not downloaded
+        self.accept_encoding = self.config.get('accept_encoding', accept_encoding_header())
+        self.crawl_stats = self._new_crawl_stats()
+        self._stats_lock = threading.Lock()
+
+        # Multi-host crawling: hosts other than the seeds' must match allowed_hosts
+        # (shell-style patterns such as '*.example.com'); each host gets its own queue
+        patterns = self.config.get('allowed_hosts', [])
+        self.allowed_hosts = re.compile('|'.join(fnmatch.translate(p.lower()) for p in patterns)) if patterns else None
+        self.seed_urls = list(self.config.get('seed_urls', []))
+        self.host_weights = dict(self.config.get('host_weights', {}))  # host -> scheduling weight
+        self.max_workers = self.config.get('max_workers', 8)
+        self.max_connections_per_host = self.config.get('max_connections_per_host', 1)
+        self._seed_hosts = set()
+
+        # Requests in flight per host: fixed at max_connections_per_host, or adapted
+        # between 1 and that ceiling from latency, 429/503 responses and timeouts
+        self.adaptive_concurrency = self.config.get('adaptive_concurrency', False)
+        self.concurrency = self._new_concurrency_controller()
+
+        # Transient failures are retried with jittered exponential backoff; a host
+        # that keeps failing trips its circuit breaker and is skipped until it cools down
+        self.retry_policy = RetryPolicy(
+            max_retries=self.config.get('max_retries', 2),
+            backoff=self.config.get('retry_backoff', 0.5),
+            max_backoff=self.config.get('retry_backoff_max', 10.0),
+            statuses=tuple(self.config.get('retry_statuses', RETRY_STATUSES))
+        )
+        self.breakers = self._new_circuit_breakers()
+
+        # Host names are resolved once per dns_ttl seconds rather than for every new
+        # connection; dns_resolver replaces the system resolver (e.g. for offline tests)
+        dns_ttl = self.config.get('dns_ttl', DEFAULT_DNS_TTL)
+        self.dns_cache = DNSCache(dns_ttl, resolver=self.config.get('dns_resolver')) if dns_ttl else None
+        # Resolve, or also connect to, hosts in the background as they join the crawl frontier
+        self.prefetch_dns = self.config.get('prefetch_dns', False)
+        self.warm_connections = self.config.get('warm_connections', False)
+
+        # One session for connection reuse; cookies are not kept between pages
+        self.session = requests.Session()
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        pool_options = {'pool_connections': 32, 'pool_maxsize': self.max_connections_per_host}
+        if self.dns_cache is not None:
+            self.adapter = DNSCachingAdapter(self.dns_cache, **pool_options)
+        else:
+            self.adapter = requests.adapters.HTTPAdapter(**pool_options)
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+
+        # robots.txt is fetched once per host and cached; sitemaps optionally seed the frontier
+        self.robots = None
+        if self.config.get('respect_robots', True):
+            self.robots = RobotsCache(
+                self.config.get('robots_user_agent', product_token(self.user_agent)),
+                self._fetch_robots,
+                ttl=self.config.get('robots_ttl', DEFAULT_ROBOTS_TTL),
+                failure_ttl=self.config.get('robots_failure_ttl', DEFAULT_ROBOTS_FAILURE_TTL)
+            )
+        self.use_sitemaps = self.config.get('use_sitemaps', False)
+        self.sitemap_urls = list(self.config.get('sitemap_urls', []))
+        self.max_sitemap_urls = self.config.get('max_sitemap_urls', MAX_SITEMAP_URLS)
+
+        # Incremental crawls: pages found unchanged in the state store are not re-extracted
+        self.state_store: Optional[CrawlStateStore] = None
+        self.page_changes = {}  # URL -> 'new', 'changed' or 'unchanged'
+
+        # Optional on-disk spool of raw page bodies for debugging, capped in size
+        self.raw_spool_dir = self.config.get('raw_spool_dir')
+        self.raw_spool_max_bytes = self.config.get('raw_spool_max_bytes', 256 * 1024)  # Per page
+        self.raw_spool_total_bytes = self.config.get('raw_spool_total_bytes', 64 * 1024 * 1024)
+        self._spooled_bytes = 0
+
+        # Partitioned crawls: this agent only fetches the hosts its CrawlPartition owns and
+        # forwards links to other hosts to their nodes (set by partition.crawl_node)
+        self.partition: Optional['CrawlPartition'] = None
+
+        # Optional per-page profiling of extraction (set by the orchestrator)
+        self.profiler: Optional[PageProfiler] = None
+
+    def execute(self, url: str, fields=None) -> ExtractedData:
         """
         Fetch and extract data from a web page.
 
         Args:
             url: The URL to scrape
+            fields: ExtractedData fields to extract, such as ('title', 'links');
+                the others are left empty (default: the extract_fields setting)
 
         Returns:
             ExtractedData object containing structured data
         """
         self.log_info(f"Starting to scrape: {url}")
 
-        # Fetch the page
-        web_page = self._fetch_page(url)
+        fields = self.extract_fields if fields is None else select_fields(fields)
+        previous = self.state_store.get(url) if self.state_store is not None else None
+
+        # Fetch the page; without validators if the stored extraction lacks fields now needed,
+        # since a 304 would leave nothing to extract them from
+        reusable = previous is not None and self._has_fields(previous.extracted_data, fields)
+        web_page = self._fetch_page(url, previous if reusable else None)
 
         if web_page.error:
-            self.log_error(f"Failed to fetch page: {web_page.error}")
-            return ExtractedData(url=url, title="Error fetching page")
+            if url not in self.skipped_pages:
+                self.log_error(f"Failed to fetch page: {web_page.error}")
+            return ExtractedData(url=url, title="Error fetching page", fetch_error=web_page.error)
+
+        # Extract data from the page, then drop the raw body so only the
+        # compact ExtractedData outlives this call
+        try:
+            if self.state_store is not None:
+                unchanged = self._reuse_unchanged(web_page, previous, fields)
+                if unchanged is not None:
+                    return unchanged
+            self._spool_raw_body(web_page)
+            with profiled(self.profiler, 'extract', url):
+                extracted_data = self._extract_data(web_page, fields)
+            extracted_data.truncated = web_page.truncated
+            if self.state_store is not None:
+                self._store_page_state(web_page, extracted_data)
+        finally:
+            web_page.content = ""
+            web_page.body = b""
+            del web_page
 
-        # Extract data from the page
-        extracted_data = self._extract_data(web_page)
+        if extracted_data.truncated:
+            self.log_info(f"Page truncated at {self.max_response_bytes} bytes: {url}")
 
         self.log_info(f"Successfully extracted data from: {url}")
         return extracted_data
 
-    def _fetch_page(self, url: str) -> WebPage:
+    def _fetch_page(self, url: str, previous: Optional[PageState] = None) -> WebPage:
         """
-        Fetch a web page.
+        Fetch a web page, retrying transient failures.
+
+        Timeouts, dropped connections and retryable statuses (429 and
+        502-504 by default) are retried up to max_retries times after a
+        jittered exponential backoff, or after the server's Retry-After.
+        Requests to a host whose circuit breaker is open fail immediately.
+        The page must be complete within page_timeout seconds (and before
+        the crawl's time budget runs out); no retry starts after that.
 
         Args:
             url: The URL to fetch
+            previous: State of the page from an earlier crawl, if any
 
         Returns:
             WebPage object
         """
-        web_page = WebPage(url=url)
+        host = urlparse(url).netloc
+        deadline = self._page_deadline()
+        attempt = 0
+        while True:
+            web_page = WebPage(url=url)
+            if not self.breakers.allow(host):
+                web_page.error = f"Circuit breaker open for {host}"
+                self.skipped_pages[url] = web_page.error
+                self._count('circuit_rejected')
+                self.log_info(f"Skipped {url}: {web_page.error}")
+                return web_page
+
+            try:
+                connection_failed = self._fetch_once(url, previous, web_page, deadline)
+            except BaseException:
+                self.breakers.release(host)
+                raise
+            self._count('wire_bytes', web_page.wire_bytes)
+            if connection_failed or web_page.status_code in FAILURE_STATUSES:
+                if self.breakers.record_failure(host):
+                    self.log_error(f"Circuit breaker opened for {host}")
+            elif web_page.status_code:
+                self.breakers.record_success(host)
+            else:
+                # Failed without reaching the host (e.g. an invalid URL): no verdict on it
+                self.breakers.release(host)
+
+            if web_page.error is None or not (connection_failed or web_page.status_code >= 400):
+                break
+            status = 0 if connection_failed else web_page.status_code
+            if not self.retry_policy.should_retry(attempt, status):
+                break
+            headers = {name.lower(): value for name, value in web_page.headers.items()}
+            delay = self.retry_policy.delay(attempt, parse_retry_after(headers.get('retry-after')))
+            if delay is None or (deadline is not None and time.monotonic() + delay >= deadline):
+                break
+            attempt += 1
+            self._count('retries')
+            self.log_info(f"Retrying {url} in {delay:.2f}s "
+                          f"(attempt {attempt + 1}/{self.retry_policy.max_retries + 1}): {web_page.error}")
+            time.sleep(delay)
+
+        if web_page.error and self._budget_exhausted():
+            self.skipped_pages[url] = BUDGET_EXHAUSTED
+        if web_page.error and url not in self.skipped_pages:
+            self.log_error(f"Error fetching {url}: {web_page.error}")
+        self._count('pages_fetched')
+        self._count('decoded_bytes', web_page.bytes_read)
+        return web_page
+
+    def _page_deadline(self) -> Optional[float]:
+        """Return the time.monotonic() value by which a page fetched now must be complete."""
+        deadlines = [d for d in (self._crawl_deadline,) if d is not None]
+        if self.page_timeout:
+            deadlines.append(time.monotonic() + self.page_timeout)
+        return min(deadlines) if deadlines else None
+
+    def _fetch_once(self, url: str, previous: Optional[PageState], web_page: WebPage,
+                    deadline: Optional[float] = None) -> bool:
+        """
+        Make one attempt at fetching a web page.
+
+        The body is streamed so that non-HTML responses are rejected from
+        their headers alone and no more than max_response_bytes are read.
+        When the page was stored by an earlier crawl, its validators are
+        sent so the server can answer 304 Not Modified without a body.
+
+        Args:
+            url: The URL to fetch
+            previous: State of the page from an earlier crawl, if any
+            web_page: WebPage to fill in
+            deadline: time.monotonic() value by which the body must be read
 
+        Returns:
+            True if no complete response arrived (timeout or connection failure)
+        """
+        host = urlparse(url).netloc
+        read_timeout = self.read_timeout
+        if deadline is not None:
+            read_timeout = max(0.001, min(read_timeout, deadline - time.monotonic()))
         try:
-            headers = {'User-Agent': self.user_agent}
-            response = requests.get(url, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
+            headers = {'User-Agent': self.user_agent, 'Accept-Encoding': self.accept_encoding}
+            if previous is not None:
+                if previous.etag:
+                    headers['If-None-Match'] = previous.etag
+                if previous.last_modified:
+                    headers['If-Modified-Since'] = previous.last_modified
+            with self.session.get(url, headers=headers, timeout=(self.connect_timeout, read_timeout),
+                                  stream=True) as response:
+                web_page.headers = dict(response.headers)
+                web_page.status_code = response.status_code
+                self.concurrency.record(host, response.status_code, response.elapsed.total_seconds(),
+                                        response.headers.get('Retry-After'))
+                response.raise_for_status()
+
+                skip_reason = None
+                if response.status_code != 304:
+                    skip_reason = self._check_response_headers(response)
+                if not skip_reason and response.status_code != 304:
+                    skip_reason = self._read_body(response, web_page, deadline)
 
-            web_page.content = response.text
-            web_page.headers = dict(response.headers)
-            web_page.status_code = response.status_code
+                if skip_reason:
+                    web_page.error = skip_reason
+                    self.skipped_pages[url] = skip_reason
+                    self.log_info(f"Skipped {url}: {skip_reason}")
 
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError,
+                urllib3.exceptions.HTTPError) as e:
+            # Timeouts and dropped connections, including those raised while streaming the body
+            self.concurrency.record(host, failed=True)
+            web_page.error = str(e)
+            return True
         except requests.exceptions.RequestException as e:
             web_page.error = str(e)
-            self.log_error(f"Error fetching {url}: {e}")
+        return False
 
-        return web_page
+    @staticmethod
+    def _new_crawl_stats() -> dict:
+        """Return zeroed crawl counters."""
+        return {'pages_fetched': 0, 'wire_bytes': 0, 'decoded_bytes': 0, 'pages_unchanged': 0,
+                'robots_disallowed': 0, 'sitemap_urls': 0, 'retries': 0, 'circuit_rejected': 0,
+                'budget_exhausted': False, 'hosts_warmed': 0, 'pages_per_host': {}}
+
+    def _new_concurrency_controller(self) -> AIMDController:
+        """Return a fresh per-host concurrency controller."""
+        return AIMDController(
+            self.max_connections_per_host,
+            adaptive=self.adaptive_concurrency,
+            decrease_factor=self.config.get('concurrency_decrease_factor', 0.5),
+            latency_factor=self.config.get('concurrency_latency_factor', 3.0),
+            max_retry_after=self.config.get('max_retry_after', 120.0)
+        )
 
-    def _extract_data(self, web_page: WebPage) -> ExtractedData:
+    def _new_circuit_breakers(self) -> CircuitBreakers:
+        """Return fresh per-host circuit breakers."""
+        return CircuitBreakers(
+            threshold=self.config.get('circuit_breaker_threshold', 5),
+            reset_timeout=self.config.get('circuit_breaker_reset', 60.0)
+        )
+
+    def _count(self, key: str, amount: int = 1):
+        """Add to a crawl counter; safe to call from crawl worker threads."""
+        with self._stats_lock:
+            self.crawl_stats[key] += amount
+
+    @staticmethod
+    def _validators(web_page: WebPage) -> tuple:
+        """Return the (ETag, Last-Modified) headers of a response."""
+        headers = {name.lower(): value for name, value in web_page.headers.items()}
+        return headers.get('etag'), headers.get('last-modified')
+
+    @staticmethod
+    def _fingerprint(web_page: WebPage) -> str:
+        """Fingerprint the downloaded body of a page."""
+        return fingerprint(web_page.body or web_page.content.encode('utf-8'))
+
+    def _reuse_unchanged(self, web_page: WebPage, previous: Optional[PageState],
+                         fields: Optional[frozenset] = None) -> Optional[ExtractedData]:
+        """
+        Return the stored extraction of a page that has not changed since the last crawl.
+
+        A page is unchanged when the server answered 304 Not Modified or
+        the body has the same fingerprint as before. A stored extraction
+        that lacks some of the requested fields is not reused.
+
+        Args:
+            web_page: Freshly fetched WebPage
+            previous: State of the page from an earlier crawl, if any
+            fields: ExtractedData fields needed, or None for all
+
+        Returns:
+            Stored ExtractedData, or None if the page is new or has changed
+        """
+        url = web_page.url
+        if previous is None or previous.extracted_data is None:
+            self.page_changes[url] = 'new'
+            return None
+        if web_page.status_code != 304 and self._fingerprint(web_page) != previous.fingerprint:
+            self.page_changes[url] = 'changed'
+            return None
+        if not self._has_fields(previous.extracted_data, fields):
+            # Extracted with fewer fields than now needed: extract and analyze it again
+            self.page_changes[url] = 'changed'
+            return None
+
+        self.page_changes[url] = 'unchanged'
+        self._count('pages_unchanged')
+        self.state_store.update_validators(url, *self._validators(web_page))
+        self.log_info(f"Unchanged since last crawl: {url}")
+        return previous.extracted_data
+
+    @staticmethod
+    def _has_fields(data: Optional[ExtractedData], fields: Optional[frozenset]) -> bool:
+        """Check whether extracted data has all the given fields (None: all fields)."""
+        if data is None or data.extracted_fields is None:
+            return data is not None
+        return fields is not None and fields.issubset(data.extracted_fields)
+
+    def _store_page_state(self, web_page: WebPage, extracted_data: ExtractedData):
+        """
+        Record a new or changed page in the state store.
+
+        Args:
+            web_page: WebPage whose body is still loaded
+            extracted_data: Data extracted from the page
+        """
+        etag, last_modified = self._validators(web_page)
+        self.state_store.put(PageState(
+            url=web_page.url,
+            fingerprint=self._fingerprint(web_page),
+            etag=etag,
+            last_modified=last_modified,
+            extracted_data=extracted_data
+        ))
+
+    def _check_response_headers(self, response: requests.Response) -> Optional[str]:
+        """
+        Decide from the response headers whether the body is worth downloading.
+
+        Args:
+            response: Streamed response whose body has not been read yet
+
+        Returns:
+            Reason for skipping the body, or None to download it
+        """
+        content_type = response.headers.get('Content-Type', '')
+        media_type = content_type.split(';', 1)[0].strip().lower()
+        if media_type and self.allowed_content_types and media_type not in self.allowed_content_types:
+            return f"Unsupported content type: {media_type}"
+
+        if self.oversize_policy == 'skip':
+            try:
+                content_length = int(response.headers.get('Content-Length', 0))
+            except ValueError:
+                content_length = 0
+            if content_length > self.max_response_bytes:
+                return f"Response too large: {content_length} bytes"
+
+        return None
+
+    def _read_body(self, response: requests.Response, web_page: WebPage,
+                   deadline: Optional[float] = None) -> Optional[str]:
+        """
+        Stream the response body into the web page, up to the byte cap.
+
+        Compressed bodies are decoded chunk by chunk as they arrive, and the
+        cap applies to the decoded bytes. The result is kept as bytes with its
+        detected encoding, so it is decoded to text once, by the parser.
+
+        Args:
+            response: Streamed response
+            web_page: WebPage to fill in
+            deadline: time.monotonic() value by which the body must be read
+
+        Returns:
+            Reason for skipping the page if it is oversized under the skip policy, else None
+
+        Raises:
+            DeadlineExceeded: If the body is still arriving at the deadline
+        """
+        chunks = []
+
+        def append(chunk: bytes) -> bool:
+            """Keep decoded bytes up to the cap; return False once it is reached."""
+            remaining = self.max_response_bytes - web_page.bytes_read
+            if len(chunk) > remaining:
+                web_page.truncated = True
+                chunk = chunk[:remaining]
+            web_page.bytes_read += len(chunk)
+            chunks.append(chunk)
+            return not web_page.truncated
+
+        try:
+            decoder = make_decoder(response.headers.get('Content-Encoding'))
+            for wire_chunk in self._iter_wire_chunks(response, deadline):
+                web_page.wire_bytes += len(wire_chunk)
+                if decoder:
+                    # Never inflate more than one byte past the cap
+                    limit = self.max_response_bytes - web_page.bytes_read + 1
+                    wire_chunk = decoder.decompress(wire_chunk, limit)
+                if not append(wire_chunk):
+                    break
+            else:
+                if decoder:
+                    append(decoder.flush())
+        except ValueError as e:
+            return str(e)
+
+        if web_page.truncated and self.oversize_policy == 'skip':
+            return f"Response too large: over {self.max_response_bytes} bytes"
+
+        self.log_debug(f"Downloaded {web_page.url}: {web_page.wire_bytes} bytes on the wire, "
+                       f"{web_page.bytes_read} bytes decoded")
+
+        body = b''.join(chunks)
+        encoding, source = detect_encoding(response.headers.get('Content-Type'), body)
+        self.log_debug(f"Encoding for {web_page.url}: {encoding} (from {source})")
+
+        if encoding:
+            web_page.body = body
+            web_page.encoding = encoding
+        else:
+            try:
+                web_page.content = body.decode('utf-8')
+            except UnicodeDecodeError:
+                web_page.content = body.decode('cp1252', errors='replace')
+        return None
+
+    def _iter_wire_chunks(self, response: requests.Response, deadline: Optional[float]):
+        """
+        Yield the undecoded body of a response as it arrives, until a deadline.
+
+        Each chunk is what a single socket read returned (read1), so a server
+        dripping bytes cannot keep one read blocked past the deadline; at
+        worst the deadline is overshot by one read timeout.
+
+        Args:
+            response: Streamed response
+            deadline: time.monotonic() value by which the body must be read
+
+        Yields:
+            Body bytes as sent on the wire
+        """
+        read1 = getattr(response.raw, 'read1', None)
+        if read1 is None:
+            # urllib3 1.x has no read1; fall back to blocking chunk reads
+            chunks = response.raw.stream(self.chunk_size, decode_content=False)
+        else:
+            chunks = iter(lambda: read1(self.chunk_size, decode_content=False) or b'', b'')
+        for chunk in chunks:
+            if deadline is not None and time.monotonic() > deadline:
+                raise DeadlineExceeded("Deadline exceeded while reading the response body")
+            yield chunk
+
+    def _spool_raw_body(self, web_page: WebPage):
+        """
+        Write a capped copy of the raw page body to the spool directory, if enabled.
+
+        Args:
+            web_page: WebPage object containing HTML
+        """
+        if not self.raw_spool_dir or self._spooled_bytes >= self.raw_spool_total_bytes:
+            return
+
+        if web_page.body:
+            body = web_page.body[:self.raw_spool_max_bytes]
+        else:
+            body = web_page.content[:self.raw_spool_max_bytes].encode('utf-8')[:self.raw_spool_max_bytes]
+        file_name = hashlib.sha1(web_page.url.encode('utf-8')).hexdigest() + '.html'
+        try:
+            os.makedirs(self.raw_spool_dir, exist_ok=True)
+            with open(os.path.join(self.raw_spool_dir, file_name), 'wb') as f:
+                f.write(body)
+            self._spooled_bytes += len(body)
+        except OSError as e:
+            self.log_error(f"Failed to spool raw body for {web_page.url}: {e}")
+
+    def _extract_data(self, web_page: WebPage, fields: Optional[frozenset] = None) -> ExtractedData:
         """
         Extract structured data from HTML content.
 
+        The parse tree is decomposed as soon as extraction finishes so that
+        it does not linger until the garbage collector finds it.
+
         Args:
             web_page: WebPage object containing HTML
+            fields: ExtractedData fields to extract, or None for all
+
+        Returns:
+            ExtractedData object
+        """
+        soup = self._parse(web_page)
+        try:
+            return self._extract_from_soup(soup, web_page.url, fields)
+        finally:
+            soup.decompose()
+
+    def _parse(self, web_page: WebPage) -> 'BeautifulSoup':
+        """
+        Parse a page's body or content into a BeautifulSoup tree.
+
+        Undecoded bodies go straight to parsers that decode natively (lxml);
+        otherwise they are decoded once with the detected encoding, so the
+        parser never falls back to whole-document encoding detection.
+
+        Args:
+            web_page: WebPage object containing HTML
+
+        Returns:
+            BeautifulSoup object
+        """
+        from bs4 import BeautifulSoup
+
+        if not web_page.body:
+            return BeautifulSoup(web_page.content, self.html_parser)
+        if self.html_parser in ('lxml', 'lxml-xml', 'xml'):
+            return BeautifulSoup(web_page.body, self.html_parser, from_encoding=web_page.encoding)
+        markup = web_page.body.decode(web_page.encoding, errors='replace')
+        return BeautifulSoup(markup, self.html_parser)
+
+    def _extract_from_soup(self, soup: 'BeautifulSoup', url: str,
+                           fields: Optional[frozenset] = None) -> ExtractedData:
+        """
+        Extract structured data from a parsed page.
+
+        Only plain strings are copied out of the tree, so the returned
+        ExtractedData holds no references back into the soup. With density
+        extraction, paragraphs are taken from the main content only, so
+        navigation, sidebars and footers are not analyzed. Fields that were
+        not selected are not extracted and keep their empty defaults.
+
+        Args:
+            soup: BeautifulSoup object
+            url: URL of the page, used to resolve relative links
+            fields: ExtractedData fields to extract, or None for all
 
         Returns:
             ExtractedData object
         """
-        soup = BeautifulSoup(web_page.content, 'html.parser')
+        def wanted(name: str) -> bool:
+            return fields is None or name in fields
+
+        data = ExtractedData(url=url, title="",
+                             extracted_fields=tuple(sorted(fields)) if fields is not None else None)
 
         # Extract title
-        title = ""
-        if soup.title:
-            title = soup.title.string.strip() if soup.title.string else ""
+        if wanted('title') and soup.title:
+            data.title = soup.title.string.strip() if soup.title.string else ""
 
         # Extract headings
-        headings = []
-        for tag in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-            for heading in soup.find_all(tag):
-                text = heading.get_text(strip=True)
-                if text:
-                    headings.append(f"{tag.upper()}: {text}")
+        if wanted('headings'):
+            for level in range(1, 7):
+                for heading in soup.find_all(f"h{level}"):
+                    text = heading.get_text(strip=True)
+                    if text:
+                        data.headings.append(Heading(level, text))
+
+        # Find the main content first; paragraphs come from it
+        content_roots = None
+        if wanted('paragraphs') or wanted('main_content'):
+            content_roots = self._find_content_roots(soup)
 
         # Extract paragraphs
-        paragraphs = []
-        for p in soup.find_all('p'):
-            text = p.get_text(strip=True)
-            if text and len(text) > 20:  # Filter out very short paragraphs
-                paragraphs.append(text)
-
-        # Extract links
-        links = []
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            text = link.get_text(strip=True)
-            # Convert relative URLs to absolute
-            absolute_url = urljoin(web_page.url, href)
-            links.append({'url': absolute_url, 'text': text})
-
-        # Extract images
-        images = []
-        for img in soup.find_all('img'):
-            src = img.get('src', '')
-            alt = img.get('alt', '')
-            if src:
-                absolute_url = urljoin(web_page.url, src)
-                images.append({'url': absolute_url, 'alt': alt})
-
-        # Extract metadata
-        metadata = {}
-        for meta in soup.find_all('meta'):
-            name = meta.get('name') or meta.get('property', '')
-            content = meta.get('content', '')
-            if name and content:
-                metadata[name] = content
+        if wanted('paragraphs'):
+            for p in self._content_paragraphs(soup, content_roots):
+                text = p.get_text(strip=True)
+                if text and len(text) > 20:  # Filter out very short paragraphs
+                    data.paragraphs.append(text)
+
+        # Extract links (the first 50)
+        if wanted('links'):
+            for link in soup.find_all('a', href=True, limit=MAX_LINKS):
+                href = link['href']
+                text = link.get_text(strip=True)
+                # Convert relative URLs to absolute
+                absolute_url = urljoin(url, href)
+                data.links.append(Link(absolute_url, text))
+
+        # Extract images (the first 20 with a source)
+        if wanted('images'):
+            for img in soup.find_all('img'):
+                src = img.get('src', '')
+                alt = img.get('alt', '')
+                if src:
+                    absolute_url = urljoin(url, src)
+                    data.images.append(Image(absolute_url, alt))
+                    if len(data.images) >= MAX_IMAGES:
+                        break
+
+        # Extract metadata, JSON-LD, OpenGraph and microdata in one pass
+        if wanted('metadata') or wanted('structured_data'):
+            metadata, structured_data = extract_structured_data(soup, url, self.max_json_ld_size)
+            if wanted('metadata'):
+                data.metadata = metadata
+            if wanted('structured_data'):
+                data.structured_data = structured_data
 
         # Extract main content (attempt to get the most relevant text)
-        main_content = self._extract_main_content(soup)
+        if wanted('main_content'):
+            data.main_content = self._extract_main_content(soup, content_roots)
 
-        return ExtractedData(
-            url=web_page.url,
-            title=title,
-            headings=headings,
-            paragraphs=paragraphs,
-            links=links[:50],  # Limit to first 50 links
-            images=images[:20],  # Limit to first 20 images
-            metadata=metadata,
-            main_content=main_content
-        )
+        return data
 
-    def execute_crawl(self, start_url: str, requirement: Optional[str] = None) -> list:
+    def execute_crawl(self, start_url: str, requirement: Optional[str] = None,
+                      time_budget: Optional[float] = None) -> list:
         """
         Crawl website starting from start_url and optionally filter by requirement.
 
+        Pages are fetched breadth-first by a pool of worker threads. Every
+        host has its own queue; hosts take turns (weighted by host_weights),
+        each with at most max_connections_per_host fetches in flight and
+        crawl_delay seconds between fetches. URLs disallowed by robots.txt
+        are skipped, and when sitemaps are enabled their pages are queued
+        one hop from the start URL, most recently modified first.
+
+        When the time budget runs out, no more pages are started, fetches
+        in flight are cut off at their next read, and the pages finished
+        so far are returned.
+
         Args:
             start_url: The URL to start crawling from
             requirement: Optional keyword/phrase to filter pages
+            time_budget: Wall-clock seconds the crawl may take (defaults to
+                the time_budget setting; None means no limit)
 
         Returns:
-            List of ExtractedData objects
+            List of ExtractedData objects, in the order pages were fetched
         """
         self.log_info(f"Starting crawl from: {start_url}")
+        seeds = [start_url] + [url for url in self.seed_urls if url != start_url]
         self.base_domain = urlparse(start_url).netloc
+        self._seed_hosts = {urlparse(url).netloc for url in seeds}
         self.visited_urls = set()
+        self.skipped_pages = {}
+        self.crawl_stats = self._new_crawl_stats()
+        self.page_changes = {}
+        self.concurrency = self._new_concurrency_controller()
+        self.breakers = self._new_circuit_breakers()
         results = []
+        time_budget = self.time_budget if time_budget is None else time_budget
+        self._crawl_deadline = time.monotonic() + time_budget if time_budget else None
+        try:
+            self._run_crawl(seeds, requirement, results)
+        finally:
+            self._crawl_deadline = None
 
-        def crawl_recursive(url: str, depth: int):
-            """Recursively crawl pages."""
-            # Check stopping conditions
-            if depth > self.max_depth:
-                self.log_info(f"Max depth reached at: {url}")
-                return
-            if len(self.visited_urls) >= self.max_pages:
-                self.log_info(f"Max pages limit reached")
-                return
-            if url in self.visited_urls:
-                return
-
-            # Only crawl same domain
-            parsed_url = urlparse(url)
-            if parsed_url.netloc != self.base_domain:
-                return
-
-            # Normalize URL (remove fragments)
-            normalized_url = f"{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}"
-            if parsed_url.query:
-                normalized_url += f"?{parsed_url.query}"
-
-            if normalized_url in self.visited_urls:
-                return
-
-            self.visited_urls.add(normalized_url)
-            self.log_info(f"Crawling [{len(self.visited_urls)}/{self.max_pages}]: {normalized_url}")
-
-            # Extract data from current page
-            try:
-                # Add a small delay to be respectful to the server
-                time.sleep(0.5)
+        self.crawl_stats['concurrency'] = self.concurrency.snapshot()
+        self.crawl_stats['circuit_breakers'] = self.breakers.snapshot()
+        if self.dns_cache is not None:
+            self.crawl_stats['dns'] = self.dns_cache.snapshot()
+        results.sort(key=lambda item: item[0])
+        self.log_info(f"Crawl complete. Visited {len(self.visited_urls)} pages across "
+                      f"{len(self.crawl_stats['pages_per_host'])} hosts, found {len(results)} matching pages")
+        return [extracted_data for _, extracted_data in results]
+
+    def _budget_exhausted(self) -> bool:
+        """Check whether the running crawl has used up its time budget."""
+        return self._crawl_deadline is not None and time.monotonic() >= self._crawl_deadline
+
+    def _run_crawl(self, seeds: list, requirement: Optional[str], results: list):
+        """
+        Run the crawl loop of execute_crawl.
+
+        Args:
+            seeds: The URLs the crawl starts from
+            requirement: Optional keyword/phrase to filter pages
+            results: List that receives (fetch order, ExtractedData) pairs
+        """
+        warm_up = None
+        if self.warm_connections or (self.prefetch_dns and self.dns_cache is not None):
+            warm_up = ThreadPoolExecutor(max_workers=2, thread_name_prefix='warm-up')
+        warmed_hosts = set()
+
+        frontier = HostFrontier(self.concurrency.initial_limit, self.crawl_delay, self.host_weights)
+        # In a partitioned crawl every node gets all seeds and starts from the ones it owns
+        owned_seeds = [seed for seed in seeds if self._owns(seed)]
+        for seed in owned_seeds:
+            frontier.push(self._crawl_url(seed), 0)
+            self._schedule_warm_up(warm_up, warmed_hosts, seed)
+        if self.use_sitemaps and self.max_depth >= 1 and owned_seeds:
+            self._seed_from_sitemaps(owned_seeds, frontier)
+
+        try:
+            self._crawl_loop(frontier, requirement, results, warm_up, warmed_hosts)
+        finally:
+            if warm_up is not None:
+                warm_up.shutdown(wait=False, cancel_futures=True)
+
+        if self.crawl_stats['budget_exhausted']:
+            self.log_info(f"Time budget exhausted with {len(frontier)} pages still queued; "
+                          f"returning partial results")
+        elif len(self.visited_urls) >= self.max_pages and len(frontier):
+            self.log_info(f"Max pages limit reached")
+
+    def _crawl_loop(self, frontier: HostFrontier, requirement: Optional[str], results: list,
+                    warm_up: Optional[ThreadPoolExecutor], warmed_hosts: set):
+        """
+        Dispatch queued URLs to worker threads until the crawl is done.
+
+        Args:
+            frontier: HostFrontier holding the seeds
+            requirement: Optional keyword/phrase to filter pages
+            results: List that receives (fetch order, ExtractedData) pairs
+            warm_up: Executor for host warm-ups, if enabled
+            warmed_hosts: Hosts already warmed up
+        """
+        in_flight = {}  # Future -> (fetch order, url, depth)
+        order = 0
+        partition = self.partition
+        follow_fields, leaf_fields = self._crawl_fields(requirement)
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='crawl') as pool:
+            while True:
+                if partition is not None:
+                    self._receive_forwarded(frontier, partition.receive(), warm_up, warmed_hosts)
+
+                if not self.crawl_stats['budget_exhausted'] and self._budget_exhausted():
+                    self.crawl_stats['budget_exhausted'] = True
+                    self.log_info(f"Time budget reached; waiting for {len(in_flight)} fetches in flight")
+
+                # Hand URLs from ready hosts to idle workers
+                while (len(in_flight) < self.max_workers and len(self.visited_urls) < self.max_pages
+                       and not self.crawl_stats['budget_exhausted']):
+                    item = frontier.pop()
+                    if item is None:
+                        break
+                    url, depth = item
+                    if url in self.visited_urls:
+                        frontier.done(url)
+                        continue
+                    if self.breakers.is_open(urlparse(url).netloc):
+                        frontier.done(url)
+                        self._fail_host(frontier, urlparse(url).netloc, [url])
+                        continue
+                    self.visited_urls.add(url)
+                    order += 1
+                    self.log_info(f"Crawling [{len(self.visited_urls)}/{self.max_pages}]: {url}")
+                    fields = follow_fields if depth < self.max_depth else leaf_fields
+                    in_flight[pool.submit(self._crawl_page, url, fields)] = (order, url, depth)
+
+                can_dispatch = (len(self.visited_urls) < self.max_pages and len(frontier)
+                                and not self.crawl_stats['budget_exhausted'])
+                if not in_flight and not can_dispatch:
+                    if partition is None or partition.idle():
+                        break
+                    # Other nodes are still crawling and may forward more URLs
+                    self._receive_forwarded(frontier, partition.receive(partition.poll_interval), warm_up, warmed_hosts)
+                    continue
+
+                # Wait for a fetch to finish, for the next host's politeness delay
+                # to pass, or for the time budget to run out
+                timeout = None
+                ready = frontier.next_ready_time() if can_dispatch else None
+                if can_dispatch and self._crawl_deadline is not None:
+                    ready = self._crawl_deadline if ready is None else min(ready, self._crawl_deadline)
+                if ready is not None:
+                    timeout = max(0.0, ready - time.monotonic())
+                if partition is not None:
+                    # Keep taking in forwarded URLs while fetches run
+                    partition.flush()
+                    timeout = partition.poll_interval if timeout is None else min(timeout, partition.poll_interval)
+                if not in_flight:
+                    time.sleep(timeout or 0)
+                    continue
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    fetch_order, url, depth = in_flight.pop(future)
+                    frontier.done(url)
+                    host = urlparse(url).netloc
+                    frontier.set_limit(host, self.concurrency.limit(host))
+                    frontier.defer(host, self.concurrency.retry_at(host))
+                    if self.breakers.is_open(host):
+                        self._fail_host(frontier, host)
+                    try:
+                        extracted_data, robots_delay = future.result()
+                    except Exception as e:
+                        self.log_error(f"Error crawling {url}: {str(e)}")
+                        continue
+
+                    if robots_delay and robots_delay > self.crawl_delay:
+                        frontier.set_delay(host, robots_delay)
+                    if extracted_data is None:
+                        self.visited_urls.discard(url)
+                        self.skipped_pages[url] = "Disallowed by robots.txt"
+                        self._count('robots_disallowed')
+                        self.log_info(f"Disallowed by robots.txt: {url}")
+                        continue
 
-                extracted_data = self.execute(normalized_url)
+                    # Skipped pages (wrong type, too large, open circuit, out of time) have no body
+                    if url in self.skipped_pages:
+                        continue
 
-                # If requirement specified, check if page matches
-                if requirement:
-                    if self._matches_requirement(extracted_data, requirement):
-                        self.log_info(f"✓ Match found: {normalized_url}")
-                        results.append(extracted_data)
+                    pages_per_host = self.crawl_stats['pages_per_host']
+                    pages_per_host[host] = pages_per_host.get(host, 0) + 1
+
+                    # If requirement specified, check if page matches
+                    if requirement:
+                        if self._matches_requirement(extracted_data, requirement):
+                            self.log_info(f"✓ Match found: {url}")
+                            results.append((fetch_order, extracted_data))
+                        else:
+                            self.log_info(f"✗ No match: {url}")
                     else:
-                        self.log_info(f"✗ No match: {normalized_url}")
-                else:
-                    results.append(extracted_data)
+                        results.append((fetch_order, extracted_data))
+
+                    # Queue sub-pages
+                    if depth < self.max_depth:
+                        for link in extracted_data.links:
+                            link_url = self._crawl_url(link.url)
+                            if link_url and not self._owns(link_url):
+                                partition.forward(link_url, depth + 1)
+                            elif link_url and link_url not in self.visited_urls:
+                                if frontier.push(link_url, depth + 1):
+                                    self._schedule_warm_up(warm_up, warmed_hosts, link_url)
+
+    def _owns(self, url: str) -> bool:
+        """Check whether this agent crawls a URL's host (always, unless the crawl is partitioned)."""
+        return self.partition is None or self.partition.owns(url)
+
+    def _receive_forwarded(self, frontier: HostFrontier, urls: list,
+                           warm_up: Optional[ThreadPoolExecutor], warmed_hosts: set):
+        """
+        Queue URLs forwarded by other nodes of a partitioned crawl.
+
+        Args:
+            frontier: HostFrontier of the crawl
+            urls: (url, depth) pairs
+            warm_up: Executor for host warm-ups, if enabled
+            warmed_hosts: Hosts already warmed up
+        """
+        for url, depth in urls:
+            if url not in self.visited_urls and frontier.push(url, depth):
+                self._schedule_warm_up(warm_up, warmed_hosts, url)
 
-                # Extract and crawl sub-pages
-                for link in extracted_data.links:
-                    link_url = link['url']
-                    crawl_recursive(link_url, depth + 1)
+    def _schedule_warm_up(self, warm_up: Optional[ThreadPoolExecutor], warmed_hosts: set, url: str):
+        """
+        Warm up the host of a newly queued URL in the background, once per host.
+
+        Args:
+            warm_up: Executor for host warm-ups, or None if disabled
+            warmed_hosts: Hosts already warmed up
+            url: URL just added to the frontier
+        """
+        if warm_up is None:
+            return
+        host = urlparse(url).netloc
+        if host in warmed_hosts:
+            return
+        warmed_hosts.add(host)
+        warm_up.submit(self._warm_up_host, url)
+
+    def _warm_up_host(self, url: str):
+        """
+        Resolve the host of a URL, and connect to it if warm_connections is set.
+
+        Args:
+            url: Any URL on the host
+        """
+        parsed = urlparse(url)
+        try:
+            if self.warm_connections:
+                warm_connection(self.adapter, url, self.session.verify)
+            else:
+                self.dns_cache.prefetch([parsed.hostname], parsed.port or (443 if parsed.scheme == 'https' else 80))
+            self._count('hosts_warmed')
+            self.log_debug(f"Warmed up {parsed.netloc}")
+        except Exception as e:
+            self.log_debug(f"Warm-up of {parsed.netloc} failed: {e}")
+
+    def _fail_host(self, frontier: HostFrontier, host: str, urls: Optional[list] = None):
+        """
+        Fail the queued URLs of a host whose circuit breaker is open, without fetching them.
 
-            except Exception as e:
-                self.log_error(f"Error crawling {normalized_url}: {str(e)}")
+        Args:
+            frontier: HostFrontier of the crawl
+            host: Host (netloc)
+            urls: URLs already taken from the frontier that fail as well
+        """
+        failed = (urls or []) + frontier.drop(host)
+        if not failed:
+            return
+        reason = f"Circuit breaker open for {host}"
+        for url in failed:
+            self.skipped_pages[url] = reason
+        self._count('circuit_rejected', len(failed))
+        self.log_info(f"Skipped {len(failed)} queued pages on {host}: circuit breaker open")
+
+    def _crawl_fields(self, requirement: Optional[str]) -> Tuple[Optional[frozenset], Optional[frozenset]]:
+        """
+        Return the fields to extract from crawled pages, given the extract_fields setting.
 
-        # Start recursive crawl
-        crawl_recursive(start_url, 0)
-        self.log_info(f"Crawl complete. Visited {len(self.visited_urls)} pages, found {len(results)} matching pages")
-        return results
+        Pages are also extracted with the fields the requirement is matched
+        against, and pages whose links will be followed with their links.
+
+        Args:
+            requirement: Optional keyword/phrase to filter pages
+
+        Returns:
+            Tuple of (fields for pages below max_depth, fields for pages at
+            max_depth); None means all fields
+        """
+        if self.extract_fields is None:
+            return None, None
+        fields = self.extract_fields
+        if requirement:
+            fields = fields.union(MATCH_FIELDS)
+        return fields.union(('links',)), fields
+
+    def _crawl_page(self, url: str,
+                    fields: Optional[frozenset] = None) -> Tuple[Optional[ExtractedData], Optional[float]]:
+        """
+        Fetch and extract one page of a crawl; runs on a worker thread.
+
+        Args:
+            url: Normalized URL
+            fields: ExtractedData fields to extract, or None for all
+
+        Returns:
+            Tuple of (ExtractedData, or None if robots.txt disallows the URL;
+            the host's robots.txt Crawl-delay, if any)
+        """
+        if self.robots is None:
+            return self.execute(url, fields), None
+        crawl_delay = self.robots.policy(url).crawl_delay
+        if not self.robots.allowed(url):
+            return None, crawl_delay
+        return self.execute(url, fields), crawl_delay
+
+    def _crawl_url(self, url: str) -> Optional[str]:
+        """
+        Normalize a URL for crawling.
+
+        Args:
+            url: Absolute URL
+
+        Returns:
+            URL without its fragment, or None if its host is not crawled
+        """
+        parsed_url = urlparse(url)
+        if parsed_url.netloc not in self._seed_hosts:
+            if self.allowed_hosts is None or parsed_url.scheme not in ('http', 'https'):
+                return None
+            host = (parsed_url.hostname or '').lower()
+            if not (self.allowed_hosts.match(host) or self.allowed_hosts.match(parsed_url.netloc.lower())):
+                return None
+        normalized_url = f"{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}"
+        if parsed_url.query:
+            normalized_url += f"?{parsed_url.query}"
+        return normalized_url
+
+    def _seed_from_sitemaps(self, seeds: list, frontier: HostFrontier):
+        """
+        Queue the pages listed in the seed hosts' sitemaps.
+
+        Sitemaps come from the sitemap_urls setting and each host's
+        robots.txt, falling back to /sitemap.xml. Pages are queued at
+        depth 1 with their lastmod.
+
+        Args:
+            seeds: The URLs the crawl starts from
+            frontier: HostFrontier to fill
+        """
+        sitemap_urls = list(self.sitemap_urls)
+        for seed in {urlparse(url).netloc: url for url in seeds}.values():
+            parsed = urlparse(seed)
+            listed = self.robots.policy(seed).sitemaps if self.robots is not None else []
+            sitemap_urls.extend(listed or [f"{parsed.scheme}://{parsed.netloc}/sitemap.xml"])
+
+        def on_error(sitemap_url: str, error: Exception):
+            self.log_error(f"Failed to read sitemap {sitemap_url}: {error}")
+
+        queued = 0
+        for entry in read_sitemaps(sitemap_urls, self._open_sitemap,
+                                   max_urls=self.max_sitemap_urls, on_error=on_error):
+            if self._budget_exhausted():
+                break
+            url = self._crawl_url(entry.url)
+            if url and self._owns(url) and frontier.push(url, 1, entry.lastmod):
+                queued += 1
+        self._count('sitemap_urls', queued)
+        self.log_info(f"Queued {queued} pages from sitemaps")
+
+    @contextmanager
+    def _open_sitemap(self, url: str):
+        """
+        Open a sitemap for streaming.
+
+        Args:
+            url: Sitemap URL
+
+        Yields:
+            Binary stream of the sitemap with any Content-Encoding removed
+        """
+        headers = {'User-Agent': self.user_agent, 'Accept-Encoding': self.accept_encoding}
+        with self.session.get(url, headers=headers, timeout=(self.connect_timeout, self.read_timeout), stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            yield response.raw
+
+    def _fetch_robots(self, url: str) -> Tuple[int, str]:
+        """
+        Fetch a robots.txt file.
+
+        Args:
+            url: robots.txt URL
+
+        Returns:
+            Tuple of (status code, text); the text is capped at MAX_ROBOTS_BYTES
+        """
+        headers = {'User-Agent': self.user_agent}
+        with self.session.get(url, headers=headers, timeout=(self.connect_timeout, self.read_timeout), stream=True) as response:
+            body = bytearray()
+            if response.ok:
+                for chunk in response.iter_content(self.chunk_size):
+                    body += chunk
+                    if len(body) >= MAX_ROBOTS_BYTES:
+                        break
+            self.log_debug(f"Fetched {url}: HTTP {response.status_code}")
+            return response.status_code, bytes(body[:MAX_ROBOTS_BYTES]).decode('utf-8', errors='replace')
 
     def _matches_requirement(self, data: ExtractedData, requirement: str) -> bool:
         """
@@ -244,7 +1177,7 @@ class WebScraperAgent(BaseAgent):
 
         # Search in headings
         for heading in data.headings:
-            if requirement_lower in heading.lower():
+            if requirement_lower in heading.text.lower():
                 return True
 
         # Search in paragraphs
@@ -258,27 +1191,62 @@ class WebScraperAgent(BaseAgent):
 
         return False
 
-    def _extract_main_content(self, soup: BeautifulSoup) -> str:
+    def _find_content_roots(self, soup: 'BeautifulSoup') -> list:
         """
-        Extract the main content from the page.
+        Find the elements holding the page's main content.
+
+        `<main>` and `<article>` elements are used when the page has them.
+        Otherwise, with density extraction, the container with the most
+        prose and the fewest links is picked (see content_density.py).
 
         Args:
             soup: BeautifulSoup object
 
         Returns:
-            Main content as string
+            Tags in document order; empty to use the whole body
         """
-        # Try to find main content in common containers
         main_tags = soup.find_all(['main', 'article'])
         if main_tags:
-            return ' '.join([tag.get_text(strip=True, separator=' ') for tag in main_tags])
+            return outermost(main_tags)
+        if self.content_extraction != 'density':
+            return []
+        return find_main_content(soup.body or soup)
+
+    def _content_paragraphs(self, soup: 'BeautifulSoup', content_roots: list) -> list:
+        """
+        Return the <p> elements to extract paragraphs from.
+
+        Args:
+            soup: BeautifulSoup object
+            content_roots: Elements returned by _find_content_roots
+
+        Returns:
+            <p> Tags of the main content, outside its navigation, asides and
+            the like, or of the whole page
+        """
+        if not content_roots or self.content_extraction != 'density':
+            return soup.find_all('p')
+        return content_elements(content_roots, 'p')
+
+    def _extract_main_content(self, soup: 'BeautifulSoup', content_roots: Optional[list] = None) -> str:
+        """
+        Extract the main content from the page.
+
+        Args:
+            soup: BeautifulSoup object
+            content_roots: Elements returned by _find_content_roots, if already found
+
+        Returns:
+            Main content as string
+        """
+        if content_roots is None:
+            content_roots = self._find_content_roots(soup)
+        if content_roots:
+            return content_text(content_roots)
 
-        # Fallback: get all text from body
+        # Fallback: all text of the body, without scripts, styles and navigation
         body = soup.find('body')
         if body:
-            # Remove script and style elements
-            for script in body(['script', 'style', 'nav', 'footer', 'header']):
-                script.decompose()
-            return body.get_text(strip=True, separator=' ')
+            return content_text([body])
 
         return ""
@@ -0,0 +1,568 @@
+"""
+Scraper Server - a long-running process that serves scrape, crawl and query jobs.
+
+A fixed number of worker threads each own an AgentOrchestrator that is
+built once, so HTTP connection pools, DNS and robots.txt caches and the
+incremental crawl state stay warm between jobs. Jobs wait in a bounded
+queue; when it is full, new jobs are refused rather than piling up.
+
+The JSON API is served over local HTTP or a Unix socket:
+
+    POST /jobs        {"type": "scrape" | "crawl" | "query", "url": ..., "requirement": ...}
+    GET  /jobs/<id>   Status and result of a job
+    GET  /health      Queue and worker counters
+
+Run it with `python -m web_scraper_agents.server --port 8765`.
+"""
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+import itertools
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+
+from .base_agent import BaseAgent
+from .crawl_state import CrawlStateStore
+from .exporters import multi_result_to_record, page_result_to_record
+from .orchestrator import AgentOrchestrator
+
+
+JOB_TYPES = ('scrape', 'crawl', 'query')
+
+# Crawl settings a job may override for itself
+CRAWL_OVERRIDES = ('max_pages', 'max_depth')
+
+# Largest request body accepted, in bytes
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is full."""
+
+
+class Job:
+    """A submitted job and, once finished, its result."""
+
+    __slots__ = ('id', 'type', 'params', 'status', 'result', 'error',
+                 'submitted', 'started', 'finished', 'done')
+
+    def __init__(self, job_id: str, job_type: str, params: Dict[str, Any]):
+        self.id = job_id
+        self.type = job_type
+        self.params = params
+        self.status = 'queued'  # queued, running, done, failed
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.submitted = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.done = threading.Event()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the job as a JSON-serializable dict."""
+        job = {'id': self.id, 'type': self.type, 'status': self.status}
+        if self.started is not None:
+            job['queue_seconds'] = round(self.started - self.submitted, 3)
+        if self.finished is not None:
+            job['run_seconds'] = round(self.finished - self.started, 3)
+        if self.error is not None:
+            job['error'] = self.error
+        if self.result is not None:
+            job['result'] = self.result
+        return job
+
+
+class ScraperService(BaseAgent):
+    """
+    Warm orchestrators serving jobs from a bounded queue.
+
+    Each worker thread runs one job at a time on its own orchestrator, so
+    at most `workers` jobs run at once. Orchestrators share the
+    incremental crawl state when a state_file is configured.
+    """
+
+    def __init__(self, config: Dict[str, Any] = None):
+        """
+        Initialize the service.
+
+        Args:
+            config: Orchestrator configuration, plus the service settings
+                workers (default 2), queue_size (default 32) and
+                keep_jobs (finished jobs kept for GET /jobs/<id>, default 1000)
+        """
+        super().__init__("ScraperService", config)
+        self.workers = max(1, self.config.get('workers', 2))
+        self.queue_size = max(1, self.config.get('queue_size', 32))
+        self.keep_jobs = self.config.get('keep_jobs', 1000)
+
+        state_file = self.config.get('state_file')
+        self.state_store = CrawlStateStore(state_file) if state_file else None
+        self._queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._jobs_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._threads: List[threading.Thread] = []
+        self._running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def start(self) -> 'ScraperService':
+        """Build the orchestrators and start the worker threads."""
+        for index in range(self.workers):
+            orchestrator = AgentOrchestrator(self.config, state_store=self.state_store)
+            thread = threading.Thread(target=self._work, args=(orchestrator,),
+                                      name=f"scraper-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self.log_info(f"Started {self.workers} workers (queue size {self.queue_size})")
+        return self
+
+    def stop(self):
+        """Let queued jobs finish, then stop the workers."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def execute(self, job_type: str, params: Dict[str, Any] = None,
+                timeout: Optional[float] = None) -> Job:
+        """
+        Submit a job and wait for it to finish.
+
+        Args:
+            job_type: 'scrape', 'crawl' or 'query'
+            params: Job parameters (url, requirement, ...)
+            timeout: Seconds to wait; the job keeps running if it is exceeded
+
+        Returns:
+            Job object
+        """
+        job = self.submit(job_type, params)
+        job.done.wait(timeout)
+        return job
+
+    def submit(self, job_type: str, params: Dict[str, Any] = None) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            job_type: 'scrape', 'crawl' or 'query'
+            params: Job parameters: url (scrape, crawl), requirement, and for
+                crawls max_pages, max_depth and time_budget; limit for queries
+
+        Returns:
+            Job object
+
+        Raises:
+            ValueError: If the job is invalid
+            JobQueueFull: If the queue is full
+        """
+        params = dict(params or {})
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"Unknown job type: {job_type!r} (expected one of {', '.join(JOB_TYPES)})")
+        if job_type != 'query':
+            url = params.get('url')
+            if not isinstance(url, str) or not url.startswith(('http://', 'https://')):
+                raise ValueError("Job needs a 'url' starting with http:// or https://")
+        elif self.state_store is None:
+            raise ValueError("Query jobs need a state_file")
+        # Numbers are checked here, so a bad value is refused rather than failing in a worker
+        if job_type == 'query':
+            _job_number(params, 'limit', integer=True, minimum=1)
+        elif job_type == 'crawl':
+            _job_number(params, 'max_pages', integer=True, minimum=1)
+            _job_number(params, 'max_depth', integer=True)
+            _job_number(params, 'time_budget')
+
+        job = Job(str(next(self._ids)), job_type, params)
+        with self._jobs_lock:
+            self._jobs[job.id] = job
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._jobs_lock:
+                del self._jobs[job.id]
+                self.rejected += 1
+            raise JobQueueFull(f"Job queue is full ({self.queue_size} jobs)")
+        with self._jobs_lock:
+            self._forget_old_jobs()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job.
+
+        Args:
+            job_id: ID returned when the job was submitted
+
+        Returns:
+            Job object, or None if it is unknown or was forgotten
+        """
+        with self._jobs_lock:
+            return self._jobs.get(job_id)
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Return the service counters.
+
+        Returns:
+            Dictionary with worker, queue and job counts
+        """
+        with self._jobs_lock:
+            return {
+                'status': 'ok',
+                'workers': self.workers,
+                'running': self._running,
+                'queued': self._queue.qsize(),
+                'queue_size': self.queue_size,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+            }
+
+    def _forget_old_jobs(self):
+        """Drop the oldest finished jobs beyond keep_jobs (lock held)."""
+        while len(self._jobs) > self.keep_jobs:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if not oldest.done.is_set():
+                break
+            del self._jobs[oldest_id]
+
+    def _work(self, orchestrator: AgentOrchestrator):
+        """Run jobs from the queue on one orchestrator until stopped."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                orchestrator.close()
+                return
+            with self._jobs_lock:
+                self._running += 1
+            job.status = 'running'
+            job.started = time.time()
+            try:
+                job.result = self._run(orchestrator, job)
+                job.status = 'done'
+            except Exception as e:
+                job.error = str(e)
+                job.status = 'failed'
+                self.log_error(f"Job {job.id} ({job.type}) failed: {e}")
+            job.finished = time.time()
+            with self._jobs_lock:
+                self._running -= 1
+                if job.status == 'done':
+                    self.completed += 1
+                else:
+                    self.failed += 1
+            job.done.set()
+
+    def _run(self, orchestrator: AgentOrchestrator, job: Job) -> Dict[str, Any]:
+        """
+        Run one job.
+
+        Args:
+            orchestrator: The worker's orchestrator
+            job: Job to run
+
+        Returns:
+            JSON-serializable result
+        """
+        params = job.params
+        requirement = params.get('requirement')
+        scraper = orchestrator.scraper_agent
+
+        if job.type == 'query':
+            pages = orchestrator.query_state(requirement, limit=params.get('limit', 50))
+            return {'requirement': requirement, 'pages': [page_result_to_record(page) for page in pages]}
+
+        if job.type == 'scrape':
+            # Single-page runs don't reset the scraper's per-run bookkeeping
+            scraper.skipped_pages = {}
+            scraper.page_changes = {}
+            page = orchestrator.run_page(params['url'], requirement)
+            if page is None:
+                raise ValueError("Failed to extract data")
+            if page.extracted_data.fetch_error:
+                raise ValueError(f"Failed to fetch page: {page.extracted_data.fetch_error}")
+            return {'page': page_result_to_record(page), 'skipped_pages': scraper.skipped_pages}
+
+        # Crawl, with this job's overrides applied to the worker's agents
+        saved = {name: getattr(scraper, name) for name in CRAWL_OVERRIDES}
+        saved_budget = orchestrator.time_budget
+        try:
+            for name in CRAWL_OVERRIDES:
+                if params.get(name) is not None:
+                    setattr(scraper, name, params[name])
+            if params.get('time_budget') is not None:
+                orchestrator.time_budget = params['time_budget']
+            multi_result = orchestrator.run_crawl(params['url'], requirement)
+        finally:
+            for name, value in saved.items():
+                setattr(scraper, name, value)
+            orchestrator.time_budget = saved_budget
+
+        if multi_result is None:
+            return {'base_url': params['url'], 'requirement': requirement, 'total_pages_crawled':
+                    len(scraper.visited_urls), 'pages': [], 'skipped_pages': scraper.skipped_pages,
+                    'crawl_stats': scraper.crawl_stats}
+        return multi_result_to_record(multi_result)
+
+
+def _job_number(params: Dict[str, Any], name: str, integer: bool = False, minimum: float = 0):
+    """
+    Check a numeric job parameter and store it as a number.
+
+    Args:
+        params: Job parameters; the value is replaced by its int or float
+        name: Parameter name
+        integer: Whether the value must be a whole number
+        minimum: Smallest value allowed
+
+    Raises:
+        ValueError: If the value is not a finite number of at least minimum
+    """
+    value = params.get(name)
+    if value is None:
+        return
+    kind = 'a whole number' if integer else 'a number'
+    try:
+        if isinstance(value, bool):
+            raise TypeError
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' must be {kind}, not {value!r}") from None
+    if not minimum <= number < float('inf') or (integer and not number.is_integer()):
+        raise ValueError(f"'{name}' must be {kind} of at least {minimum}, not {value!r}")
+    params[name] = int(number) if integer else number
+
+
+def _wait_timeout(request: Dict[str, Any]) -> Optional[float]:
+    """
+    Read the seconds a POST /jobs request waits for its job.
+
+    Args:
+        request: Decoded request body
+
+    Returns:
+        Timeout in seconds, or None to wait until the job finishes
+
+    Raises:
+        ValueError: If timeout is not a finite, non-negative number
+    """
+    timeout = request.get('timeout')
+    if timeout is None:
+        return None
+    try:
+        if isinstance(timeout, bool):
+            raise TypeError
+        seconds = float(timeout)
+    except (TypeError, ValueError):
+        raise ValueError(f"'timeout' must be a number of seconds, not {timeout!r}") from None
+    if not 0 <= seconds < float('inf'):
+        raise ValueError(f"'timeout' must be a finite, non-negative number of seconds, not {timeout!r}")
+    return seconds
+
+
+class _APIRequestHandler(BaseHTTPRequestHandler):
+    """JSON API over a ScraperService."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        """Serve /health and /jobs/<id>."""
+        service = self.server.service
+        path = self.path.split('?', 1)[0].rstrip('/')
+        if path == '/health':
+            self._send_json(200, service.status())
+        elif path.startswith('/jobs/'):
+            job = service.get(path[len('/jobs/'):])
+            if job is None:
+                self._send_json(404, {'error': 'Unknown job'})
+            else:
+                self._send_json(200, job.to_dict())
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        """Submit a job to /jobs; waits for the result unless "wait" is false."""
+        if self.path.split('?', 1)[0].rstrip('/') != '/jobs':
+            self._send_json(404, {'error': 'Not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = -1
+        if not 0 < length <= MAX_REQUEST_BYTES:
+            self.close_connection = True
+            self._send_json(400, {'error': f"Send a JSON body of at most {MAX_REQUEST_BYTES} bytes"})
+            return
+        try:
+            request = json.loads(self.rfile.read(length))
+            if not isinstance(request, dict):
+                raise ValueError("Expected a JSON object")
+        except ValueError as e:
+            self._send_json(400, {'error': f"Invalid JSON: {e}"})
+            return
+
+        service = self.server.service
+        try:
+            timeout = _wait_timeout(request)
+            job = service.submit(request.pop('type', 'scrape'), request)
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        except JobQueueFull as e:
+            self._send_json(503, {'error': str(e)}, {'Retry-After': '1'})
+            return
+
+        if request.get('wait', True):
+            job.done.wait(timeout)
+        status = 200 if job.done.is_set() else 202
+        self._send_json(status, job.to_dict())
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None):
+        """Send a JSON response."""
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format, *args):
+        """Silence the default per-request stderr logging."""
+        pass
+
+
+class _UnixRequestHandler(_APIRequestHandler):
+    """API handler for Unix socket connections, which have no TCP options."""
+
+    disable_nagle_algorithm = False
+
+
+class _TCPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class ScraperServer:
+    """
+    Serve a ScraperService over local HTTP or a Unix socket.
+
+    The server runs in a background thread and can be used as a context manager:
+
+        with ScraperServer({'workers': 2, 'scraper': {'crawl_delay': 0}}) as server:
+            print(server.address)
+    """
+
+    def __init__(self, config: Dict[str, Any] = None, host: str = '127.0.0.1', port: int = 8765,
+                 unix_socket: Optional[str] = None):
+        """
+        Initialize the server.
+
+        Args:
+            config: ScraperService configuration
+            host: Interface to bind to (ignored with unix_socket)
+            port: Port to bind to (0 picks a free port)
+            unix_socket: Path of a Unix socket to listen on instead of TCP
+        """
+        self.service = ScraperService(config)
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def address(self) -> str:
+        """URL (or socket path) the API is served on."""
+        if self.unix_socket:
+            return f"unix:{self.unix_socket}"
+        return f"http://{self.host}:{self.port}/"
+
+    def start(self) -> 'ScraperServer':
+        """Start the workers and serve in a background thread."""
+        self.service.start()
+        if self.unix_socket:
+            if os.path.exists(self.unix_socket):
+                os.unlink(self.unix_socket)
+            self._httpd = _UnixServer(self.unix_socket, _UnixRequestHandler)
+        else:
+            self._httpd = _TCPServer((self.host, self.port), _APIRequestHandler)
+            self.port = self._httpd.server_address[1]
+        self._httpd.service = self.service
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop accepting requests, finish queued jobs and stop the workers."""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+            self._thread = None
+            if self.unix_socket and os.path.exists(self.unix_socket):
+                os.unlink(self.unix_socket)
+        self.service.stop()
+
+    def __enter__(self) -> 'ScraperServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main():
+    """Run the scraper server in the foreground."""
+    import argparse
+    import logging
+
+    parser = argparse.ArgumentParser(description='Serve scrape, crawl and query jobs over a local JSON API')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind to (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765)')
+    parser.add_argument('--unix-socket', metavar='PATH', help='Listen on a Unix socket instead of TCP')
+    parser.add_argument('--workers', type=int, default=2, help='Jobs run at once (default: 2)')
+    parser.add_argument('--queue-size', type=int, default=32, help='Jobs waiting before new ones are refused')
+    parser.add_argument('--state-file', metavar='PATH', help='Incremental crawl state shared by all jobs')
+    parser.add_argument('--crawl-workers', type=int, default=8, help='Fetch threads per crawl (default: 8)')
+    parser.add_argument('--quiet', action='store_true', help='Only log errors')
+    args = parser.parse_args()
+
+    config = {
+        'workers': args.workers,
+        'queue_size': args.queue_size,
+        'state_file': args.state_file,
+        'scraper': {'max_workers': args.crawl_workers},
+    }
+    server = ScraperServer(config, host=args.host, port=args.port, unix_socket=args.unix_socket).start()
+    if args.quiet:
+        # Agents set up their loggers when they are built, so quiet them afterwards
+        for name in ('ScraperService', 'AgentOrchestrator', 'WebScraperAgent', 'AnalyzerAgent', 'PresenterAgent'):
+            logging.getLogger(name).setLevel(logging.ERROR)
+    print(f"Serving jobs at {server.address} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+Sitemap reading - streams sitemap.xml files and sitemap indexes.
+
+Sitemaps are parsed incrementally with iterparse and cleared element by
+element, so memory does not grow with the size of the file. Gzipped
+sitemaps (sitemap.xml.gz) are detected from their magic bytes and
+decompressed on the fly.
+"""
+from contextlib import AbstractContextManager
+from datetime import datetime, timezone
+from typing import BinaryIO, Callable, Iterator, List, NamedTuple, Optional, Tuple
+import gzip
+import xml.etree.ElementTree as ElementTree
+
+
+# Limits from the sitemaps.org protocol
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024
+MAX_SITEMAP_URLS = 50000
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+
+class SitemapEntry(NamedTuple):
+    """A page listed in a sitemap; lastmod is a POSIX timestamp, if given."""
+    url: str
+    lastmod: Optional[float]
+
+
+class _Reader:
+    """File-like wrapper that replays a peeked prefix and enforces a size cap."""
+
+    def __init__(self, stream: BinaryIO, prefix: bytes = b"", max_bytes: Optional[int] = None):
+        self._stream = stream
+        self._prefix = prefix
+        self._max_bytes = max_bytes
+        self._read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if self._prefix:
+            data, self._prefix = self._prefix, b""
+            if 0 <= size < len(data):
+                data, self._prefix = data[:size], data[size:]
+        else:
+            data = self._stream.read(size)
+        self._read += len(data)
+        if self._max_bytes is not None and self._read > self._max_bytes:
+            raise ValueError(f"Sitemap larger than {self._max_bytes} bytes")
+        return data
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a W3C datetime as used in <lastmod>.
+
+    Args:
+        value: Date such as '2024-05-01' or '2024-05-01T10:00:00+00:00'
+
+    Returns:
+        POSIX timestamp, or None if the value is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def iter_sitemap(stream: BinaryIO, max_bytes: int = MAX_SITEMAP_BYTES) -> Iterator[Tuple[str, SitemapEntry]]:
+    """
+    Stream the entries of one sitemap file.
+
+    Args:
+        stream: Binary file-like object with the (possibly gzipped) sitemap
+        max_bytes: Maximum decompressed size to read
+
+    Yields:
+        ('url', entry) for pages of a urlset and ('sitemap', entry) for
+        child sitemaps of a sitemap index
+    """
+    head = stream.read(2)
+    source = _Reader(stream, prefix=head)
+    if head == _GZIP_MAGIC:
+        source = gzip.GzipFile(fileobj=source)
+    source = _Reader(source, max_bytes=max_bytes)
+
+    root = None
+    loc = lastmod = None
+    for event, element in ElementTree.iterparse(source, events=('start', 'end')):
+        if root is None:
+            root = element
+            continue
+        if event != 'end':
+            continue
+        tag = element.tag.rsplit('}', 1)[-1]
+        if tag == 'loc':
+            loc = (element.text or '').strip()
+        elif tag == 'lastmod':
+            lastmod = parse_lastmod(element.text)
+        elif tag in ('url', 'sitemap'):
+            if loc:
+                yield tag, SitemapEntry(loc, lastmod)
+            loc = lastmod = None
+            # Drop parsed entries so the tree stays empty while streaming
+            root.clear()
+
+
+def read_sitemaps(sitemap_urls: List[str],
+                  open_stream: Callable[[str], AbstractContextManager],
+                  max_urls: int = MAX_SITEMAP_URLS,
+                  max_sitemaps: int = 100,
+                  on_error: Optional[Callable[[str, Exception], None]] = None) -> Iterator[SitemapEntry]:
+    """
+    Read pages from sitemaps, following sitemap indexes.
+
+    Args:
+        sitemap_urls: Sitemap or sitemap index URLs to start from
+        open_stream: Callable returning a context manager that yields a binary
+            stream for a URL (with any Content-Encoding already removed)
+        max_urls: Maximum number of page entries to yield
+        max_sitemaps: Maximum number of sitemap files to read
+        on_error: Optional callback for sitemaps that fail to download or parse
+
+    Yields:
+        SitemapEntry objects, in document order
+    """
+    pending = list(sitemap_urls)
+    seen = set()
+    yielded = 0
+    while pending and len(seen) < max_sitemaps and yielded < max_urls:
+        sitemap_url = pending.pop(0)
+        if sitemap_url in seen:
+            continue
+        seen.add(sitemap_url)
+        try:
+            with open_stream(sitemap_url) as stream:
+                for kind, entry in iter_sitemap(stream):
+                    if kind == 'sitemap':
+                        pending.append(entry.url)
+                        continue
+                    yield entry
+                    yielded += 1
+                    if yielded >= max_urls:
+                        break
+        except Exception as e:
+            if on_error:
+                on_error(sitemap_url, e)
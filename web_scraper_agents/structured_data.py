@@ -0,0 +1,141 @@
+"""
+Structured data extraction - JSON-LD, OpenGraph and microdata from a parsed page.
+
+Everything is collected in one pass over the parse tree that also reads
+the page's `<meta>` tags, so pages are never parsed twice. JSON-LD blocks
+are copied out as raw strings, up to a size budget per page, and decoded
+lazily by StructuredData.json_ld. Microdata items are read into plain
+dicts in the shape of the W3C microdata JSON format:
+
+    {"type": ["https://schema.org/Product"], "id": "...",
+     "properties": {"name": ["Widget"], "offers": [{"type": [...], "properties": {...}}]}}
+"""
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urljoin
+
+from .models import StructuredData
+
+
+# Characters of JSON-LD kept per page; further blocks are skipped
+MAX_JSON_LD_SIZE = 256 * 1024
+
+# Top-level microdata items kept per page
+MAX_MICRODATA_ITEMS = 50
+
+# Longest microdata text value, in characters
+MAX_PROPERTY_LENGTH = 1000
+
+# Deepest nesting of microdata items that is followed
+MAX_ITEM_DEPTH = 8
+
+# <meta property> prefixes of the OpenGraph protocol and its object types
+OPENGRAPH_PREFIXES = ('og:', 'article:', 'book:', 'profile:', 'music:', 'video:', 'product:')
+
+# Microdata properties whose value is a URL attribute rather than the element's text
+_URL_ATTRIBUTES = {
+    'a': 'href', 'area': 'href', 'link': 'href',
+    'audio': 'src', 'embed': 'src', 'iframe': 'src', 'img': 'src', 'source': 'src',
+    'track': 'src', 'video': 'src', 'object': 'data',
+}
+
+
+def _is_structured(tag) -> bool:
+    """Whether a tag carries metadata or structured data."""
+    name = tag.name
+    if name == 'meta':
+        return True
+    if name == 'script':
+        script_type = tag.get('type')
+        return bool(script_type) and script_type.split(';', 1)[0].strip().lower() == 'application/ld+json'
+    return tag.has_attr('itemscope')
+
+
+def extract_structured_data(soup, url: str,
+                            max_json_ld_size: int = MAX_JSON_LD_SIZE) -> Tuple[Dict[str, str], StructuredData]:
+    """
+    Collect a page's metadata and structured data in one pass.
+
+    Args:
+        soup: BeautifulSoup object
+        url: URL of the page, used to resolve relative microdata URLs
+        max_json_ld_size: Characters of JSON-LD kept; blocks beyond it are skipped
+
+    Returns:
+        Tuple of (metadata dict of <meta> name/property -> content, StructuredData)
+    """
+    metadata: Dict[str, str] = {}
+    data = StructuredData()
+    json_ld_size = 0
+
+    for tag in soup.find_all(_is_structured):
+        if tag.name == 'meta':
+            name = tag.get('name') or tag.get('property', '')
+            content = tag.get('content', '')
+            if name and content:
+                metadata[name] = content
+                prop = tag.get('property', '')
+                if prop.startswith(OPENGRAPH_PREFIXES):
+                    data.opengraph.setdefault(prop, []).append(content)
+        elif tag.name == 'script':
+            raw = ''.join(tag.strings).strip()
+            if not raw:
+                continue
+            if json_ld_size + len(raw) > max_json_ld_size:
+                data.skipped += 1
+                continue
+            json_ld_size += len(raw)
+            data.json_ld_raw.append(raw)
+        elif tag.has_attr('itemscope') and not tag.has_attr('itemprop'):
+            # Top-level item; items that are property values are read with their parent
+            if len(data.microdata) >= MAX_MICRODATA_ITEMS:
+                data.skipped += 1
+                continue
+            data.microdata.append(_read_item(tag, url, 0))
+
+    return metadata, data
+
+
+def _read_item(item, url: str, depth: int) -> Dict[str, Any]:
+    """Read a microdata item and the properties that belong to it."""
+    result: Dict[str, Any] = {}
+    item_type = item.get('itemtype')
+    if item_type:
+        result['type'] = item_type.split()
+    if item.get('itemid'):
+        result['id'] = urljoin(url, item['itemid'])
+    properties: Dict[str, List[Any]] = {}
+
+    # Properties are the itemprop descendants not inside a nested item
+    stack = list(reversed([child for child in item.contents if child.name is not None]))
+    while stack:
+        element = stack.pop()
+        names = element.get('itemprop')
+        nested = element.has_attr('itemscope')
+        if names:
+            if nested:
+                value = _read_item(element, url, depth + 1) if depth < MAX_ITEM_DEPTH else {}
+            else:
+                value = _property_value(element, url)
+            for name in names.split():
+                properties.setdefault(name, []).append(value)
+        if not nested:
+            stack.extend(reversed([child for child in element.contents if child.name is not None]))
+
+    result['properties'] = properties
+    return result
+
+
+def _property_value(element, url: str) -> str:
+    """The value of a microdata property element."""
+    name = element.name
+    if name == 'meta':
+        return element.get('content', '')
+    attribute = _URL_ATTRIBUTES.get(name)
+    if attribute:
+        value = element.get(attribute)
+        return urljoin(url, value) if value else ''
+    if name in ('data', 'meter') and element.has_attr('value'):
+        return element['value']
+    if name == 'time' and element.has_attr('datetime'):
+        return element['datetime']
+    return element.get_text(' ', strip=True)[:MAX_PROPERTY_LENGTH]
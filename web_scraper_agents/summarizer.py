@@ -0,0 +1,210 @@
+"""
+Extractive summarizer - picks a page's most central sentences in near-linear time.
+
+Sentences are segmented once, and at most max_candidates of them (in
+document order) are considered, so the cost of a summary is bounded
+whatever the size of the page. Each sentence becomes a normalized TF-IDF
+vector and is ranked by TextRank over the cosine-similarity graph.
+The graph is never built: with W = V V^T, one power iteration step is
+two passes over the sparse vectors (V^T y, then V z), so every
+iteration is linear in the number of words rather than quadratic in the
+number of sentences.
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+import math
+import re
+
+
+# Sentences considered per page; the rest of a long page is not scored
+MAX_CANDIDATES = 300
+
+# Sentences shorter or longer than this (in words) are not picked
+MIN_SENTENCE_WORDS = 5
+MAX_SENTENCE_WORDS = 80
+
+DAMPING = 0.85
+MAX_ITERATIONS = 30
+TOLERANCE = 1e-4  # Only the order of the scores matters
+
+# Picked sentences more similar than this to one already picked are skipped
+REDUNDANCY_THRESHOLD = 0.7
+
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before
+being below between both but by can could did do does doing down during each few for from
+further had has have having he her here hers herself him himself his how i if in into is it
+its itself just me more most my myself no nor not now of off on once only or other our ours
+ourselves out over own same she should so some such than that the their theirs them
+themselves then there these they this those through to too under until up very was we were
+what when where which while who whom why will with would you your yours yourself yourselves
+""".split())
+
+# End of a sentence: terminal punctuation, optional closing quotes/brackets, whitespace,
+# then something that can start a sentence
+_BOUNDARY = re.compile(r'[.!?]+["\')\]”’]*\s+(?=["\'(\[“‘]?[A-Z0-9])')
+
+# Words whose trailing period does not end a sentence
+_ABBREVIATIONS = frozenset("""
+mr mrs ms dr prof sr jr st vs etc inc ltd co corp dept univ approx fig no vol
+jan feb mar apr jun jul aug sep sept oct nov dec e.g i.e u.s u.k a.m p.m
+""".split())
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9'-]*")
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences.
+
+    Boundaries are terminal punctuation followed by whitespace and a
+    capital letter or digit, except after common abbreviations and
+    single-letter initials.
+
+    Args:
+        text: Plain text
+
+    Returns:
+        Sentences, stripped, in order
+    """
+    sentences = []
+    start = 0
+    for match in _BOUNDARY.finditer(text):
+        end = match.start()
+        last_word = text[start:end + 1].rsplit(None, 1)[-1].rstrip('.').lower() if end > start else ''
+        if text[end] == '.' and (last_word in _ABBREVIATIONS or len(last_word) == 1):
+            continue
+        sentence = text[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def _terms(sentence: str) -> List[str]:
+    """Content words of a sentence, lowercased."""
+    return [word for word in _WORD.findall(sentence.lower()) if word not in STOP_WORDS and len(word) > 1]
+
+
+def _candidates(paragraphs: Iterable[str], max_candidates: int) -> List[str]:
+    """Collect up to max_candidates sentences of a usable length, in document order."""
+    candidates = []
+    for paragraph in paragraphs:
+        for sentence in split_sentences(paragraph):
+            if MIN_SENTENCE_WORDS <= len(sentence.split()) <= MAX_SENTENCE_WORDS:
+                candidates.append(sentence)
+                if len(candidates) >= max_candidates:
+                    return candidates
+    return candidates
+
+
+def _vectors(sentences: List[str]) -> List[Dict[str, float]]:
+    """Unit-length TF-IDF vectors of sentences (IDF over the sentences themselves)."""
+    counts = [Counter(_terms(sentence)) for sentence in sentences]
+    document_frequency = Counter(term for count in counts for term in count)
+    total = len(sentences)
+    vectors = []
+    for count in counts:
+        vector = {term: (1 + math.log(tf)) * math.log(1 + total / document_frequency[term])
+                  for term, tf in count.items()}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        vectors.append({term: weight / norm for term, weight in vector.items()} if norm else {})
+    return vectors
+
+
+def _similarity_times(vectors: List[Dict[str, float]], values: List[float]) -> List[float]:
+    """
+    Multiply the sentence similarity matrix (without its diagonal) by a vector.
+
+    W = V V^T - I for unit vectors, so W y = V (V^T y) - y, computed in
+    two passes over the sparse vectors.
+    """
+    term_totals: Dict[str, float] = {}
+    for vector, value in zip(vectors, values):
+        if value:
+            for term, weight in vector.items():
+                term_totals[term] = term_totals.get(term, 0.0) + weight * value
+    result = []
+    for vector, value in zip(vectors, values):
+        total = sum(weight * term_totals.get(term, 0.0) for term, weight in vector.items())
+        # Sentences without content words have zero vectors and no self-similarity
+        result.append(max(0.0, total - value) if vector else 0.0)
+    return result
+
+
+def rank_sentences(vectors: List[Dict[str, float]]) -> List[float]:
+    """
+    TextRank scores of sentences over their cosine-similarity graph.
+
+    Args:
+        vectors: Unit-length sentence vectors
+
+    Returns:
+        One score per sentence
+    """
+    count = len(vectors)
+    if count == 0:
+        return []
+    degrees = _similarity_times(vectors, [1.0] * count)
+    scores = [1.0 / count] * count
+    for _ in range(MAX_ITERATIONS):
+        shares = [score / degree if degree else 0.0 for score, degree in zip(scores, degrees)]
+        incoming = _similarity_times(vectors, shares)
+        # Rank held by isolated sentences is spread evenly, so scores keep summing to 1
+        dangling = sum(score for score, degree in zip(scores, degrees) if not degree)
+        base = (1 - DAMPING) / count + DAMPING * dangling / count
+        updated = [base + DAMPING * value for value in incoming]
+        change = sum(abs(new - old) for new, old in zip(updated, scores))
+        scores = updated
+        if change < TOLERANCE:
+            break
+    return scores
+
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """Cosine similarity of two unit vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+def summarize(paragraphs: Iterable[str], max_sentences: int = 5, requirement: Optional[str] = None,
+              max_candidates: int = MAX_CANDIDATES) -> List[str]:
+    """
+    Pick the most central sentences of a text.
+
+    Args:
+        paragraphs: Paragraphs of the page, in order
+        max_sentences: Most sentences returned
+        requirement: Optional keyword/phrase; sentences containing it are preferred
+        max_candidates: Most sentences considered, from the start of the text
+
+    Returns:
+        Up to max_sentences sentences, in document order
+    """
+    if max_sentences <= 0:
+        return []
+    sentences = _candidates(paragraphs, max_candidates)
+    if len(sentences) <= max_sentences:
+        return sentences
+
+    vectors = _vectors(sentences)
+    scores = rank_sentences(vectors)
+    count = len(sentences)
+    requirement_lower = requirement.lower() if requirement else None
+    # Sentences mentioning the requirement come first; within each group, a slight
+    # preference for early sentences, which tend to introduce the page
+    keys = [(bool(requirement_lower and requirement_lower in sentence.lower()),
+             scores[i] * (1.0 + 0.2 * (1 - i / count)))
+            for i, sentence in enumerate(sentences)]
+
+    picked: List[int] = []
+    for i in sorted(range(count), key=keys.__getitem__, reverse=True):
+        if all(_cosine(vectors[i], vectors[j]) < REDUNDANCY_THRESHOLD for j in picked):
+            picked.append(i)
+            if len(picked) == max_sentences:
+                break
+    return [sentences[i] for i in sorted(picked)]